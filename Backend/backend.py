@@ -15,6 +15,12 @@ from Backend.routes import (
     usda_router,
     health_router,
 )
+from Backend.routes.usda import (
+    create_usda_cache,
+    create_usda_client,
+    create_usda_single_flight,
+)
+from Backend.services.schema_capabilities import get_schema_capabilities
 from Backend.settings import settings
 
 
@@ -23,7 +29,15 @@ async def lifespan(app: FastAPI):
     """Run startup and shutdown logic for the application."""
     if settings.db_auto_create:
         Base.metadata.create_all(bind=engine)
-    yield
+    # Inspect the schema once up front instead of on the first request.
+    get_schema_capabilities(engine)
+    app.state.usda_client = create_usda_client()
+    app.state.usda_cache = create_usda_cache()
+    app.state.usda_single_flight = create_usda_single_flight()
+    try:
+        yield
+    finally:
+        await app.state.usda_client.aclose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -36,6 +50,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors travel in a response header; let browsers read it.
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Prefix all API routes with /api so the frontend can proxy requests.
@@ -0,0 +1,125 @@
+"""Compare CSV and Parquet catalog snapshots by file size and load time.
+
+Exports the ``MODEL_MAP`` tables of ``DATABASE_URL`` in each format, then
+wipes and reloads the database from every snapshot in turn (the data ends up
+identical to what it started as). Requires PostgreSQL and ``pyarrow``; run
+from the repository root against a disposable database::
+
+    DATABASE_URL=postgresql+psycopg2://... python -m Backend.benchmarks.bench_catalog_formats --allow-wipe
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import inspect
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "Database"))
+
+import export_to_csv as exporter  # noqa: E402
+import import_from_csv as importer  # noqa: E402
+
+# (label, format, compression)
+_SNAPSHOTS = [
+    ("csv", "csv", "none"),
+    ("csv.gz", "csv", "gzip"),
+    ("parquet", "parquet", "none"),
+    ("parquet+zstd", "parquet", "zstd"),
+]
+
+
+def _quiet(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    return time.perf_counter() - started
+
+
+def _export(folder: str, export_format: str, compression: str) -> Tuple[float, int]:
+    session = importer.SessionLocal()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tables = exporter.filter_tables(importer.get_table_order(session))
+        inspector = inspect(session.bind)
+        columns = {
+            table: [column["name"] for column in inspector.get_columns(table)]
+            for table in tables
+        }
+        session.commit()
+        elapsed = _quiet(
+            lambda: exporter.export_tables_fast(
+                session, folder, columns, compression, 4, export_format
+            )
+        )
+    finally:
+        session.close()
+    size = sum(path.stat().st_size for path in Path(folder).iterdir())
+    return elapsed, size
+
+
+def _load(folder: str, loader: Callable[[object, str, List[str]], None]) -> float:
+    session = importer.SessionLocal()
+    try:
+        ordered = importer.get_table_order(session)
+        with contextlib.redirect_stdout(io.StringIO()):
+            importer.wipe_data(session, ordered)
+        return _quiet(lambda: loader(session, folder, ordered))
+    finally:
+        session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--allow-wipe",
+        action="store_true",
+        help="Required: the database is truncated and reloaded several times",
+    )
+    parser.add_argument(
+        "--include-orm", action="store_true", help="Also time the row-by-row ORM CSV import"
+    )
+    args = parser.parse_args()
+    if not args.allow_wipe:
+        parser.error("--allow-wipe is required; point DATABASE_URL at a disposable database")
+    importer.load_pyarrow()
+
+    with tempfile.TemporaryDirectory() as root:
+        folders: Dict[str, str] = {}
+        print(f"{'snapshot':<14}{'export s':>10}{'size MiB':>10}")
+        for label, export_format, compression in _SNAPSHOTS:
+            folder = os.path.join(root, label)
+            os.makedirs(folder)
+            elapsed, size = _export(folder, export_format, compression)
+            folders[label] = folder
+            print(f"{label:<14}{elapsed:>10.2f}{size / 2**20:>10.2f}")
+
+        loads = [
+            ("csv COPY", "csv", importer.import_csv_fast),
+            ("csv.gz COPY", "csv.gz", importer.import_csv_fast),
+            ("parquet batches", "parquet", importer.import_parquet),
+            (
+                "parquet COPY",
+                "parquet+zstd",
+                lambda session, folder, ordered: importer.import_parquet(
+                    session, folder, ordered, fast=True
+                ),
+            ),
+        ]
+        if args.include_orm:
+            loads.insert(0, ("csv ORM", "csv", importer.import_csv))
+
+        print(f"\n{'load':<18}{'seconds':>10}")
+        for label, snapshot, loader in loads:
+            print(f"{label:<18}{_load(folders[snapshot], loader):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
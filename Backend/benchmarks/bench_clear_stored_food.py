@@ -0,0 +1,174 @@
+"""Time clearing a user's stored food with the per-item loop and set-based SQL.
+
+Seeds one user with ``--stored`` stored food items and ``--entries`` log
+entries pointing at them, then clears it twice: once with the previous
+implementation (one ``SELECT`` of log entries per stored item, detached in
+Python) and once through ``DELETE /api/stored_food/``. Uses a temporary SQLite
+file unless ``DATABASE_URL`` points at a migrated database; only rows of the
+generated user are touched. Run from the repository root::
+
+    python -m Backend.benchmarks.bench_clear_stored_food
+    DATABASE_URL=postgresql+psycopg2://... python -m Backend.benchmarks.bench_clear_stored_food
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Callable, List
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from Backend.models import DailyLogEntry, Food, Ingredient, StoredFood
+from Backend.routes.stored_food import clear_stored_food
+from Backend.services.schema_capabilities import get_schema_capabilities
+
+_MACROS = {
+    "calories": 100.0,
+    "protein": 5.0,
+    "carbohydrates": 10.0,
+    "fat": 3.0,
+    "fiber": 1.0,
+}
+
+
+def _legacy_clear(user_id: str, db: Session) -> None:
+    stored_food_items = (
+        db.exec(select(StoredFood).where(StoredFood.user_id == user_id)).scalars().all()
+    )
+    for stored_food in stored_food_items:
+        entries = db.exec(
+            select(DailyLogEntry).where(DailyLogEntry.stored_food_id == stored_food.id)
+        ).scalars().all()
+        for entry in entries:
+            entry.stored_food_id = None
+            if stored_food.food_id is not None:
+                entry.food_id = stored_food.food_id
+                entry.ingredient_id = None
+            elif stored_food.ingredient_id is not None:
+                entry.ingredient_id = stored_food.ingredient_id
+                entry.food_id = None
+    db.exec(delete(StoredFood).where(StoredFood.user_id == user_id))
+    db.commit()
+
+
+def _seed(engine: Engine, user_id: str, stored: int, entries: int) -> List[int]:
+    with Session(engine) as session:
+        ingredient = Ingredient(name=f"{user_id} ingredient")
+        food = Food(name=f"{user_id} food")
+        session.add_all([ingredient, food])
+        session.flush()
+        stored_rows = [
+            {
+                "user_id": user_id,
+                "food_id": food.id if index % 2 else None,
+                "ingredient_id": None if index % 2 else ingredient.id,
+                "prepared_portions": 10.0,
+                "remaining_portions": 10.0,
+                **{f"per_portion_{name}": value for name, value in _MACROS.items()},
+            }
+            for index in range(stored)
+        ]
+        stored_ids = list(
+            session.execute(
+                insert(StoredFood).returning(StoredFood.id), stored_rows
+            ).scalars()
+        )
+        start = date(2024, 1, 1)
+        session.execute(
+            insert(DailyLogEntry),
+            [
+                {
+                    "user_id": user_id,
+                    "log_date": start + timedelta(days=index % 365),
+                    "stored_food_id": stored_ids[index % len(stored_ids)],
+                    "ingredient_id": None,
+                    "food_id": None,
+                    "portions_consumed": 1.0,
+                    **_MACROS,
+                }
+                for index in range(entries)
+            ],
+        )
+        session.commit()
+        return [ingredient.id, food.id]
+
+
+def _cleanup(engine: Engine, user_id: str, owned: List[int]) -> None:
+    with Session(engine) as session:
+        session.exec(delete(DailyLogEntry).where(DailyLogEntry.user_id == user_id))
+        session.exec(delete(StoredFood).where(StoredFood.user_id == user_id))
+        session.exec(delete(Ingredient).where(Ingredient.id == owned[0]))
+        session.exec(delete(Food).where(Food.id == owned[1]))
+        session.commit()
+
+
+def _run(
+    engine: Engine, label: str, clear: Callable[[str, Session], None], args
+) -> None:
+    user_id = f"bench-clear-{uuid.uuid4().hex[:8]}"
+    owned = _seed(engine, user_id, args.stored, args.entries)
+    statements = 0
+
+    def _count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        started = time.perf_counter()
+        with Session(engine) as session:
+            clear(user_id, session)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    with Session(engine) as session:
+        attached = session.exec(
+            select(DailyLogEntry.id).where(
+                DailyLogEntry.user_id == user_id, DailyLogEntry.stored_food_id.is_not(None)
+            )
+        ).all()
+    _cleanup(engine, user_id, owned)
+    assert not attached, f"{label} left {len(attached)} entries attached"
+    print(f"{label:<12}{elapsed:>10.2f}{statements:>12}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stored", type=int, default=10_000, help="Stored food items")
+    parser.add_argument("--entries", type=int, default=100_000, help="Log entries")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        database_url = os.environ.get("DATABASE_URL")
+        if database_url:
+            engine = create_engine(database_url)
+        else:
+            engine = create_engine(f"sqlite:///{os.path.join(folder, 'bench.db')}")
+            SQLModel.metadata.create_all(engine)
+        # Inspect the schema up front, as the API does at startup.
+        get_schema_capabilities(engine)
+
+        print(
+            f"{engine.dialect.name}: {args.stored} stored items, {args.entries} log entries"
+        )
+        print(f"{'clear':<12}{'seconds':>10}{'statements':>12}")
+        _run(engine, "per-item", _legacy_clear, args)
+        _run(
+            engine,
+            "set-based",
+            lambda user_id, session: clear_stored_food(user_id=user_id, db=session),
+            args,
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Time serializing ingredient listings through the ORM and the column projection.
+
+Seeds ``--sizes`` ingredients (each with nutrition, three units, a source, two
+tags and a preferred shopping unit), then builds the JSON body of the listing
+twice per size: the previous way (eager-loaded ``Ingredient`` objects passed
+through ``ingredient_to_read`` and encoded as ``List[IngredientRead]``) and
+with ``services.ingredient_listing``. Both bodies are checked to decode to the
+same data. Uses a temporary SQLite file unless ``DATABASE_URL`` points at a
+migrated database; each size runs inside one transaction that is rolled back,
+so nothing is left behind. Run from the repository root::
+
+    python -m Backend.benchmarks.bench_ingredient_listing
+    DATABASE_URL=postgresql+psycopg2://... python -m Backend.benchmarks.bench_ingredient_listing
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from Backend.models import (
+    Ingredient,
+    IngredientRead,
+    IngredientShoppingUnit,
+    IngredientSource,
+    IngredientTagLink,
+    IngredientUnit,
+    Nutrition,
+    PossibleIngredientTag,
+)
+from Backend.routes.ingredients import INGREDIENT_LOAD_OPTIONS, ingredient_to_read
+from Backend.services.ingredient_listing import dump_ingredient_rows, ingredient_read_rows
+
+_READS = TypeAdapter(List[IngredientRead])
+
+
+def _seed(connection: Connection, prefix: str, count: int) -> None:
+    with Session(connection) as session:
+        tags = [PossibleIngredientTag(name=f"{prefix} tag {index}") for index in range(2)]
+        session.add_all(tags)
+        session.flush()
+        ids = list(
+            session.execute(
+                insert(Ingredient).returning(Ingredient.id),
+                [{"name": f"{prefix} {index:06d}"} for index in range(count)],
+            ).scalars()
+        )
+        session.execute(
+            insert(Nutrition),
+            [
+                {
+                    "ingredient_id": ingredient_id,
+                    "calories": 1.5,
+                    "protein": 0.1,
+                    "carbohydrates": 0.2,
+                    "fat": 0.05,
+                    "fiber": 0.01,
+                }
+                for ingredient_id in ids
+            ],
+        )
+        units = [
+            {"ingredient_id": ingredient_id, "name": name, "grams": grams}
+            for ingredient_id in ids
+            for name, grams in (("g", 1), ("cup", 240), ("piece", 50))
+        ]
+        session.execute(insert(IngredientUnit), units)
+        cups = session.execute(
+            select(IngredientUnit.id, IngredientUnit.ingredient_id).where(
+                IngredientUnit.ingredient_id.in_(
+                    select(Ingredient.id).where(Ingredient.name.startswith(prefix))
+                ),
+                IngredientUnit.name == "cup",
+            )
+        ).all()
+        session.execute(
+            insert(IngredientShoppingUnit),
+            [
+                {"ingredient_id": ingredient_id, "unit_id": unit_id}
+                for unit_id, ingredient_id in cups
+            ],
+        )
+        session.execute(
+            insert(IngredientSource),
+            [
+                {
+                    "ingredient_id": ingredient_id,
+                    "source": "usda",
+                    "source_id": f"{prefix}-{ingredient_id}",
+                }
+                for ingredient_id in ids
+            ],
+        )
+        session.execute(
+            insert(IngredientTagLink),
+            [
+                {"ingredient_id": ingredient_id, "tag_id": tag.id}
+                for ingredient_id in ids
+                for tag in tags
+            ],
+        )
+        session.commit()
+
+
+def _orm_listing(connection: Connection, prefix: str) -> bytes:
+    with Session(connection) as session:
+        ingredients = session.exec(
+            select(Ingredient)
+            .options(*INGREDIENT_LOAD_OPTIONS)
+            .where(Ingredient.name.startswith(prefix))
+            .order_by(Ingredient.name, Ingredient.id)
+        ).all()
+        return _READS.dump_json([ingredient_to_read(ingredient) for ingredient in ingredients])
+
+
+def _projected_listing(connection: Connection, prefix: str) -> bytes:
+    with Session(connection) as session:
+        rows = ingredient_read_rows(
+            session, select(Ingredient.id).where(Ingredient.name.startswith(prefix))
+        )
+        return dump_ingredient_rows(rows)
+
+
+def _time(listing: Callable[[Connection, str], bytes], connection: Connection, prefix: str):
+    started = time.perf_counter()
+    body = listing(connection, prefix)
+    return time.perf_counter() - started, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1_000, 10_000, 50_000],
+        help="Comma-separated ingredient counts",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        database_url = os.environ.get("DATABASE_URL")
+        if database_url:
+            engine = create_engine(database_url)
+        else:
+            engine = create_engine(f"sqlite:///{os.path.join(folder, 'bench.db')}")
+            SQLModel.metadata.create_all(engine)
+
+        print(engine.dialect.name)
+        print(f"{'ingredients':>12}{'orm s':>10}{'projected s':>13}{'speedup':>9}{'MiB':>8}")
+        for size in args.sizes:
+            prefix = f"bench-list-{uuid.uuid4().hex[:8]}"
+            # Sessions bound to a connection inside a transaction only commit
+            # savepoints, so rolling the connection back discards the seed.
+            with engine.connect() as connection:
+                connection.begin()
+                _seed(connection, prefix, size)
+                orm_seconds, orm_body = _time(_orm_listing, connection, prefix)
+                fast_seconds, fast_body = _time(_projected_listing, connection, prefix)
+                connection.rollback()
+            assert json.loads(orm_body) == json.loads(fast_body), "listings differ"
+            print(
+                f"{size:>12}{orm_seconds:>10.2f}{fast_seconds:>13.2f}"
+                f"{orm_seconds / fast_seconds:>8.1f}x{len(fast_body) / 2**20:>8.1f}"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare per-request and pooled USDA HTTP clients against a local stub.
+
+The stub speaks HTTP/1.1 with keep-alive and sleeps for ``--handshake-ms`` on
+every new connection to stand in for the TCP+TLS handshake with
+api.nal.usda.gov. Run from the repository root::
+
+    python -m Backend.benchmarks.bench_usda_client --requests 200 --handshake-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, List
+
+import httpx
+
+from Backend.routes.usda import create_usda_client
+
+_BODY = json.dumps({"fdcId": 1, "description": "Stub food", "foodNutrients": []}).encode()
+
+
+def _make_handler(handshake_seconds: float) -> type[BaseHTTPRequestHandler]:
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            time.sleep(handshake_seconds)
+            super().setup()
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(_BODY)))
+            self.end_headers()
+            self.wfile.write(_BODY)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return None
+
+    return StubHandler
+
+
+async def _time_requests(
+    count: int, fetch: Callable[[], Awaitable[httpx.Response]]
+) -> List[float]:
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await fetch()
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _summarize(label: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<12} mean={statistics.mean(samples):7.2f} ms  "
+        f"p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms"
+    )
+
+
+async def _run(url: str, count: int) -> None:
+    async def per_request() -> httpx.Response:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await client.get(url)
+
+    shared = create_usda_client()
+    try:
+        per_request_samples = await _time_requests(count, per_request)
+        pooled_samples = await _time_requests(count, lambda: shared.get(url))
+    finally:
+        await shared.aclose()
+
+    _summarize("per-request", per_request_samples)
+    _summarize("pooled", pooled_samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(args.handshake_ms / 1000))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/fdc/v1/food/1"
+        asyncio.run(_run(url, args.requests))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Time local USDA index searches over a Branded-sized synthetic catalogue.
+
+Loads ``--foods`` synthetic Branded-style descriptions (brand, product words
+and a few generic food words, like the FDC Branded download) through
+``replace_usda_foods`` and reports the median latency of ``search_local_foods``
+for short prefixes, whole words, multi-word and rare queries. Uses an
+in-memory SQLite database unless ``DATABASE_URL`` points at a migrated
+database; there the rows are committed and vacuumed like an imported index,
+then deleted again (their ids lie far above the real FDC range). Run from the
+repository root::
+
+    python -m Backend.benchmarks.bench_usda_search --foods 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import delete
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from Backend.models import UsdaFood
+from Backend.services.usda_index import replace_usda_foods, search_local_foods
+
+_FIRST_ID = 900_000_000
+
+_FOOD_WORDS = (
+    "chicken cheese chocolate chips cherry cream crackers cookies coconut corn "
+    "cinnamon caramel chili chunky classic crispy creamy crunchy beef bread "
+    "butter bean berry banana breast broth rice pasta pepper peanut potato "
+    "pork apple almond organic original sauce soup sugar salsa salted sweet "
+    "tomato turkey vanilla vegetable wheat whole yogurt milk mix oat honey"
+).split()
+_RARE_WORDS = ("quinoa", "kohlrabi", "xylitol", "jicama", "tamarind")
+_QUERIES = ("c", "ch", "chi", "chicken", "chicken cheese", "c z", "quinoa", "quinoa chips")
+
+
+def _description(generator: random.Random, index: int) -> str:
+    brand = f"BRAND{generator.randrange(5000)}"
+    words = generator.sample(_FOOD_WORDS, generator.randint(2, 6))
+    if index % 997 == 0:
+        words.append(generator.choice(_RARE_WORDS))
+    return " ".join([brand, *words, f"{generator.randint(1, 64)} OZ"]).upper()
+
+
+def _seed(session: Session, count: int) -> None:
+    generator = random.Random(9)
+    batch: List[dict] = []
+    for index in range(count):
+        fdc_id = _FIRST_ID + index
+        batch.append(
+            {
+                "id": fdc_id,
+                "name": _description(generator, index),
+                "normalization": {"data_type": "Branded"},
+            }
+        )
+        if len(batch) == 5000:
+            replace_usda_foods(session, batch)
+            batch = []
+    replace_usda_foods(session, batch)
+
+
+def _median_ms(session: Session, query: str, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        search_local_foods(session, query, ["Branded"])
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--foods", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+    if database_url:
+        engine = create_engine(database_url)
+    else:
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        SQLModel.metadata.create_all(engine)
+
+    try:
+        with Session(engine) as session:
+            started = time.perf_counter()
+            _seed(session, args.foods)
+            session.commit()
+            seconds = time.perf_counter() - started
+            print(f"{engine.dialect.name}: loaded {args.foods} foods in {seconds:.1f} s")
+        if engine.dialect.name == "postgresql":
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.exec_driver_sql("VACUUM ANALYZE usda_foods, usda_food_terms")
+
+        with Session(engine) as session:
+            print(f"{'query':>16}{'results':>9}{'median ms':>11}")
+            for query in _QUERIES:
+                results = len(search_local_foods(session, query, ["Branded"]))
+                milliseconds = _median_ms(session, query, args.repeats)
+                print(f"{query!r:>16}{results:>9}{milliseconds:>11.1f}")
+    finally:
+        if database_url:
+            with Session(engine) as session:
+                session.execute(delete(UsdaFood).where(UsdaFood.fdc_id >= _FIRST_ID))
+                session.commit()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
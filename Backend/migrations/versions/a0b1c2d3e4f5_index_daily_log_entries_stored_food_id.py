@@ -0,0 +1,27 @@
+"""index_daily_log_entries_stored_food_id
+
+Revision ID: a0b1c2d3e4f5
+Revises: f9a0b1c2d3e4
+Create Date: 2026-10-17 00:00:04.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a0b1c2d3e4f5"
+down_revision = "f9a0b1c2d3e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_daily_log_entries_stored_food_id",
+        "daily_log_entries",
+        ["stored_food_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_daily_log_entries_stored_food_id", table_name="daily_log_entries")
@@ -0,0 +1,66 @@
+"""create_food_nutrition_totals
+
+Revision ID: b1c2d3e4f5a6
+Revises: a0b1c2d3e4f5
+Create Date: 2026-10-17 00:00:05.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b1c2d3e4f5a6"
+down_revision = "a0b1c2d3e4f5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "food_nutrition_totals",
+        sa.Column("food_id", sa.Integer(), nullable=False),
+        sa.Column("grams", sa.Float(), nullable=False),
+        sa.Column("calories", sa.Float(), nullable=False),
+        sa.Column("protein", sa.Float(), nullable=False),
+        sa.Column("carbohydrates", sa.Float(), nullable=False),
+        sa.Column("fat", sa.Float(), nullable=False),
+        sa.Column("fiber", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["food_id"], ["foods.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("food_id"),
+    )
+    op.create_index(
+        "ix_food_nutrition_totals_calories", "food_nutrition_totals", ["calories"]
+    )
+    op.create_index(
+        "ix_food_nutrition_totals_protein", "food_nutrition_totals", ["protein"]
+    )
+    op.execute(
+        """
+        INSERT INTO food_nutrition_totals
+            (food_id, grams, calories, protein, carbohydrates, fat, fiber)
+        SELECT f.id,
+               COALESCE(SUM(g.grams), 0),
+               COALESCE(SUM(g.grams * COALESCE(n.calories, 0)), 0),
+               COALESCE(SUM(g.grams * COALESCE(n.protein, 0)), 0),
+               COALESCE(SUM(g.grams * COALESCE(n.carbohydrates, 0)), 0),
+               COALESCE(SUM(g.grams * COALESCE(n.fat, 0)), 0),
+               COALESCE(SUM(g.grams * COALESCE(n.fiber, 0)), 0)
+        FROM foods f
+        LEFT JOIN (
+            SELECT fi.food_id, fi.ingredient_id,
+                   COALESCE(u.grams, 1) * COALESCE(fi.unit_quantity, 0) AS grams
+            FROM food_ingredients fi
+            LEFT JOIN ingredient_units u
+              ON u.id = fi.unit_id AND u.ingredient_id = fi.ingredient_id
+        ) g ON g.food_id = f.id
+        LEFT JOIN nutrition n ON n.ingredient_id = g.ingredient_id
+        GROUP BY f.id
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_food_nutrition_totals_protein", table_name="food_nutrition_totals")
+    op.drop_index("ix_food_nutrition_totals_calories", table_name="food_nutrition_totals")
+    op.drop_table("food_nutrition_totals")
@@ -0,0 +1,80 @@
+"""create_plan_items
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-17 00:00:06.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c2d3e4f5a6b7"
+down_revision = "b1c2d3e4f5a6"
+branch_labels = None
+depends_on = None
+
+# Matches ``plan_engine.coerce_id``: integers, integral floats and numeric strings.
+_ID_PATTERN = r"^\s*-?[0-9]+(\.0*)?\s*$"
+
+
+def upgrade():
+    op.create_table(
+        "plan_items",
+        sa.Column("plan_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("item_type", sa.String(length=20), nullable=False),
+        sa.Column("food_id", sa.Integer(), nullable=True),
+        sa.Column("ingredient_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["plan_id"], ["plans.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("plan_id", "position"),
+    )
+    op.create_index("ix_plan_items_food_id", "plan_items", ["food_id"])
+    op.create_index("ix_plan_items_ingredient_id", "plan_items", ["ingredient_id"])
+    op.create_index("ix_stored_food_food_id", "stored_food", ["food_id"])
+    op.create_index("ix_stored_food_ingredient_id", "stored_food", ["ingredient_id"])
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Positions are indexes into the raw "plan" array, as the application
+    # records them when it indexes a plan on save.
+    op.execute(
+        f"""
+        INSERT INTO plan_items (plan_id, position, item_type, food_id, ingredient_id)
+        SELECT plan_id, position, item_type,
+               CASE WHEN item_type = 'food' THEN ref_id END,
+               CASE WHEN item_type = 'ingredient' THEN ref_id END
+        FROM (
+            SELECT p.id AS plan_id,
+                   (e.ordinality - 1)::int AS position,
+                   e.item ->> 'type' AS item_type,
+                   CASE
+                       WHEN e.item ->> 'type' = 'food'
+                            AND json_typeof(e.item -> 'foodId') IN ('number', 'string')
+                            AND e.item ->> 'foodId' ~ '{_ID_PATTERN}'
+                           THEN trim(e.item ->> 'foodId')::numeric::int
+                       WHEN e.item ->> 'type' = 'ingredient'
+                            AND json_typeof(e.item -> 'ingredientId') IN ('number', 'string')
+                            AND e.item ->> 'ingredientId' ~ '{_ID_PATTERN}'
+                           THEN trim(e.item ->> 'ingredientId')::numeric::int
+                   END AS ref_id
+            FROM plans p
+            CROSS JOIN LATERAL json_array_elements(
+                CASE WHEN json_typeof(p.payload -> 'plan') = 'array'
+                     THEN p.payload -> 'plan' ELSE '[]'::json END
+            ) WITH ORDINALITY AS e(item, ordinality)
+            WHERE json_typeof(e.item) = 'object' AND e.item::jsonb ? 'type'
+        ) AS items
+        WHERE item_type IN ('food', 'ingredient') AND ref_id IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_stored_food_ingredient_id", table_name="stored_food")
+    op.drop_index("ix_stored_food_food_id", table_name="stored_food")
+    op.drop_index("ix_plan_items_ingredient_id", table_name="plan_items")
+    op.drop_index("ix_plan_items_food_id", table_name="plan_items")
+    op.drop_table("plan_items")
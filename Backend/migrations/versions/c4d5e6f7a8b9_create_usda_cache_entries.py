@@ -0,0 +1,37 @@
+"""create_usda_cache_entries
+
+Revision ID: c4d5e6f7a8b9
+Revises: b6a1f2c3d4e5
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4d5e6f7a8b9"
+down_revision = "b6a1f2c3d4e5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "usda_cache_entries",
+        sa.Column("key", sa.String(length=512), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        "ix_usda_cache_entries_expires_at",
+        "usda_cache_entries",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_usda_cache_entries_expires_at", table_name="usda_cache_entries")
+    op.drop_table("usda_cache_entries")
@@ -0,0 +1,31 @@
+"""index_ingredient_children
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-17 00:00:07.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d3e4f5a6b7c8"
+down_revision = "c2d3e4f5a6b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_nutrition_ingredient_id", "nutrition", ["ingredient_id"])
+    op.create_index(
+        "ix_ingredient_sources_ingredient_id",
+        "ingredient_sources",
+        ["ingredient_id"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_ingredient_sources_ingredient_id", table_name="ingredient_sources"
+    )
+    op.drop_index("ix_nutrition_ingredient_id", table_name="nutrition")
@@ -0,0 +1,56 @@
+"""create_usda_food_index
+
+Revision ID: d7e8f9a0b1c2
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 00:00:01.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d7e8f9a0b1c2"
+down_revision = "c4d5e6f7a8b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "usda_foods",
+        sa.Column("fdc_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("description", sa.String(length=512), nullable=False),
+        sa.Column("search_name", sa.String(length=512), nullable=False),
+        sa.Column("data_type", sa.String(length=50), nullable=True),
+        sa.Column("summary", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("fdc_id"),
+    )
+    op.create_index("ix_usda_foods_search_name", "usda_foods", ["search_name"], unique=False)
+    op.create_index("ix_usda_foods_data_type", "usda_foods", ["data_type"], unique=False)
+    op.create_table(
+        "usda_food_terms",
+        sa.Column("term", sa.String(length=64), nullable=False),
+        sa.Column("fdc_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["fdc_id"], ["usda_foods.fdc_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("term", "fdc_id"),
+    )
+    op.create_index(
+        "ix_usda_food_terms_fdc_id", "usda_food_terms", ["fdc_id"], unique=False
+    )
+    op.create_index(
+        "ix_usda_food_terms_term_pattern",
+        "usda_food_terms",
+        ["term"],
+        unique=False,
+        postgresql_ops={"term": "text_pattern_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_usda_food_terms_term_pattern", table_name="usda_food_terms")
+    op.drop_index("ix_usda_food_terms_fdc_id", table_name="usda_food_terms")
+    op.drop_table("usda_food_terms")
+    op.drop_index("ix_usda_foods_data_type", table_name="usda_foods")
+    op.drop_index("ix_usda_foods_search_name", table_name="usda_foods")
+    op.drop_table("usda_foods")
@@ -0,0 +1,66 @@
+"""rank_usda_food_terms
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-17 00:00:08.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e4f5a6b7c8d9"
+down_revision = "d3e4f5a6b7c8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("usda_food_terms", sa.Column("prefix", sa.String(length=2), nullable=True))
+    op.add_column("usda_food_terms", sa.Column("name_length", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE usda_food_terms
+        SET prefix = substr(term, 1, 2),
+            name_length = (
+                SELECT length(usda_foods.search_name)
+                FROM usda_foods
+                WHERE usda_foods.fdc_id = usda_food_terms.fdc_id
+            )
+        """
+    )
+    op.alter_column(
+        "usda_food_terms", "prefix", existing_type=sa.String(length=2), nullable=False
+    )
+    op.alter_column(
+        "usda_food_terms", "name_length", existing_type=sa.Integer(), nullable=False
+    )
+    op.create_index(
+        "ix_usda_food_terms_prefix_rank",
+        "usda_food_terms",
+        ["prefix", "name_length", "fdc_id", "term"],
+        unique=False,
+    )
+    op.drop_index("ix_usda_food_terms_fdc_id", table_name="usda_food_terms")
+    op.create_index(
+        "ix_usda_food_terms_fdc_id", "usda_food_terms", ["fdc_id", "term"], unique=False
+    )
+    op.drop_index("ix_usda_foods_search_name", table_name="usda_foods")
+    op.create_index(
+        "ix_usda_foods_search_name",
+        "usda_foods",
+        ["search_name"],
+        unique=False,
+        postgresql_ops={"search_name": "text_pattern_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_usda_foods_search_name", table_name="usda_foods")
+    op.create_index("ix_usda_foods_search_name", "usda_foods", ["search_name"], unique=False)
+    op.drop_index("ix_usda_food_terms_fdc_id", table_name="usda_food_terms")
+    op.create_index("ix_usda_food_terms_fdc_id", "usda_food_terms", ["fdc_id"], unique=False)
+    op.drop_index("ix_usda_food_terms_prefix_rank", table_name="usda_food_terms")
+    op.drop_column("usda_food_terms", "name_length")
+    op.drop_column("usda_food_terms", "prefix")
@@ -0,0 +1,128 @@
+"""create_catalog_changes
+
+Revision ID: e8f9a0b1c2d3
+Revises: d7e8f9a0b1c2
+Create Date: 2026-10-17 00:00:02.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e8f9a0b1c2d3"
+down_revision = "d7e8f9a0b1c2"
+branch_labels = None
+depends_on = None
+
+
+# Catalog tables exported by Database/export_to_csv.py and their primary keys.
+CATALOG_TABLES = {
+    "ingredients": ["id"],
+    "ingredient_units": ["id"],
+    "nutrition": ["id"],
+    "possible_ingredient_tags": ["id"],
+    "ingredient_tags": ["ingredient_id", "tag_id"],
+    "foods": ["id"],
+    "food_ingredients": ["ingredient_id", "food_id"],
+    "possible_food_tags": ["id"],
+    "food_tags": ["food_id", "tag_id"],
+    "plans": ["id"],
+}
+
+
+def upgrade():
+    op.create_table(
+        "catalog_changes",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("table_name", sa.String(length=64), nullable=False),
+        sa.Column("row_key", sa.Text(), nullable=True),
+        sa.Column("operation", sa.String(length=8), nullable=False),
+        sa.Column("txid", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_catalog_changes_txid", "catalog_changes", ["txid"], unique=False)
+    op.create_index(
+        "ix_catalog_changes_changed_at", "catalog_changes", ["changed_at"], unique=False
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Row triggers log the primary key of every written row (both keys when an
+    # UPDATE changes it); statement triggers log TRUNCATE, which fires no row
+    # triggers. jsonb::text is canonical, so equal keys compare equal as text.
+    op.execute(
+        """
+        CREATE FUNCTION record_catalog_change() RETURNS trigger AS $$
+        DECLARE
+            new_key jsonb;
+            old_key jsonb;
+            key_column text;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                INSERT INTO catalog_changes (table_name, row_key, operation, txid)
+                VALUES (TG_TABLE_NAME, NULL, TG_OP, pg_current_xact_id()::text::bigint);
+                RETURN NULL;
+            END IF;
+            new_key := '{}'::jsonb;
+            old_key := '{}'::jsonb;
+            FOREACH key_column IN ARRAY TG_ARGV LOOP
+                IF TG_OP <> 'DELETE' THEN
+                    new_key := new_key || jsonb_build_object(key_column, to_jsonb(NEW) -> key_column);
+                END IF;
+                IF TG_OP <> 'INSERT' THEN
+                    old_key := old_key || jsonb_build_object(key_column, to_jsonb(OLD) -> key_column);
+                END IF;
+            END LOOP;
+            IF TG_OP <> 'INSERT' AND (TG_OP = 'DELETE' OR old_key <> new_key) THEN
+                INSERT INTO catalog_changes (table_name, row_key, operation, txid)
+                VALUES (TG_TABLE_NAME, old_key::text, 'DELETE', pg_current_xact_id()::text::bigint);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO catalog_changes (table_name, row_key, operation, txid)
+                VALUES (TG_TABLE_NAME, new_key::text, TG_OP, pg_current_xact_id()::text::bigint);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, key_columns in CATALOG_TABLES.items():
+        arguments = ", ".join(f"'{column}'" for column in key_columns)
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_record_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION record_catalog_change({arguments})
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_record_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION record_catalog_change()
+            """
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for table in CATALOG_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_record_truncate ON {table}")
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_record_change ON {table}")
+        op.execute("DROP FUNCTION IF EXISTS record_catalog_change()")
+    op.drop_index("ix_catalog_changes_changed_at", table_name="catalog_changes")
+    op.drop_index("ix_catalog_changes_txid", table_name="catalog_changes")
+    op.drop_table("catalog_changes")
@@ -0,0 +1,45 @@
+"""create_daily_log_totals
+
+Revision ID: f9a0b1c2d3e4
+Revises: e8f9a0b1c2d3
+Create Date: 2026-10-17 00:00:03.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f9a0b1c2d3e4"
+down_revision = "e8f9a0b1c2d3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "daily_log_totals",
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.Column("log_date", sa.Date(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("calories", sa.Float(), nullable=False),
+        sa.Column("protein", sa.Float(), nullable=False),
+        sa.Column("carbohydrates", sa.Float(), nullable=False),
+        sa.Column("fat", sa.Float(), nullable=False),
+        sa.Column("fiber", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "log_date"),
+    )
+    op.execute(
+        """
+        INSERT INTO daily_log_totals
+            (user_id, log_date, entry_count, calories, protein, carbohydrates, fat, fiber)
+        SELECT user_id, log_date, COUNT(*), SUM(calories), SUM(protein),
+               SUM(carbohydrates), SUM(fat), SUM(fiber)
+        FROM daily_log_entries
+        GROUP BY user_id, log_date
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("daily_log_totals")
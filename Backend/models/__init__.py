@@ -7,11 +7,17 @@ from .possible_ingredient_tag import PossibleIngredientTag
 from .possible_food_tag import PossibleFoodTag
 from .food import Food
 from .food_ingredient import FoodIngredient
+from .food_nutrition_total import FoodNutritionTotal
 from .ingredient_tag import IngredientTagLink
 from .food_tag import FoodTagLink
 from .plan import Plan
+from .plan_item import PlanItem
 from .daily_log_entry import DailyLogEntry
+from .daily_log_total import DailyLogTotal
 from .stored_food import StoredFood
+from .usda_cache_entry import UsdaCacheEntry
+from .usda_food import UsdaFood, UsdaFoodTerm
+from .catalog_change import CatalogChange
 from .schemas import (
     NutritionCreate,
     IngredientUnitCreate,
@@ -20,17 +26,25 @@ from .schemas import (
     IngredientCreate,
     IngredientUpdate,
     IngredientRead,
+    IngredientDependentsRead,
     FoodCreate,
     FoodUpdate,
+    FoodPatch,
     FoodRead,
     PlanCreate,
     PlanUpdate,
     PlanRead,
+    PlanPayloadRequest,
+    ShoppingListRead,
+    PlanEvaluationRead,
     StoredFoodCreate,
     StoredFoodRead,
     StoredFoodConsume,
+    StoredFoodConsumeRead,
+    DailyLogEntryBatchCreate,
     DailyLogEntryCreate,
     DailyLogEntryRead,
+    DailyLogSummaryRead,
 )
 
 __all__ = [
@@ -43,11 +57,18 @@ __all__ = [
     "PossibleFoodTag",
     "Food",
     "FoodIngredient",
+    "FoodNutritionTotal",
     "IngredientTagLink",
     "FoodTagLink",
     "Plan",
+    "PlanItem",
     "DailyLogEntry",
+    "DailyLogTotal",
     "StoredFood",
+    "UsdaCacheEntry",
+    "UsdaFood",
+    "UsdaFoodTerm",
+    "CatalogChange",
     "NutritionCreate",
     "IngredientUnitCreate",
     "FoodIngredientCreate",
@@ -55,15 +76,23 @@ __all__ = [
     "IngredientCreate",
     "IngredientUpdate",
     "IngredientRead",
+    "IngredientDependentsRead",
     "FoodCreate",
     "FoodUpdate",
+    "FoodPatch",
     "FoodRead",
     "PlanCreate",
     "PlanUpdate",
     "PlanRead",
+    "PlanPayloadRequest",
+    "ShoppingListRead",
+    "PlanEvaluationRead",
     "StoredFoodCreate",
     "StoredFoodRead",
     "StoredFoodConsume",
+    "StoredFoodConsumeRead",
+    "DailyLogEntryBatchCreate",
     "DailyLogEntryCreate",
     "DailyLogEntryRead",
+    "DailyLogSummaryRead",
 ]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, func
+from sqlmodel import Field, SQLModel
+
+
+class CatalogChange(SQLModel, table=True):
+    """One write to a catalog table, recorded by a PostgreSQL trigger.
+
+    ``row_key`` is the JSON object of the row's primary-key columns (NULL for
+    a TRUNCATE) and ``txid`` the writing transaction, which lets delta
+    exports select exactly the changes an earlier export's snapshot missed.
+    """
+
+    __tablename__ = "catalog_changes"
+
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"),
+            primary_key=True,
+            autoincrement=True,
+        ),
+    )
+    table_name: str = Field(sa_column=Column(String(64), nullable=False))
+    row_key: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
+    operation: str = Field(sa_column=Column(String(8), nullable=False))
+    txid: int = Field(sa_column=Column(BigInteger, nullable=False, index=True))
+    changed_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            nullable=False,
+            index=True,
+        )
+    )
+
+
+__all__ = ["CatalogChange"]
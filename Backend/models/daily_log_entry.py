@@ -19,6 +19,9 @@ class DailyLogEntry(SQLModel, table=True):
             name="daily_log_entries_source_ck",
         ),
         Index("ix_daily_log_entries_user_date", "user_id", "log_date"),
+        # Serves detaching entries from stored food and the ON DELETE SET NULL
+        # check when stored food is deleted.
+        Index("ix_daily_log_entries_stored_food_id", "stored_food_id"),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True)
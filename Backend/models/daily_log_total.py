@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Column, Date, Float, Integer, String
+from sqlmodel import Field, SQLModel
+
+
+class DailyLogTotal(SQLModel, table=True):
+    """Per-user, per-day sums of ``daily_log_entries`` kept up to date on write."""
+
+    __tablename__ = "daily_log_totals"
+
+    user_id: str = Field(sa_column=Column(String(255), primary_key=True))
+    log_date: date = Field(sa_column=Column(Date, primary_key=True))
+    entry_count: int = Field(sa_column=Column(Integer, nullable=False))
+    calories: float = Field(sa_column=Column(Float, nullable=False))
+    protein: float = Field(sa_column=Column(Float, nullable=False))
+    carbohydrates: float = Field(sa_column=Column(Float, nullable=False))
+    fat: float = Field(sa_column=Column(Float, nullable=False))
+    fiber: float = Field(sa_column=Column(Float, nullable=False))
+
+
+__all__ = ["DailyLogTotal"]
@@ -4,6 +4,7 @@ from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy import Column, String
 
 from .food_ingredient import FoodIngredient
+from .food_nutrition_total import FoodNutritionTotal
 from .possible_food_tag import PossibleFoodTag
 from .food_tag import FoodTagLink
 
@@ -28,6 +29,10 @@ class Food(SQLModel, table=True):
         back_populates="foods", link_model=FoodTagLink
     )
     stored_food_items: List["StoredFood"] = Relationship(back_populates="food")
+    # Written with set-based SQL by ``services.food_nutrition``; read-only here.
+    nutrition_total: Optional[FoodNutritionTotal] = Relationship(
+        sa_relationship_kwargs={"uselist": False, "viewonly": True}
+    )
 
     @classmethod
     def from_create(cls, data: "FoodCreate") -> "Food":
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer
+from sqlmodel import Field, SQLModel
+
+
+class FoodNutritionTotal(SQLModel, table=True):
+    """Macros of one portion of a food, maintained whenever its inputs change.
+
+    Foods store their ingredient amounts per portion, so these are the sums of
+    ``unit_quantity * unit grams * nutrition`` over the food's ingredients.
+    """
+
+    __tablename__ = "food_nutrition_totals"
+    __table_args__ = (
+        Index("ix_food_nutrition_totals_calories", "calories"),
+        Index("ix_food_nutrition_totals_protein", "protein"),
+    )
+
+    food_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            Integer, ForeignKey("foods.id", ondelete="CASCADE"), primary_key=True
+        ),
+    )
+    grams: float = Field(sa_column=Column(Float, nullable=False))
+    calories: float = Field(sa_column=Column(Float, nullable=False))
+    protein: float = Field(sa_column=Column(Float, nullable=False))
+    carbohydrates: float = Field(sa_column=Column(Float, nullable=False))
+    fat: float = Field(sa_column=Column(Float, nullable=False))
+    fiber: float = Field(sa_column=Column(Float, nullable=False))
+
+
+__all__ = ["FoodNutritionTotal"]
@@ -1,6 +1,6 @@
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import Column, String, UniqueConstraint
+from sqlalchemy import Column, Index, String, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:  # pragma: no cover - only for type checking
@@ -17,6 +17,7 @@ class IngredientSource(SQLModel, table=True):
             "source_id",
             name="uq_ingredient_sources_source_source_id",
         ),
+        Index("ix_ingredient_sources_ingredient_id", "ingredient_id"),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True)
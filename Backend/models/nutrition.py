@@ -1,13 +1,14 @@
 from typing import Optional
 
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, Numeric
+from sqlalchemy import Column, Index, Numeric
 
 
 class Nutrition(SQLModel, table=True):
     """Nutritional information for a single ingredient."""
 
     __tablename__ = "nutrition"
+    __table_args__ = (Index("ix_nutrition_ingredient_id", "ingredient_id"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     ingredient_id: Optional[int] = Field(
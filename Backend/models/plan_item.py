@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlmodel import Field, SQLModel
+
+
+class PlanItem(SQLModel, table=True):
+    """Food or ingredient referenced by a saved plan's payload.
+
+    Rows are extracted from ``Plan.payload`` whenever a plan is saved so that
+    "which plans use X" is an indexed lookup instead of a scan of every
+    payload. References are not foreign keys: payloads may point at catalog
+    rows that were deleted since.
+    """
+
+    __tablename__ = "plan_items"
+    __table_args__ = (
+        Index("ix_plan_items_food_id", "food_id"),
+        Index("ix_plan_items_ingredient_id", "ingredient_id"),
+    )
+
+    plan_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            Integer, ForeignKey("plans.id", ondelete="CASCADE"), primary_key=True
+        ),
+    )
+    position: int = Field(sa_column=Column(Integer, primary_key=True))
+    item_type: str = Field(sa_column=Column(String(20), nullable=False))
+    food_id: Optional[int] = Field(default=None, sa_column=Column(Integer, nullable=True))
+    ingredient_id: Optional[int] = Field(
+        default=None, sa_column=Column(Integer, nullable=True)
+    )
+
+
+__all__ = ["PlanItem"]
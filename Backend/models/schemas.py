@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import ConfigDict, model_validator
 from sqlmodel import SQLModel, Field
@@ -7,6 +7,7 @@ from sqlmodel import SQLModel, Field
 from .ingredient_unit import IngredientUnit
 from .nutrition import Nutrition
 from .food_ingredient import FoodIngredient
+from .food_nutrition_total import FoodNutritionTotal
 from .possible_ingredient_tag import PossibleIngredientTag
 from .possible_food_tag import PossibleFoodTag
 
@@ -101,6 +102,62 @@ class IngredientRead(SQLModel):
     shopping_unit: Optional[IngredientUnit] = None
 
 
+class IngredientBulkCreate(SQLModel):
+    """Batch of ingredients to create in one request."""
+
+    items: List[IngredientCreate] = Field(min_length=1, max_length=1000)
+
+
+class IngredientBulkResult(SQLModel):
+    """Outcome of one item of a bulk ingredient create."""
+
+    index: int
+    status: Literal["created", "existing", "error"]
+    ingredient: Optional[IngredientRead] = None
+    detail: Optional[str] = None
+
+
+class IngredientBulkRead(SQLModel):
+    """Per-item results of a bulk ingredient create, in request order."""
+
+    results: List[IngredientBulkResult] = Field(default_factory=list)
+
+
+class DependentFood(SQLModel):
+    """Food containing the ingredient."""
+
+    id: int
+    name: str
+
+
+class DependentPlan(SQLModel):
+    """Saved plan using the ingredient directly or through one of its foods."""
+
+    id: int
+    label: str
+    direct: bool = False
+    food_ids: List[int] = Field(default_factory=list)
+
+
+class DependentStoredFood(SQLModel):
+    """Open stored food item prepared from the ingredient or one of its foods."""
+
+    id: int
+    user_id: str
+    label: Optional[str] = None
+    food_id: Optional[int] = None
+    remaining_portions: float
+
+
+class IngredientDependentsRead(SQLModel):
+    """Everything whose nutrition depends on an ingredient."""
+
+    ingredient_id: int
+    foods: List[DependentFood] = Field(default_factory=list)
+    plans: List[DependentPlan] = Field(default_factory=list)
+    stored_food: List[DependentStoredFood] = Field(default_factory=list)
+
+
 class FoodCreate(SQLModel):
     """Schema for creating a food."""
 
@@ -115,6 +172,15 @@ class FoodUpdate(FoodCreate):
     pass
 
 
+class FoodPatch(SQLModel):
+    """Partial food update; omitted fields and ingredient lines are kept."""
+
+    name: Optional[str] = None
+    ingredients: List[FoodIngredientCreate] = Field(default_factory=list)
+    remove_ingredient_ids: List[int] = Field(default_factory=list)
+    tags: Optional[List[TagRef]] = None
+
+
 class FoodRead(SQLModel):
     """Schema for reading food data."""
 
@@ -124,6 +190,7 @@ class FoodRead(SQLModel):
     name: str
     ingredients: List[FoodIngredient] = Field(default_factory=list)
     tags: List[PossibleFoodTag] = Field(default_factory=list)
+    nutrition_total: Optional[FoodNutritionTotal] = None
 
 
 class PlanCreate(SQLModel):
@@ -152,6 +219,84 @@ class PlanRead(SQLModel):
     updated_at: datetime
 
 
+class PlanPayloadRequest(SQLModel):
+    """Optional inline plan payload evaluated instead of a stored one."""
+
+    payload: Optional[Dict[str, Any]] = None
+
+
+class ShoppingListUnitTotal(SQLModel):
+    """Quantity of an ingredient required in a single unit."""
+
+    unit_id: Optional[int] = None
+    unit_name: str
+    quantity: float
+    grams_per_unit: float
+
+
+class ShoppingListItem(SQLModel):
+    """Aggregated shopping list entry for one ingredient."""
+
+    ingredient_id: int
+    name: str
+    total_grams: float
+    unit_totals: List[ShoppingListUnitTotal] = Field(default_factory=list)
+    preferred_unit_total: Optional[ShoppingListUnitTotal] = None
+
+
+class ShoppingListIssue(SQLModel):
+    """Problem found while aggregating a plan into a shopping list."""
+
+    type: Literal[
+        "missing-food",
+        "missing-ingredient",
+        "missing-unit",
+        "missing-quantity",
+        "missing-grams",
+    ]
+    message: str
+
+
+class ShoppingListRead(SQLModel):
+    """Shopping list computed from a plan payload."""
+
+    items: List[ShoppingListItem] = Field(default_factory=list)
+    issues: List[ShoppingListIssue] = Field(default_factory=list)
+
+
+class PlanMacros(SQLModel):
+    """Macro totals reported by the plan evaluator."""
+
+    calories: float = 0.0
+    protein: float = 0.0
+    carbohydrates: float = 0.0
+    fat: float = 0.0
+    fiber: float = 0.0
+
+
+class PlanItemEvaluation(SQLModel):
+    """Macros contributed by a single plan line, scaled by its portions."""
+
+    index: int
+    type: Literal["food", "ingredient"]
+    ref_id: Optional[int] = None
+    name: Optional[str] = None
+    portions: float
+    available: bool
+    macros: PlanMacros
+
+
+class PlanEvaluationRead(SQLModel):
+    """Evaluated plan macros compared with the plan's per-day targets."""
+
+    days: int
+    items: List[PlanItemEvaluation] = Field(default_factory=list)
+    total: PlanMacros
+    per_day: PlanMacros
+    target: PlanMacros
+    deviation: PlanMacros
+
+
 class StoredFoodBase(SQLModel):
     """Common fields shared by stored food payloads."""
 
@@ -211,6 +356,7 @@ class StoredFoodConsume(SQLModel):
     """Payload for consuming stored food portions."""
 
     portions: float
+    log_date: Optional[date] = None
 
 
 class DailyLogEntryBase(SQLModel):
@@ -263,6 +409,12 @@ class DailyLogEntryCreate(DailyLogEntryBase):
     pass
 
 
+class DailyLogEntryBatchCreate(SQLModel):
+    """Batch of daily log entries to create in one request."""
+
+    items: List[DailyLogEntryCreate] = Field(min_length=1, max_length=1000)
+
+
 class DailyLogEntryRead(DailyLogEntryBase):
     """Schema returned when reading daily log entries."""
 
@@ -272,6 +424,24 @@ class DailyLogEntryRead(DailyLogEntryBase):
     created_at: datetime
 
 
+class StoredFoodConsumeRead(StoredFoodRead):
+    """Stored food after consumption, with the log entry created alongside it."""
+
+    log_entry: Optional[DailyLogEntryRead] = None
+
+
+class DailyLogSummaryRead(SQLModel):
+    """Macro totals of one user's log entries for a day, week or month."""
+
+    period_start: date
+    entry_count: int
+    calories: float
+    protein: float
+    carbohydrates: float
+    fat: float
+    fiber: float
+
+
 __all__ = [
     "NutritionCreate",
     "IngredientUnitCreate",
@@ -281,15 +451,34 @@ __all__ = [
     "IngredientCreate",
     "IngredientUpdate",
     "IngredientRead",
+    "IngredientBulkCreate",
+    "IngredientBulkResult",
+    "IngredientBulkRead",
+    "DependentFood",
+    "DependentPlan",
+    "DependentStoredFood",
+    "IngredientDependentsRead",
     "FoodCreate",
     "FoodUpdate",
+    "FoodPatch",
     "FoodRead",
     "PlanCreate",
     "PlanUpdate",
     "PlanRead",
+    "PlanPayloadRequest",
+    "ShoppingListUnitTotal",
+    "ShoppingListItem",
+    "ShoppingListIssue",
+    "ShoppingListRead",
+    "PlanMacros",
+    "PlanItemEvaluation",
+    "PlanEvaluationRead",
     "StoredFoodCreate",
     "StoredFoodRead",
     "StoredFoodConsume",
+    "StoredFoodConsumeRead",
     "DailyLogEntryCreate",
+    "DailyLogEntryBatchCreate",
     "DailyLogEntryRead",
+    "DailyLogSummaryRead",
 ]
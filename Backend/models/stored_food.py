@@ -36,6 +36,8 @@ class StoredFood(SQLModel, table=True):
             "remaining_portions >= 0", name="stored_food_remaining_portions_non_negative"
         ),
         Index("ix_stored_food_user_finished", "user_id", "is_finished"),
+        Index("ix_stored_food_food_id", "food_id"),
+        Index("ix_stored_food_ingredient_id", "ingredient_id"),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.types import JSON
+from sqlmodel import Field, SQLModel
+
+
+class UsdaCacheEntry(SQLModel, table=True):
+    """Trimmed USDA response shared between API workers until it expires."""
+
+    __tablename__ = "usda_cache_entries"
+
+    key: str = Field(sa_column=Column(String(512), primary_key=True))
+    payload: Any = Field(sa_column=Column(JSON, nullable=False))
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+
+
+__all__ = ["UsdaCacheEntry"]
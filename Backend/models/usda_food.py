@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlalchemy.types import JSON
+from sqlmodel import Field, SQLModel
+
+
+class UsdaFood(SQLModel, table=True):
+    """Food from an FDC bulk download, stored already trimmed for the API."""
+
+    __tablename__ = "usda_foods"
+    __table_args__ = (
+        # Prefix scans of the whole description; see ``ix_usda_food_terms_term_pattern``.
+        Index(
+            "ix_usda_foods_search_name",
+            "search_name",
+            postgresql_ops={"search_name": "text_pattern_ops"},
+        ),
+    )
+
+    fdc_id: int = Field(sa_column=Column(Integer, primary_key=True, autoincrement=False))
+    description: str = Field(sa_column=Column(String(512), nullable=False))
+    # Lower-cased, whitespace-collapsed description used for prefix ranking.
+    search_name: str = Field(sa_column=Column(String(512), nullable=False))
+    data_type: Optional[str] = Field(
+        default=None, sa_column=Column(String(50), nullable=True, index=True)
+    )
+    summary: Any = Field(sa_column=Column(JSON, nullable=False))
+
+
+class UsdaFoodTerm(SQLModel, table=True):
+    """Inverted index entry mapping a description word to a USDA food."""
+
+    __tablename__ = "usda_food_terms"
+    __table_args__ = (
+        # Prefix lookups on PostgreSQL use LIKE 'term%', which needs pattern ops
+        # unless the database collation is "C".
+        Index(
+            "ix_usda_food_terms_term_pattern",
+            "term",
+            postgresql_ops={"term": "text_pattern_ops"},
+        ),
+        # Covers the per-food "has a word starting with ..." checks.
+        Index("ix_usda_food_terms_fdc_id", "fdc_id", "term"),
+        # Postings of every word sharing a two-character prefix in rank order,
+        # so searches for common words read the best matches first.
+        Index(
+            "ix_usda_food_terms_prefix_rank",
+            "prefix",
+            "name_length",
+            "fdc_id",
+            "term",
+        ),
+    )
+
+    term: str = Field(sa_column=Column(String(64), primary_key=True))
+    prefix: str = Field(sa_column=Column(String(2), nullable=False))
+    # Length of the food's ``search_name``: the rank key of search results.
+    name_length: int = Field(sa_column=Column(Integer, nullable=False))
+    fdc_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("usda_foods.fdc_id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+
+
+__all__ = ["UsdaFood", "UsdaFoodTerm"]
@@ -1,100 +1,122 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select, SQLModel
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
-from sqlalchemy import delete
 from ..db import get_db
 from ..models import (
     Food,
     PossibleFoodTag,
-    Ingredient,
     FoodIngredient,
-    IngredientUnit,
+    FoodNutritionTotal,
 )
-from ..models.schemas import FoodCreate, FoodRead, FoodUpdate
+from ..models.schemas import (
+    FoodCreate,
+    FoodIngredientCreate,
+    FoodPatch,
+    FoodRead,
+    FoodUpdate,
+    TagRef,
+)
+from ..services.base_units import resolve_base_unit_ids
+from ..services.food_nutrition import refresh_food_totals
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/foods", tags=["foods"])
 
+# Relationships serialized by ``FoodRead``. Every read path loads them with one
+# ``SELECT ... IN`` per collection so the query count stays constant no matter
+# how many foods are returned.
+FOOD_LOAD_OPTIONS = [
+    selectinload(Food.ingredients),
+    selectinload(Food.tags),
+    joinedload(Food.nutrition_total),
+]
 
-def _lookup_base_unit_id(db: Session, ingredient_id: int) -> Optional[int]:
-    """Resolve the canonical unit id for synthetic "1g" selections."""
-
-    statement = select(IngredientUnit).where(
-        IngredientUnit.ingredient_id == ingredient_id
-    )
-    units = [u for u in db.exec(statement).all() if getattr(u, "id", None) is not None]
-    if not units:
-        return None
-
-    def _grams_value(unit: IngredientUnit) -> Optional[float]:
-        grams = getattr(unit, "grams", None)
-        if grams is None:
-            return None
-        try:
-            return float(grams)
-        except (TypeError, ValueError):  # pragma: no cover - defensive
-            return None
-
-    def _is_exact_gram(unit: IngredientUnit) -> bool:
-        grams_value = _grams_value(unit)
-        name = (getattr(unit, "name", "") or "").strip().lower()
-        return (
-            name == "g"
-            and grams_value is not None
-            and abs(grams_value - 1.0) < 1e-9
-        )
-
-    for unit in units:
-        if _is_exact_gram(unit):
-            return unit.id
-
-    for unit in units:
-        grams_value = _grams_value(unit)
-        if grams_value is not None and abs(grams_value - 1.0) < 1e-9:
-            return unit.id
+FoodSort = Literal["name", "calories", "protein", "carbohydrates", "fat", "fiber"]
 
-    return units[0].id
-
-
-def _normalize_unit_id(
-    db: Session,
-    cache: Dict[int, Optional[int]],
-    ingredient_id: Optional[int],
-    raw_unit_id: Optional[int],
-) -> Optional[int]:
-    """Translate synthetic unit identifiers (0) to real database ids."""
 
+def _coerce_unit_id(raw_unit_id: Optional[int]) -> Optional[int]:
     if isinstance(raw_unit_id, str):
         stripped = raw_unit_id.strip()
         if not stripped:
             return None
         try:
-            raw_unit_id = int(stripped)
+            return int(stripped)
         except ValueError:
             return None
+    return raw_unit_id
 
-    if raw_unit_id is None:
-        return None
 
-    if raw_unit_id != 0:
-        return raw_unit_id
+def _normalize_unit_ids(
+    db: Session, lines: List[FoodIngredientCreate]
+) -> List[Optional[int]]:
+    """Translate synthetic unit identifiers (0) to real database ids.
 
-    if ingredient_id is None:
-        return None
+    The base units of every line using the placeholder are resolved together
+    (one query at most, none when they are cached).
+    """
 
-    if ingredient_id not in cache:
-        cache[ingredient_id] = _lookup_base_unit_id(db, ingredient_id)
-
-    return cache[ingredient_id]
+    unit_ids = [_coerce_unit_id(line.unit_id) for line in lines]
+    base_units = resolve_base_unit_ids(
+        db,
+        (line.ingredient_id for line, unit_id in zip(lines, unit_ids) if unit_id == 0),
+    )
+    return [
+        base_units.get(line.ingredient_id) if unit_id == 0 else unit_id
+        for line, unit_id in zip(lines, unit_ids)
+    ]
 
 
 @router.get("/", response_model=List[FoodRead])
-def get_all_foods(db: Session = Depends(get_db)) -> List[FoodRead]:
-    """Return all foods."""
-    foods = db.exec(select(Food)).all()
+def get_all_foods(
+    db: Session = Depends(get_db),
+    min_calories: Optional[float] = Query(default=None),
+    max_calories: Optional[float] = Query(default=None),
+    min_protein: Optional[float] = Query(default=None),
+    max_protein: Optional[float] = Query(default=None),
+    min_carbohydrates: Optional[float] = Query(default=None),
+    max_carbohydrates: Optional[float] = Query(default=None),
+    min_fat: Optional[float] = Query(default=None),
+    max_fat: Optional[float] = Query(default=None),
+    min_fiber: Optional[float] = Query(default=None),
+    max_fiber: Optional[float] = Query(default=None),
+    sort: Optional[FoodSort] = Query(default=None),
+    descending: bool = Query(default=False),
+) -> List[FoodRead]:
+    """Return all foods, optionally filtered and sorted by per-portion macros.
+
+    Macro bounds are inclusive and evaluated in SQL against the stored
+    ``food_nutrition_totals``, e.g. ``max_calories=400&min_protein=30``.
+    """
+    statement = select(Food).options(*FOOD_LOAD_OPTIONS)
+    bounds = {
+        "calories": (min_calories, max_calories),
+        "protein": (min_protein, max_protein),
+        "carbohydrates": (min_carbohydrates, max_carbohydrates),
+        "fat": (min_fat, max_fat),
+        "fiber": (min_fiber, max_fiber),
+    }
+    needs_totals = sort not in (None, "name") or any(
+        value is not None for pair in bounds.values() for value in pair
+    )
+    if needs_totals:
+        statement = statement.join(
+            FoodNutritionTotal, FoodNutritionTotal.food_id == Food.id
+        )
+    for field, (low, high) in bounds.items():
+        column = getattr(FoodNutritionTotal, field)
+        if low is not None:
+            statement = statement.where(column >= low)
+        if high is not None:
+            statement = statement.where(column <= high)
+    if sort is not None:
+        column = Food.name if sort == "name" else getattr(FoodNutritionTotal, sort)
+        statement = statement.order_by(
+            column.desc() if descending else column, Food.id
+        )
+    foods = db.exec(statement).all()
     return [FoodRead.model_validate(f) for f in foods]
 
 
@@ -134,7 +156,7 @@ def add_possible_food_tag(
 @router.get("/{food_id}", response_model=FoodRead)
 def get_food(food_id: int, db: Session = Depends(get_db)) -> FoodRead:
     """Retrieve a single food by ID."""
-    food = db.get(Food, food_id)
+    food = db.get(Food, food_id, options=FOOD_LOAD_OPTIONS)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
     return FoodRead.model_validate(food)
@@ -144,17 +166,10 @@ def get_food(food_id: int, db: Session = Depends(get_db)) -> FoodRead:
 def add_food(food: FoodCreate, db: Session = Depends(get_db)) -> FoodRead:
     """Create a new food."""
     # Normalize unit_id values: map the synthetic 0 placeholder to a real DB unit id
-    normalized_ingredients = []
-    unit_cache: Dict[int, Optional[int]] = {}
-    for fi in food.ingredients:
-        fi_dict = fi.model_dump()
-        fi_dict["unit_id"] = _normalize_unit_id(
-            db,
-            unit_cache,
-            fi_dict.get("ingredient_id"),
-            fi_dict.get("unit_id"),
-        )
-        normalized_ingredients.append(fi_dict)
+    normalized_ingredients = [
+        {**fi.model_dump(), "unit_id": unit_id}
+        for fi, unit_id in zip(food.ingredients, _normalize_unit_ids(db, food.ingredients))
+    ]
 
     food_obj = Food.from_create(
         FoodCreate(name=food.name, ingredients=normalized_ingredients, tags=food.tags)
@@ -162,80 +177,152 @@ def add_food(food: FoodCreate, db: Session = Depends(get_db)) -> FoodRead:
     if food.tags:
         food_obj.tags = [db.get(PossibleFoodTag, t.id) for t in food.tags if t.id]
     db.add(food_obj)
+    db.flush()
+    refresh_food_totals(db, [food_obj.id])
     db.commit()
 
     statement = (
         select(Food)
-        .options(
-            selectinload(Food.ingredients)
-            .selectinload(FoodIngredient.ingredient)
-            .selectinload(Ingredient.nutrition),
-            selectinload(Food.ingredients)
-            .selectinload(FoodIngredient.ingredient)
-            .selectinload(Ingredient.units),
-            selectinload(Food.ingredients).selectinload(FoodIngredient.unit),
-            selectinload(Food.tags),
-        )
+        .options(*FOOD_LOAD_OPTIONS)
         .where(Food.id == food_obj.id)
     )
     food_obj = db.exec(statement).one()
     return FoodRead.model_validate(food_obj)
 
 
-@router.put("/{food_id}", response_model=FoodRead)
-def update_food(
-    food_id: int, food_data: FoodUpdate, db: Session = Depends(get_db)
-) -> FoodRead:
-    """Update an existing food."""
-    food = db.get(Food, food_id)
-    if not food:
-        raise HTTPException(status_code=404, detail="Food not found")
-
-    food.name = food_data.name
-    db.exec(delete(FoodIngredient).where(FoodIngredient.food_id == food_id))
-    food.ingredients = []
-    unit_cache: Dict[int, Optional[int]] = {}
-    for fi_data in food_data.ingredients:
-        fi_payload = fi_data.model_dump()
-        fi_payload["unit_id"] = _normalize_unit_id(
-            db,
-            unit_cache,
-            fi_payload.get("ingredient_id"),
-            fi_payload.get("unit_id"),
+def _apply_ingredient_lines(
+    db: Session,
+    food: Food,
+    lines: List[FoodIngredientCreate],
+    *,
+    remove_ingredient_ids: Iterable[int] = (),
+    replace: bool = False,
+) -> bool:
+    """Diff ``lines`` against the food's stored ingredient lines.
+
+    Lines are keyed by ``ingredient_id``. Only lines whose unit or quantity
+    changed are updated, new ones are inserted and, with ``replace``, lines
+    missing from ``lines`` are deleted. Returns whether anything changed.
+    """
+
+    desired: Dict[int, FoodIngredientCreate] = {}
+    for line in lines:
+        if line.ingredient_id in desired:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Ingredient {line.ingredient_id} is listed more than once",
+            )
+        desired[line.ingredient_id] = line
+    removed = set(remove_ingredient_ids)
+    if removed & desired.keys():
+        raise HTTPException(
+            status_code=422,
+            detail="Ingredients cannot be both updated and removed",
         )
-        fi_obj = FoodIngredient.model_validate(fi_payload)
-        fi_obj.food_id = food_id
-        food.ingredients.append(fi_obj)
 
+    existing = {line.ingredient_id: line for line in food.ingredients}
+    if replace:
+        removed = existing.keys() - desired.keys()
+    changed = False
+    for ingredient_id in removed & existing.keys():
+        food.ingredients.remove(existing.pop(ingredient_id))
+        changed = True
+
+    unit_ids = _normalize_unit_ids(db, list(desired.values()))
+    for (ingredient_id, line), unit_id in zip(desired.items(), unit_ids):
+        current = existing.get(ingredient_id)
+        if current is None:
+            food.ingredients.append(
+                FoodIngredient(
+                    ingredient_id=ingredient_id,
+                    unit_id=unit_id,
+                    unit_quantity=line.unit_quantity,
+                )
+            )
+            changed = True
+            continue
+        if current.unit_id != unit_id:
+            current.unit_id = unit_id
+            changed = True
+        if not _same_quantity(current.unit_quantity, line.unit_quantity):
+            current.unit_quantity = line.unit_quantity
+            changed = True
+    return changed
+
+
+def _same_quantity(stored: Optional[float], requested: Optional[float]) -> bool:
+    # ``unit_quantity`` is NUMERIC(10, 4); compare at the stored precision so
+    # resubmitting an unchanged line never issues an UPDATE.
+    if stored is None or requested is None:
+        return stored is requested
+    return round(float(stored), 4) == round(float(requested), 4)
+
+
+def _set_tags(db: Session, food: Food, tags: List[TagRef]) -> None:
     with db.no_autoflush:
-        if food_data.tags:
-            food.tags = [
-                db.get(PossibleFoodTag, t.id) for t in food_data.tags if t.id
-            ]
-        else:
-            food.tags = []
+        food.tags = [db.get(PossibleFoodTag, t.id) for t in tags if t.id]
 
+
+def _save_food(db: Session, food: Food, ingredients_changed: bool) -> FoodRead:
     db.add(food)
+    db.flush()
+    if ingredients_changed:
+        refresh_food_totals(db, [food.id])
     db.commit()
 
     statement = (
         select(Food)
-        .options(
-            selectinload(Food.ingredients)
-            .selectinload(FoodIngredient.ingredient)
-            .selectinload(Ingredient.nutrition),
-            selectinload(Food.ingredients)
-            .selectinload(FoodIngredient.ingredient)
-            .selectinload(Ingredient.units),
-            selectinload(Food.ingredients).selectinload(FoodIngredient.unit),
-            selectinload(Food.tags),
-        )
+        .options(*FOOD_LOAD_OPTIONS)
         .where(Food.id == food.id)
     )
     food = db.exec(statement).one()
     return FoodRead.model_validate(food)
 
 
+@router.put("/{food_id}", response_model=FoodRead)
+def update_food(
+    food_id: int, food_data: FoodUpdate, db: Session = Depends(get_db)
+) -> FoodRead:
+    """Replace a food's name, ingredient lines and tags.
+
+    Only the ingredient lines that differ from the stored ones are written.
+    """
+    food = db.get(Food, food_id)
+    if not food:
+        raise HTTPException(status_code=404, detail="Food not found")
+
+    food.name = food_data.name
+    changed = _apply_ingredient_lines(db, food, food_data.ingredients, replace=True)
+    _set_tags(db, food, food_data.tags)
+    return _save_food(db, food, changed)
+
+
+@router.patch("/{food_id}", response_model=FoodRead)
+def patch_food(
+    food_id: int, food_data: FoodPatch, db: Session = Depends(get_db)
+) -> FoodRead:
+    """Apply a partial update: only the given fields and ingredient lines change.
+
+    ``ingredients`` adds or updates lines by ``ingredient_id`` and
+    ``remove_ingredient_ids`` deletes lines; other lines are left untouched.
+    """
+    food = db.get(Food, food_id)
+    if not food:
+        raise HTTPException(status_code=404, detail="Food not found")
+
+    if food_data.name is not None:
+        food.name = food_data.name
+    changed = _apply_ingredient_lines(
+        db,
+        food,
+        food_data.ingredients,
+        remove_ingredient_ids=food_data.remove_ingredient_ids,
+    )
+    if food_data.tags is not None:
+        _set_tags(db, food, food_data.tags)
+    return _save_food(db, food, changed)
+
+
 @router.delete("/{food_id}")
 def delete_food(food_id: int, db: Session = Depends(get_db)) -> dict:
     """Delete a food."""
@@ -1,27 +1,42 @@
-from typing import List, Optional, Any
-
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import binascii
+import json
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, insert, or_, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from ..db import get_db
 from ..models import (
+    FoodIngredient,
     Ingredient,
     IngredientShoppingUnit,
+    IngredientTagLink,
     IngredientUnit,
     IngredientSource,
     Nutrition,
     PossibleIngredientTag,
 )
 from ..models.schemas import (
+    IngredientBulkCreate,
+    IngredientBulkRead,
+    IngredientBulkResult,
     IngredientCreate,
+    IngredientDependentsRead,
     IngredientRead,
     IngredientUpdate,
     IngredientShoppingUnitSelection,
 )
 from sqlmodel import SQLModel
 
+from ..services.dependents import find_ingredient_dependents
+from ..services.food_nutrition import refresh_food_totals, refresh_foods_using_ingredients
+from ..services.ingredient_listing import dump_ingredient_rows, ingredient_read_rows
+
 
 class TagCreate(SQLModel):
     """Schema for creating a new possible tag by name."""
@@ -38,6 +53,69 @@ INGREDIENT_LOAD_OPTIONS = [
     selectinload(Ingredient.shopping_unit).selectinload(IngredientShoppingUnit.unit),
 ]
 
+# Upper bound for a single page of the keyset-paginated ingredient listing.
+MAX_INGREDIENT_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_cursor(name: str, ingredient_id: int) -> str:
+    """Encode the ``(name, id)`` keyset position as an opaque URL-safe token."""
+
+    raw = json.dumps([name, ingredient_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    """Decode a token produced by :func:`_encode_cursor`."""
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        name, ingredient_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    if not isinstance(name, str) or not isinstance(ingredient_id, int):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    return name, ingredient_id
+
+
+def _apply_ingredient_filters(
+    statement,
+    name_prefix: Optional[str],
+    tag_ids: Optional[List[int]],
+    source: Optional[str],
+):
+    """Apply the server-side list filters to an ingredient select statement."""
+
+    prefix = (name_prefix or "").strip()
+    if prefix:
+        statement = statement.where(Ingredient.name.istartswith(prefix, autoescape=True))
+    if tag_ids:
+        statement = statement.where(
+            select(IngredientTagLink.ingredient_id)
+            .where(
+                IngredientTagLink.ingredient_id == Ingredient.id,
+                IngredientTagLink.tag_id.in_(tag_ids),
+            )
+            .exists()
+        )
+    normalized_source = _normalize_source_value(source)
+    if normalized_source == "manual":
+        statement = statement.where(
+            ~select(IngredientSource.id)
+            .where(IngredientSource.ingredient_id == Ingredient.id)
+            .exists()
+        )
+    elif normalized_source:
+        statement = statement.where(
+            select(IngredientSource.id)
+            .where(
+                IngredientSource.ingredient_id == Ingredient.id,
+                IngredientSource.source == normalized_source,
+            )
+            .exists()
+        )
+    return statement
+
 
 def _normalize_source_value(value: Any) -> Optional[str]:
     if value is None:
@@ -256,12 +334,255 @@ def apply_shopping_unit_selection(
         ingredient.shopping_unit.unit_id = unit.id
 
 
+def _bulk_validation_error(
+    item: IngredientCreate, known_tag_ids: set[int]
+) -> Optional[str]:
+    """Return why ``item`` cannot be created, mirroring ``add_ingredient``'s 400s."""
+
+    unknown_tags = sorted({t.id for t in item.tags if t.id} - known_tag_ids)
+    if unknown_tags:
+        return f"Unknown ingredient tag id(s): {', '.join(map(str, unknown_tags))}."
+    # Units of a new ingredient have no ids yet, so an explicit unit id can
+    # never belong to it.
+    requested_ids = [
+        item.shopping_unit_id,
+        item.shopping_unit.unit_id if item.shopping_unit is not None else None,
+    ]
+    if any(_coerce_optional_int(value) is not None for value in requested_ids):
+        return "Preferred shopping unit must belong to the ingredient."
+    return None
+
+
+def _bulk_units(item: IngredientCreate) -> List[Dict[str, Any]]:
+    """Return the unit rows for a new ingredient, including the base 'g' unit."""
+
+    units = [{"name": unit.name, "grams": unit.grams} for unit in item.units]
+    base = next((unit for unit in units if unit["name"] == "g"), None)
+    if base is None:
+        units.append({"name": "g", "grams": 1})
+    else:
+        base["grams"] = 1
+    return units
+
+
+def _create_ingredients_bulk(
+    db: Session, items: List[IngredientCreate]
+) -> List[Dict[str, Any]]:
+    """Resolve and insert ``items`` with set-based statements.
+
+    Each item resolves like a sequential ``add_ingredient`` call: an existing
+    source mapping wins, then an existing (or earlier in-batch) ingredient
+    with the same name is returned and gains the item's source mapping, and
+    only the remaining items are inserted. Returns one outcome per item with
+    ``status``, ``ingredient_id`` (or the in-batch ``owner`` index whose
+    ingredient it resolves to) and ``detail``.
+    """
+
+    sources = [_normalize_source_fields(item.source, item.source_id) for item in items]
+    pairs = {pair for pair in sources if pair[0]}
+    mapped: Dict[tuple[str, str], int] = {}
+    if pairs:
+        rows = db.exec(
+            select(
+                IngredientSource.source,
+                IngredientSource.source_id,
+                IngredientSource.ingredient_id,
+            ).where(
+                tuple_(IngredientSource.source, IngredientSource.source_id).in_(
+                    list(pairs)
+                )
+            )
+        ).all()
+        mapped = {(source, source_id): ingredient_id for source, source_id, ingredient_id in rows}
+
+    names = {item.name for item in items}
+    by_name: Dict[str, int] = dict(
+        db.exec(select(Ingredient.name, Ingredient.id).where(Ingredient.name.in_(names))).all()
+    )
+    tag_ids = {t.id for item in items for t in item.tags if t.id}
+    known_tag_ids = (
+        set(
+            db.exec(
+                select(PossibleIngredientTag.id).where(
+                    PossibleIngredientTag.id.in_(tag_ids)
+                )
+            ).all()
+        )
+        if tag_ids
+        else set()
+    )
+
+    outcomes: List[Dict[str, Any]] = []
+    pending_names: Dict[str, int] = {}
+    pending_sources: Dict[tuple[str, str], int] = {}
+    # (source, source_id, ingredient_id or None, owner index or None)
+    attached_sources: List[tuple[str, str, Optional[int], Optional[int]]] = []
+    new_indexes: List[int] = []
+
+    for index, item in enumerate(items):
+        pair = sources[index]
+        outcome = {"status": "existing", "ingredient_id": None, "owner": None, "detail": None}
+        outcomes.append(outcome)
+        if pair[0] and pair in mapped:
+            outcome["ingredient_id"] = mapped[pair]
+            continue
+        if pair[0] and pair in pending_sources:
+            outcome["owner"] = pending_sources[pair]
+            continue
+        if item.name in by_name:
+            # Name-uniqueness fallback: reuse the ingredient and map the source.
+            outcome["ingredient_id"] = by_name[item.name]
+            if pair[0]:
+                attached_sources.append((*pair, by_name[item.name], None))
+                mapped[pair] = by_name[item.name]
+            continue
+        if item.name in pending_names:
+            outcome["owner"] = pending_names[item.name]
+            if pair[0]:
+                attached_sources.append((*pair, None, pending_names[item.name]))
+                pending_sources[pair] = pending_names[item.name]
+            continue
+
+        error = _bulk_validation_error(item, known_tag_ids)
+        if error:
+            outcome.update(status="error", detail=error)
+            continue
+        outcome["status"] = "created"
+        pending_names[item.name] = index
+        if pair[0]:
+            pending_sources[pair] = index
+        new_indexes.append(index)
+
+    new_ids: Dict[int, int] = {}
+    if new_indexes:
+        # New names are unique within the batch, so RETURNING rows are matched
+        # by name; requesting parameter order would force row-at-a-time inserts.
+        rows = db.execute(
+            insert(Ingredient).returning(Ingredient.id, Ingredient.name),
+            [{"name": items[index].name} for index in new_indexes],
+        ).all()
+        id_by_name = {row.name: row.id for row in rows}
+        new_ids = {index: id_by_name[items[index].name] for index in new_indexes}
+
+    for index, outcome in enumerate(outcomes):
+        if outcome["status"] == "created":
+            outcome["ingredient_id"] = new_ids[index]
+        elif outcome["owner"] is not None:
+            outcome["ingredient_id"] = new_ids[outcome["owner"]]
+
+    nutrition_rows = []
+    unit_rows = []
+    tag_rows = []
+    source_rows = [
+        {
+            "ingredient_id": ingredient_id if ingredient_id is not None else new_ids[owner],
+            "source": source,
+            "source_id": source_id,
+        }
+        for source, source_id, ingredient_id, owner in attached_sources
+    ]
+    for index in new_indexes:
+        item = items[index]
+        ingredient_id = new_ids[index]
+        if item.nutrition:
+            nutrition_rows.append({"ingredient_id": ingredient_id, **item.nutrition.model_dump()})
+        unit_rows.extend({"ingredient_id": ingredient_id, **unit} for unit in _bulk_units(item))
+        tag_rows.extend(
+            {"ingredient_id": ingredient_id, "tag_id": tag_id}
+            for tag_id in dict.fromkeys(t.id for t in item.tags if t.id)
+        )
+        source, source_id = sources[index]
+        if source:
+            source_rows.append(
+                {"ingredient_id": ingredient_id, "source": source, "source_id": source_id}
+            )
+
+    if nutrition_rows:
+        db.execute(insert(Nutrition), nutrition_rows)
+    if source_rows:
+        db.execute(insert(IngredientSource), source_rows)
+    if tag_rows:
+        db.execute(insert(IngredientTagLink), tag_rows)
+
+    units_by_ingredient: Dict[int, List[IngredientUnit]] = {}
+    if unit_rows:
+        rows = db.execute(
+            insert(IngredientUnit).returning(
+                IngredientUnit.id,
+                IngredientUnit.ingredient_id,
+                IngredientUnit.name,
+                IngredientUnit.grams,
+            ),
+            unit_rows,
+        ).all()
+        for row in sorted(rows, key=lambda row: row.id):
+            units_by_ingredient.setdefault(row.ingredient_id, []).append(
+                IngredientUnit(id=row.id, name=row.name, grams=row.grams)
+            )
+
+    shopping_rows = []
+    for index in new_indexes:
+        item = items[index]
+        if item.shopping_unit is None:
+            continue
+        ingredient_id = new_ids[index]
+        unit = _resolve_shopping_unit(
+            SimpleNamespace(units=units_by_ingredient.get(ingredient_id, [])),
+            None,
+            item.shopping_unit,
+        )
+        if unit is not None:
+            shopping_rows.append({"ingredient_id": ingredient_id, "unit_id": unit.id})
+    if shopping_rows:
+        db.execute(insert(IngredientShoppingUnit), shopping_rows)
+
+    return outcomes
+
+
 @router.get("/", response_model=List[IngredientRead])
-def get_all_ingredients(db: Session = Depends(get_db)) -> List[IngredientRead]:
-    """Return all ingredients."""
-    statement = select(Ingredient).options(*INGREDIENT_LOAD_OPTIONS)
-    ingredients = db.exec(statement).all()
-    return [ingredient_to_read(ing) for ing in ingredients]
+def get_all_ingredients(
+    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_INGREDIENT_PAGE_SIZE),
+    after: Optional[str] = Query(default=None),
+    name_prefix: Optional[str] = Query(default=None),
+    tag_ids: Optional[List[int]] = Query(default=None),
+    source: Optional[str] = Query(default=None),
+) -> Response:
+    """Return ingredients ordered by name, optionally filtered and paginated.
+
+    When ``limit`` is provided only one page is loaded. Pages are keyed on
+    ``(name, id)``; pass the ``X-Next-Cursor`` response header back as
+    ``after`` to fetch the following page. The header is omitted on the last
+    page.
+    """
+    statement = select(Ingredient.id)
+    statement = _apply_ingredient_filters(statement, name_prefix, tag_ids, source)
+    if after is not None:
+        after_name, after_id = _decode_cursor(after)
+        statement = statement.where(
+            or_(
+                Ingredient.name > after_name,
+                and_(Ingredient.name == after_name, Ingredient.id > after_id),
+            )
+        )
+    statement = statement.order_by(Ingredient.name, Ingredient.id)
+    if limit is not None:
+        # Fetch one extra row to learn whether another page exists.
+        statement = statement.limit(limit + 1)
+
+    # Listings can be large, so rows are projected from the needed columns and
+    # encoded straight to JSON instead of going through ``ingredient_to_read``.
+    rows = ingredient_read_rows(db, statement)
+    headers = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(last["name"], last["id"])
+    return Response(
+        content=dump_ingredient_rows(rows),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @router.get("/possible_tags", response_model=List[PossibleIngredientTag])
@@ -304,6 +625,16 @@ def get_ingredient(ingredient_id: int, db: Session = Depends(get_db)) -> Ingredi
     return ingredient_to_read(ingredient)
 
 
+@router.get("/{ingredient_id}/dependents", response_model=IngredientDependentsRead)
+def get_ingredient_dependents(
+    ingredient_id: int, db: Session = Depends(get_db)
+) -> IngredientDependentsRead:
+    """Return the foods, saved plans and open stored food using an ingredient."""
+    if db.get(Ingredient, ingredient_id) is None:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    return find_ingredient_dependents(db, ingredient_id)
+
+
 @router.post("/", response_model=IngredientRead, status_code=201)
 def add_ingredient(
     ingredient: IngredientCreate, db: Session = Depends(get_db)
@@ -382,6 +713,54 @@ def add_ingredient(
     return ingredient_to_read(ingredient_obj)
 
 
+@router.post(":bulk", response_model=IngredientBulkRead)
+def add_ingredients_bulk(
+    batch: IngredientBulkCreate, db: Session = Depends(get_db)
+) -> IngredientBulkRead:
+    """Create many ingredients in one transaction with per-item results.
+
+    Items are deduplicated exactly like ``POST /ingredients``: an existing
+    source mapping or an ingredient with the same name is returned as
+    ``existing`` (gaining the item's source mapping in the latter case).
+    Items that fail validation are reported as ``error`` without affecting
+    the rest of the batch.
+    """
+    for attempt in range(2):
+        try:
+            outcomes = _create_ingredients_bulk(db, batch.items)
+            db.commit()
+            break
+        except IntegrityError:
+            # A concurrent request created one of the names or mappings after
+            # they were resolved; resolve the whole batch again.
+            db.rollback()
+            if attempt:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Bulk ingredient create conflicted with concurrent changes.",
+                )
+
+    ingredient_ids = {o["ingredient_id"] for o in outcomes if o["ingredient_id"] is not None}
+    statement = (
+        select(Ingredient)
+        .options(*INGREDIENT_LOAD_OPTIONS)
+        .where(Ingredient.id.in_(ingredient_ids))
+    )
+    ingredients = {ingredient.id: ingredient for ingredient in db.exec(statement).all()}
+    reads = {ingredient_id: ingredient_to_read(ing) for ingredient_id, ing in ingredients.items()}
+    return IngredientBulkRead(
+        results=[
+            IngredientBulkResult(
+                index=index,
+                status=outcome["status"],
+                ingredient=reads.get(outcome["ingredient_id"]),
+                detail=outcome["detail"],
+            )
+            for index, outcome in enumerate(outcomes)
+        ]
+    )
+
+
 @router.put("/{ingredient_id}", response_model=IngredientRead)
 def update_ingredient(
     ingredient_id: int,
@@ -505,6 +884,8 @@ def update_ingredient(
                 ingredient_data.shopping_unit_id,
                 ingredient_data.shopping_unit,
             )
+        # Nutrition and unit grams feed the totals of every food using it.
+        refresh_foods_using_ingredients(db, [ingredient.id])
         db.commit()
     except IntegrityError as exc:
         db.rollback()
@@ -524,7 +905,12 @@ def delete_ingredient(ingredient_id: int, db: Session = Depends(get_db)) -> dict
     ingredient = db.get(Ingredient, ingredient_id)
     if not ingredient:
         raise HTTPException(status_code=404, detail="Ingredient not found")
+    food_ids = db.exec(
+        select(FoodIngredient.food_id).where(FoodIngredient.ingredient_id == ingredient_id)
+    ).all()
     db.delete(ingredient)
+    db.flush()
+    refresh_food_totals(db, food_ids)
     db.commit()
     return {"message": "Ingredient deleted successfully"}
 
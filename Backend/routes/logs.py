@@ -3,17 +3,27 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from sqlalchemy import delete
+from sqlalchemy import Date, Integer, String, cast, delete, func, insert
 from sqlmodel import Session, select
 
 from ..db import get_db
+from ..services.daily_log_totals import (
+    MACRO_FIELDS,
+    add_log_entries,
+    clear_log_totals,
+    remove_log_entries,
+)
+from ..services.schema_capabilities import get_schema_capabilities
 from ..models import (
     DailyLogEntry,
+    DailyLogEntryBatchCreate,
     DailyLogEntryCreate,
     DailyLogEntryRead,
+    DailyLogSummaryRead,
+    DailyLogTotal,
     Food,
     Ingredient,
     StoredFood,
@@ -21,6 +31,109 @@ from ..models import (
 
 router = APIRouter(prefix="/logs", tags=["logs"])
 
+SummaryBucket = Literal["day", "week", "month"]
+
+# (payload field, model, error message) for each kind of log entry source.
+_SOURCE_REFERENCES = (
+    ("stored_food_id", StoredFood, "Stored food not found"),
+    ("ingredient_id", Ingredient, "Ingredient not found"),
+    ("food_id", Food, "Food not found"),
+)
+
+
+def _validate_range(start: date, end: date) -> None:
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+
+
+def _range_filter(statement, user_id: str, start: date, end: date):
+    # Equality on user_id plus a log_date range is served by
+    # ix_daily_log_entries_user_date.
+    return statement.where(
+        DailyLogEntry.user_id == user_id,
+        DailyLogEntry.log_date >= start,
+        DailyLogEntry.log_date <= end,
+    )
+
+
+def _bucket_start(db: Session, bucket: SummaryBucket, column):
+    """SQL expression for the first day of the bucket containing ``column``."""
+
+    if bucket == "day":
+        return column
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc(bucket, column), Date)
+    # SQLite: weeks start on Monday like PostgreSQL's date_trunc('week').
+    if bucket == "week":
+        days_since_monday = (cast(func.strftime("%w", column), Integer) + 6) % 7
+        return func.date(column, "-" + cast(days_since_monday, String) + " days")
+    return func.date(column, "start of month")
+
+
+@router.get("/", response_model=List[DailyLogEntryRead])
+def list_daily_logs_range(
+    user_id: str = Query(...),
+    start: date = Query(...),
+    end: date = Query(...),
+    db: Session = Depends(get_db),
+) -> List[DailyLogEntryRead]:
+    """Return a user's log entries between ``start`` and ``end`` inclusive."""
+
+    _validate_range(start, end)
+    statement = _range_filter(select(DailyLogEntry), user_id, start, end).order_by(
+        DailyLogEntry.log_date, DailyLogEntry.created_at, DailyLogEntry.id
+    )
+    results = db.exec(statement).all()
+    return [DailyLogEntryRead.model_validate(entry) for entry in results]
+
+
+@router.get("/summary", response_model=List[DailyLogSummaryRead])
+def summarize_daily_logs(
+    user_id: str = Query(...),
+    start: date = Query(...),
+    end: date = Query(...),
+    bucket: SummaryBucket = Query(default="day"),
+    db: Session = Depends(get_db),
+) -> List[DailyLogSummaryRead]:
+    """Return macro totals per day, week or month with entries in the range.
+
+    Reads the ``daily_log_totals`` rollup, so the cost grows with the number
+    of days in the range rather than the number of entries. Buckets without
+    entries are omitted.
+    """
+
+    _validate_range(start, end)
+    period_start = _bucket_start(db, bucket, DailyLogTotal.log_date).label("period_start")
+    statement = (
+        select(
+            period_start,
+            func.sum(DailyLogTotal.entry_count),
+            *(func.sum(getattr(DailyLogTotal, field)) for field in MACRO_FIELDS),
+        )
+        .where(
+            DailyLogTotal.user_id == user_id,
+            DailyLogTotal.log_date >= start,
+            DailyLogTotal.log_date <= end,
+        )
+        .group_by(period_start)
+        .order_by(period_start)
+    )
+
+    return [
+        DailyLogSummaryRead(
+            period_start=period,
+            entry_count=count,
+            calories=calories,
+            protein=protein,
+            carbohydrates=carbohydrates,
+            fat=fat,
+            fiber=fiber,
+        )
+        for period, count, calories, protein, carbohydrates, fat, fiber in db.exec(
+            statement
+        ).all()
+    ]
+
 
 @router.get("/{log_date}", response_model=List[DailyLogEntryRead])
 def list_daily_logs(
@@ -46,7 +159,11 @@ def create_daily_log(
     """Persist a new daily log entry."""
 
     if payload.stored_food_id is not None:
-        if db.get(StoredFood, payload.stored_food_id) is None:
+        # Before the stored_food migration no stored food can exist.
+        if (
+            not get_schema_capabilities(db).has_table(StoredFood.__tablename__)
+            or db.get(StoredFood, payload.stored_food_id) is None
+        ):
             raise HTTPException(status_code=404, detail="Stored food not found")
     if payload.ingredient_id is not None:
         if db.get(Ingredient, payload.ingredient_id) is None:
@@ -57,11 +174,62 @@ def create_daily_log(
 
     entry = DailyLogEntry(**payload.model_dump())
     db.add(entry)
+    add_log_entries(db, [entry])
     db.commit()
     db.refresh(entry)
     return DailyLogEntryRead.model_validate(entry)
 
 
+@router.post(":batch", response_model=List[DailyLogEntryRead], status_code=201)
+def create_daily_logs_batch(
+    batch: DailyLogEntryBatchCreate,
+    db: Session = Depends(get_db),
+) -> List[DailyLogEntryRead]:
+    """Persist several daily log entries at once, e.g. every item of a meal.
+
+    Referenced stored foods, ingredients and foods are checked with one query
+    per type and all entries are inserted in a single statement. The batch is
+    all-or-nothing: if any item references a missing row, nothing is written
+    and a 422 lists every failing item under ``["body", "items", index, field]``.
+    Entries are returned in request order.
+    """
+
+    capabilities = get_schema_capabilities(db)
+    errors = []
+    for field, model, message in _SOURCE_REFERENCES:
+        requested = {
+            getattr(item, field) for item in batch.items if getattr(item, field) is not None
+        }
+        if not requested:
+            continue
+        found = (
+            set(db.exec(select(model.id).where(model.id.in_(requested))).all())
+            if capabilities.has_table(model.__tablename__)
+            else set()
+        )
+        errors.extend(
+            {"loc": ["body", "items", index, field], "msg": message, "type": "not_found"}
+            for index, item in enumerate(batch.items)
+            if getattr(item, field) is not None and getattr(item, field) not in found
+        )
+    if errors:
+        errors.sort(key=lambda error: error["loc"][2])
+        raise HTTPException(status_code=422, detail=errors)
+
+    # PostgreSQL sends this as one INSERT ... RETURNING ordered by parameter
+    # position; SQLite cannot order RETURNING rows, so SQLAlchemy falls back
+    # to one statement per row there.
+    entries = db.scalars(
+        insert(DailyLogEntry).returning(DailyLogEntry, sort_by_parameter_order=True),
+        [item.model_dump() for item in batch.items],
+    ).all()
+    add_log_entries(db, entries)
+    # Read the RETURNING values before commit expires the instances.
+    results = [DailyLogEntryRead.model_validate(entry) for entry in entries]
+    db.commit()
+    return results
+
+
 @router.delete(
     "/{entry_id}", status_code=204, response_class=Response, response_model=None
 )
@@ -72,6 +240,7 @@ def delete_daily_log(entry_id: int, db: Session = Depends(get_db)) -> None:
     if entry is None:
         raise HTTPException(status_code=404, detail="Daily log entry not found")
 
+    remove_log_entries(db, [entry])
     db.delete(entry)
     db.commit()
 
@@ -89,4 +258,5 @@ def clear_daily_logs(
         statement = statement.where(DailyLogEntry.log_date == log_date)
 
     db.exec(statement)
+    clear_log_totals(db, user_id, log_date)
     db.commit()
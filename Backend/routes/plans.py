@@ -1,10 +1,21 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlmodel import Session, select
 
 from ..db import get_db
-from ..models import Plan, PlanCreate, PlanRead, PlanUpdate
+from ..models import (
+    Plan,
+    PlanCreate,
+    PlanEvaluationRead,
+    PlanPayloadRequest,
+    PlanRead,
+    PlanUpdate,
+    ShoppingListRead,
+)
+from ..services.plan_evaluation import evaluate_plan
+from ..services.plan_index import sync_plan_items
+from ..services.shopping_list import build_shopping_list
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 
@@ -17,6 +28,30 @@ def list_plans(db: Session = Depends(get_db)) -> List[PlanRead]:
     return [PlanRead.model_validate(plan) for plan in plans]
 
 
+@router.post("/shopping-list", response_model=ShoppingListRead)
+def build_inline_shopping_list(
+    request: PlanPayloadRequest, db: Session = Depends(get_db)
+) -> ShoppingListRead:
+    """Aggregate the shopping list for an unsaved plan payload."""
+    if request.payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Plan payload is required"
+        )
+    return build_shopping_list(db, request.payload)
+
+
+@router.post("/evaluation", response_model=PlanEvaluationRead)
+def evaluate_inline_plan(
+    request: PlanPayloadRequest, db: Session = Depends(get_db)
+) -> PlanEvaluationRead:
+    """Evaluate the macros of an unsaved plan payload."""
+    if request.payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Plan payload is required"
+        )
+    return evaluate_plan(db, request.payload)
+
+
 @router.get("/{plan_id}", response_model=PlanRead)
 def get_plan(plan_id: int, db: Session = Depends(get_db)) -> PlanRead:
     """Retrieve a single plan by ID."""
@@ -33,6 +68,8 @@ def create_plan(payload: PlanCreate, db: Session = Depends(get_db)) -> PlanRead:
     """Persist a new plan payload."""
     plan = Plan(label=payload.label.strip(), payload=payload.payload)
     db.add(plan)
+    db.flush()
+    sync_plan_items(db, plan.id, plan.payload)
     db.commit()
     db.refresh(plan)
     return PlanRead.model_validate(plan)
@@ -53,6 +90,7 @@ def update_plan(
         plan.label = payload.label.strip()
     if payload.payload is not None:
         plan.payload = payload.payload
+        sync_plan_items(db, plan.id, plan.payload)
 
     db.add(plan)
     db.commit()
@@ -60,6 +98,38 @@ def update_plan(
     return PlanRead.model_validate(plan)
 
 
+@router.get("/{plan_id}/evaluation", response_model=PlanEvaluationRead)
+def evaluate_stored_plan(plan_id: int, db: Session = Depends(get_db)) -> PlanEvaluationRead:
+    """Return per-item, total and per-day macros of a stored plan."""
+    plan = db.get(Plan, plan_id)
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found"
+        )
+    return evaluate_plan(db, plan.payload)
+
+
+@router.post("/{plan_id}/shopping-list", response_model=ShoppingListRead)
+def build_plan_shopping_list(
+    plan_id: int,
+    request: Optional[PlanPayloadRequest] = Body(default=None),
+    db: Session = Depends(get_db),
+) -> ShoppingListRead:
+    """Aggregate the shopping list for a stored plan.
+
+    An inline ``payload`` in the request body takes precedence over the stored
+    one, which lets clients preview unsaved edits of an existing plan.
+    """
+    plan = db.get(Plan, plan_id)
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found"
+        )
+    if request is not None and request.payload is not None:
+        return build_shopping_list(db, request.payload)
+    return build_shopping_list(db, plan.payload)
+
+
 @router.delete("/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_plan(plan_id: int, db: Session = Depends(get_db)) -> None:
     """Delete an existing plan."""
@@ -68,6 +138,7 @@ def delete_plan(plan_id: int, db: Session = Depends(get_db)) -> None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found"
         )
+    sync_plan_items(db, plan.id, None)
     db.delete(plan)
     db.commit()
     return None
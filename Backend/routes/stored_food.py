@@ -7,19 +7,22 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import Session, select
-from sqlalchemy import delete, func, inspect
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import case, delete, func, update
 
 from ..db import get_db
 from ..models import (
     DailyLogEntry,
+    DailyLogEntryRead,
     Food,
     Ingredient,
     StoredFood,
     StoredFoodConsume,
+    StoredFoodConsumeRead,
     StoredFoodCreate,
     StoredFoodRead,
 )
+from ..services.daily_log_totals import add_log_entries
+from ..services.schema_capabilities import get_schema_capabilities
 
 router = APIRouter(prefix="/stored_food", tags=["stored_food"])
 
@@ -47,23 +50,30 @@ def _apply_filters(
     return statement
 
 
-def _stored_food_table_available(db: Session) -> bool:
-    """Return ``True`` when the stored_food table exists in the database."""
+def _detach_log_entries(db: Session, *criteria) -> None:
+    """Point log entries of the matching stored food at its food or ingredient.
 
-    try:
-        bind = db.get_bind()
-    except SQLAlchemyError:
-        return False
+    One ``UPDATE daily_log_entries ... FROM stored_food`` covers every stored
+    food matching ``criteria``, so the entries survive the stored food's
+    deletion with the same source it was prepared from.
+    """
 
-    try:
-        inspector = inspect(bind)
-    except SQLAlchemyError:
-        return False
+    db.exec(
+        update(DailyLogEntry)
+        .where(DailyLogEntry.stored_food_id == StoredFood.id, *criteria)
+        .values(
+            stored_food_id=None,
+            food_id=StoredFood.food_id,
+            ingredient_id=StoredFood.ingredient_id,
+        )
+        .execution_options(synchronize_session=False)
+    )
 
-    try:
-        return inspector.has_table(StoredFood.__tablename__)
-    except SQLAlchemyError:
-        return False
+
+def _stored_food_table_available(db: Session) -> bool:
+    """Return ``True`` when the stored_food table exists in the database."""
+
+    return get_schema_capabilities(db).has_table(StoredFood.__tablename__)
 
 
 @router.post("/", response_model=StoredFoodRead, status_code=201)
@@ -126,13 +136,20 @@ def list_stored_food(
     return [StoredFoodRead.model_validate(item) for item in results]
 
 
-@router.post("/{stored_food_id}/consume", response_model=StoredFoodRead)
+@router.post("/{stored_food_id}/consume", response_model=StoredFoodConsumeRead)
 def consume_stored_food(
     stored_food_id: int,
     payload: StoredFoodConsume,
     db: Session = Depends(get_db),
-) -> StoredFoodRead:
-    """Consume portions from a stored food entry."""
+) -> StoredFoodConsumeRead:
+    """Consume portions from a stored food entry.
+
+    The portions are taken with a single conditional ``UPDATE ... RETURNING``
+    that only matches while enough portions remain, so concurrent consumers of
+    the same entry can neither over-consume nor lose each other's updates.
+    When ``log_date`` is given, a matching daily log entry is created in the
+    same transaction.
+    """
 
     if not _stored_food_table_available(db):
         raise HTTPException(
@@ -140,29 +157,64 @@ def consume_stored_food(
             detail=_UNAVAILABLE_DETAIL,
         )
 
-    stored_food = db.get(StoredFood, stored_food_id)
-    if not stored_food:
-        raise HTTPException(status_code=404, detail="Stored food not found")
-
-    if payload.portions <= 0:
-        raise HTTPException(status_code=400, detail="Portions must be greater than zero")
-
-    if stored_food.remaining_portions <= 0:
-        raise HTTPException(status_code=400, detail="No portions remaining")
+    stored_food = None
+    if payload.portions > 0:
+        remaining = StoredFood.remaining_portions - payload.portions
+        statement = (
+            update(StoredFood)
+            .where(
+                StoredFood.id == stored_food_id,
+                StoredFood.remaining_portions > 0,
+                StoredFood.remaining_portions >= payload.portions,
+            )
+            .values(
+                remaining_portions=remaining,
+                is_finished=remaining <= 0,
+                completed_at=case(
+                    (remaining <= 0, datetime.now(timezone.utc)),
+                    else_=StoredFood.completed_at,
+                ),
+            )
+            .returning(StoredFood)
+        )
+        stored_food = db.exec(statement).scalars().one_or_none()
 
-    if payload.portions > stored_food.remaining_portions:
+    if stored_food is None:
+        # Nothing was updated; report why from the row as it is now.
+        current = db.get(StoredFood, stored_food_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Stored food not found")
+        if payload.portions <= 0:
+            raise HTTPException(status_code=400, detail="Portions must be greater than zero")
+        if current.remaining_portions <= 0:
+            raise HTTPException(status_code=400, detail="No portions remaining")
         raise HTTPException(
             status_code=400, detail="Cannot consume more portions than remain"
         )
 
-    stored_food.remaining_portions = max(0.0, stored_food.remaining_portions - payload.portions)
-    stored_food.is_finished = stored_food.remaining_portions <= 0
-    if stored_food.is_finished:
-        stored_food.completed_at = datetime.now(timezone.utc)
-    db.add(stored_food)
+    entry = None
+    if payload.log_date is not None:
+        entry = DailyLogEntry(
+            user_id=stored_food.user_id,
+            log_date=payload.log_date,
+            stored_food_id=stored_food.id,
+            portions_consumed=payload.portions,
+            calories=stored_food.per_portion_calories * payload.portions,
+            protein=stored_food.per_portion_protein * payload.portions,
+            carbohydrates=stored_food.per_portion_carbohydrates * payload.portions,
+            fat=stored_food.per_portion_fat * payload.portions,
+            fiber=stored_food.per_portion_fiber * payload.portions,
+        )
+        db.add(entry)
+        add_log_entries(db, [entry])
+
     db.commit()
     db.refresh(stored_food)
-    return StoredFoodRead.model_validate(stored_food)
+    result = StoredFoodConsumeRead.model_validate(stored_food)
+    if entry is not None:
+        db.refresh(entry)
+        result.log_entry = DailyLogEntryRead.model_validate(entry)
+    return result
 
 
 @router.delete(
@@ -181,18 +233,7 @@ def delete_stored_food(stored_food_id: int, db: Session = Depends(get_db)) -> No
     if stored_food is None:
         raise HTTPException(status_code=404, detail="Stored food not found")
 
-    entries = db.exec(
-        select(DailyLogEntry).where(DailyLogEntry.stored_food_id == stored_food_id)
-    ).all()
-    for entry in entries:
-        entry.stored_food_id = None
-        if stored_food.food_id is not None:
-            entry.food_id = stored_food.food_id
-            entry.ingredient_id = None
-        elif stored_food.ingredient_id is not None:
-            entry.ingredient_id = stored_food.ingredient_id
-            entry.food_id = None
-
+    _detach_log_entries(db, StoredFood.id == stored_food_id)
     db.delete(stored_food)
     db.commit()
 
@@ -209,23 +250,7 @@ def clear_stored_food(user_id: str = Query(...), db: Session = Depends(get_db))
     if not _stored_food_table_available(db):
         return
 
-    stored_food_items = db.exec(
-        select(StoredFood).where(StoredFood.user_id == user_id)
-    ).all()
-
-    for stored_food in stored_food_items:
-        entries = db.exec(
-            select(DailyLogEntry).where(DailyLogEntry.stored_food_id == stored_food.id)
-        ).all()
-        for entry in entries:
-            entry.stored_food_id = None
-            if stored_food.food_id is not None:
-                entry.food_id = stored_food.food_id
-                entry.ingredient_id = None
-            elif stored_food.ingredient_id is not None:
-                entry.ingredient_id = stored_food.ingredient_id
-                entry.food_id = None
-
+    _detach_log_entries(db, StoredFood.user_id == user_id)
     statement = delete(StoredFood).where(StoredFood.user_id == user_id)
     db.exec(statement)
     db.commit()
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Literal
+import asyncio
+import importlib.util
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Iterable, Literal, TypeVar
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
-
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from Backend.db import SessionLocal, get_db
+from Backend.services.usda_cache import (
+    UsdaResponseCache,
+    food_cache_key,
+    search_cache_key,
+)
+from Backend.services.usda_index import get_local_foods, search_local_foods
 from Backend.settings import settings
 
 router = APIRouter(prefix="/usda", tags=["usda"])
@@ -31,6 +43,11 @@ _KILOCALORIE_UNITS = {"kcal", "kilocalorie", "kilocalories"}
 _GRAM_UNITS = {"g", "gram", "grams"}
 _MILLILITER_UNITS = {"ml", "milliliter", "milliliters", "mL"}
 _DEFAULT_USDA_DATA_TYPES = ["Foundation"]
+# FoodData Central accepts at most 20 ids per ``POST /foods`` request.
+_USDA_BATCH_CHUNK_SIZE = 20
+_MAX_USDA_BATCH_IDS = 200
+
+_T = TypeVar("_T")
 
 BasisType = Literal["per_100g", "per_100ml", "per_serving", "unknown"]
 NormalizedBasisType = Literal["per_g"]
@@ -80,6 +97,132 @@ class UsdaSearchResponse(BaseModel):
     foods: list[UsdaFoodSummary]
 
 
+class UsdaFoodBatchRequest(BaseModel):
+    fdc_ids: list[int] = Field(min_length=1, max_length=_MAX_USDA_BATCH_IDS)
+
+
+class UsdaFoodBatchResponse(BaseModel):
+    foods: dict[int, UsdaFoodSummary] = Field(default_factory=dict)
+    errors: dict[int, str] = Field(default_factory=dict)
+
+
+class UsdaCacheStatsResponse(BaseModel):
+    backend: Literal["memory", "database"]
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    shared_hits: int
+    misses: int
+
+
+def create_usda_client() -> httpx.AsyncClient:
+    """Build the pooled client shared by every USDA request.
+
+    The application lifespan creates one instance at startup and closes it on
+    shutdown so upstream TCP/TLS connections are reused across requests.
+    HTTP/2 is only negotiated when the optional ``h2`` package is installed.
+    """
+
+    http2 = settings.usda_http2 and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(settings.usda_http_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.usda_http_max_connections,
+            max_keepalive_connections=settings.usda_http_max_keepalive_connections,
+            keepalive_expiry=settings.usda_http_keepalive_expiry,
+        ),
+    )
+
+
+def get_usda_client(request: Request) -> httpx.AsyncClient:
+    """Return the shared USDA client created by the application lifespan."""
+
+    client = getattr(request.app.state, "usda_client", None)
+    if client is None:
+        raise HTTPException(status_code=503, detail="USDA client is not initialized.")
+    return client
+
+
+def create_usda_cache() -> UsdaResponseCache:
+    """Build the response cache for trimmed USDA search and detail payloads.
+
+    Each worker keeps its own LRU; with ``USDA_CACHE_SHARED`` enabled the
+    entries are also stored in the database so other workers can reuse them.
+    """
+
+    return UsdaResponseCache(
+        max_entries=settings.usda_cache_max_entries,
+        ttl_seconds=settings.usda_cache_ttl_seconds,
+        session_factory=SessionLocal if settings.usda_cache_shared else None,
+    )
+
+
+def get_usda_cache(request: Request) -> UsdaResponseCache:
+    """Return the response cache created by the application lifespan."""
+
+    cache = getattr(request.app.state, "usda_cache", None)
+    if cache is None:
+        raise HTTPException(status_code=503, detail="USDA cache is not initialized.")
+    return cache
+
+
+class UsdaSingleFlight:
+    """Coalesce concurrent identical upstream calls and cap how many run at once.
+
+    The first caller for a key starts the upstream task; callers arriving while
+    it is in flight await the same task and share its (trimmed) result or
+    error. The task is shielded so a disconnecting caller does not cancel it for
+    the others. Distinct keys share a semaphore bounding in-flight calls.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight: dict[str, asyncio.Task[Any]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: str, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._limited(fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _limited(self, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        async with self._semaphore:
+            return await fetch()
+
+    def _finish(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the error as retrieved even if every waiter went away.
+            task.exception()
+
+
+def create_usda_single_flight() -> UsdaSingleFlight:
+    """Build the coalescing/limiting layer in front of the USDA client."""
+
+    return UsdaSingleFlight(settings.usda_max_concurrent_requests)
+
+
+def get_usda_single_flight(request: Request) -> UsdaSingleFlight:
+    """Return the single-flight layer created by the application lifespan."""
+
+    flight = getattr(request.app.state, "usda_single_flight", None)
+    if flight is None:
+        raise HTTPException(
+            status_code=503, detail="USDA request limiter is not initialized."
+        )
+    return flight
+
+
 def _require_api_key() -> str:
     if not settings.usda_api_key:
         raise HTTPException(
@@ -400,9 +543,24 @@ def _trim_food_payload(food: dict[str, Any]) -> dict[str, Any]:
 async def search_foods(
     query: str = Query(..., min_length=1),
     data_types: list[USDADataType] | None = Query(default=None),
+    client: httpx.AsyncClient = Depends(get_usda_client),
+    cache: UsdaResponseCache = Depends(get_usda_cache),
+    flight: UsdaSingleFlight = Depends(get_usda_single_flight),
+    db: Session = Depends(get_db),
 ) -> dict[str, Any]:
-    api_key = _require_api_key()
     selected_data_types = data_types or _DEFAULT_USDA_DATA_TYPES
+    if settings.usda_local_index:
+        foods = await run_in_threadpool(
+            search_local_foods, db, query, selected_data_types
+        )
+        return {"foods": foods}
+
+    api_key = _require_api_key()
+    cache_key = search_cache_key(query, selected_data_types)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return {"foods": cached}
+
     params = {
         "query": query,
         "pageSize": 25,
@@ -410,28 +568,155 @@ async def search_foods(
         "api_key": api_key,
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async def fetch() -> list[dict[str, Any]]:
         try:
             response = await client.get(f"{_BASE_URL}/foods/search", params=params)
             response.raise_for_status()
         except httpx.HTTPError as exc:
-            raise HTTPException(status_code=502, detail=f"USDA API request failed: {exc}") from exc
+            raise HTTPException(
+                status_code=502, detail=f"USDA API request failed: {exc}"
+            ) from exc
+
+        payload = response.json()
+        foods = [_trim_food_payload(food) for food in payload.get("foods", [])]
+        await cache.set(cache_key, foods)
+        return foods
 
-    payload = response.json()
-    foods = [_trim_food_payload(food) for food in payload.get("foods", [])]
-    return {"foods": foods}
+    return {"foods": await flight.run(cache_key, fetch)}
 
 
 @router.get("/foods/{fdc_id}", response_model=UsdaFoodSummary)
-async def get_food_details(fdc_id: int) -> dict[str, Any]:
+async def get_food_details(
+    fdc_id: int,
+    client: httpx.AsyncClient = Depends(get_usda_client),
+    cache: UsdaResponseCache = Depends(get_usda_cache),
+    flight: UsdaSingleFlight = Depends(get_usda_single_flight),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    if settings.usda_local_index:
+        foods = await run_in_threadpool(get_local_foods, db, [fdc_id])
+        if fdc_id not in foods:
+            raise HTTPException(status_code=404, detail="USDA food not found.")
+        return foods[fdc_id]
+
     api_key = _require_api_key()
+    cache_key = food_cache_key(fdc_id)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     params = {"api_key": api_key}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async def fetch() -> dict[str, Any]:
         try:
             response = await client.get(f"{_BASE_URL}/food/{fdc_id}", params=params)
             response.raise_for_status()
         except httpx.HTTPError as exc:
-            raise HTTPException(status_code=502, detail=f"USDA API request failed: {exc}") from exc
+            raise HTTPException(
+                status_code=502, detail=f"USDA API request failed: {exc}"
+            ) from exc
+
+        food = _trim_food_payload(response.json())
+        await cache.set(cache_key, food)
+        return food
+
+    return await flight.run(cache_key, fetch)
+
+
+@router.post("/foods:batch", response_model=UsdaFoodBatchResponse)
+async def get_food_details_batch(
+    batch: UsdaFoodBatchRequest,
+    client: httpx.AsyncClient = Depends(get_usda_client),
+    cache: UsdaResponseCache = Depends(get_usda_cache),
+    flight: UsdaSingleFlight = Depends(get_usda_single_flight),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """Fetch several foods at once through the upstream multi-food endpoint.
+
+    Cached ids are answered locally; the rest are requested in chunks of
+    ``_USDA_BATCH_CHUNK_SIZE`` concurrently. Ids that fail or that USDA does
+    not return are reported in ``errors`` instead of failing the whole batch.
+    """
+
+    fdc_ids = list(dict.fromkeys(batch.fdc_ids))
+    if settings.usda_local_index:
+        local = await run_in_threadpool(get_local_foods, db, fdc_ids)
+        return {
+            "foods": {fdc_id: local[fdc_id] for fdc_id in fdc_ids if fdc_id in local},
+            "errors": {
+                fdc_id: "USDA food not found." for fdc_id in fdc_ids if fdc_id not in local
+            },
+        }
+
+    api_key = _require_api_key()
+    foods: dict[int, dict[str, Any]] = {}
+    errors: dict[int, str] = {}
+
+    missing: list[int] = []
+    for fdc_id in fdc_ids:
+        cached = await cache.get(food_cache_key(fdc_id))
+        if cached is not None:
+            foods[fdc_id] = cached
+        else:
+            missing.append(fdc_id)
+
+    chunks = [
+        missing[start : start + _USDA_BATCH_CHUNK_SIZE]
+        for start in range(0, len(missing), _USDA_BATCH_CHUNK_SIZE)
+    ]
+
+    def fetch_chunk(chunk: list[int]) -> Callable[[], Awaitable[list[dict[str, Any]]]]:
+        async def fetch() -> list[dict[str, Any]]:
+            try:
+                response = await client.post(
+                    f"{_BASE_URL}/foods",
+                    params={"api_key": api_key},
+                    json={"fdcIds": chunk},
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as exc:
+                raise HTTPException(
+                    status_code=502, detail=f"USDA API request failed: {exc}"
+                ) from exc
+
+            trimmed = [_trim_food_payload(food) for food in response.json() or []]
+            for food in trimmed:
+                if food["id"] is not None:
+                    await cache.set(food_cache_key(food["id"]), food)
+            return trimmed
+
+        return fetch
+
+    results = await asyncio.gather(
+        *(
+            flight.run("foods:" + ",".join(map(str, sorted(chunk))), fetch_chunk(chunk))
+            for chunk in chunks
+        ),
+        return_exceptions=True,
+    )
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, HTTPException):
+            errors.update({fdc_id: str(result.detail) for fdc_id in chunk})
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        returned = {food["id"]: food for food in result}
+        for fdc_id in chunk:
+            if fdc_id in returned:
+                foods[fdc_id] = returned[fdc_id]
+            else:
+                errors[fdc_id] = "USDA food not found."
+
+    return {
+        "foods": {fdc_id: foods[fdc_id] for fdc_id in fdc_ids if fdc_id in foods},
+        "errors": errors,
+    }
+
+
+@router.get("/cache/stats", response_model=UsdaCacheStatsResponse)
+def get_cache_stats(
+    cache: UsdaResponseCache = Depends(get_usda_cache),
+) -> UsdaCacheStatsResponse:
+    """Report this worker's USDA cache hit/miss counters."""
 
-    return _trim_food_payload(response.json())
+    return UsdaCacheStatsResponse(**asdict(cache.stats()))
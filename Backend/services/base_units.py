@@ -0,0 +1,145 @@
+"""Process-wide cache of each ingredient's base unit id.
+
+Food payloads may reference the synthetic unit id ``0`` ("1 g"), which has to
+be stored as a real ``ingredient_units`` row: the unit picked by
+``plan_engine.find_gram_unit`` (the rule plans use too), else the first unit.
+Lookups for a whole payload are resolved with one ``SELECT`` and remembered per
+engine.
+Entries are dropped when this process inserts, updates or deletes a unit
+(again when that transaction commits or rolls back), and expire after
+``settings.base_unit_cache_seconds`` so edits made by other processes are
+picked up.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+
+from ..models import IngredientUnit
+from ..settings import settings
+from .plan_engine import find_gram_unit
+
+_PENDING_KEY = "base_unit_changes"
+
+_lock = threading.Lock()
+# engine -> ingredient id -> (base unit id, cached at)
+_registry: "weakref.WeakKeyDictionary[Engine, Dict[int, Tuple[int, float]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def pick_base_unit_id(units: List[IngredientUnit]) -> Optional[int]:
+    """Return the base unit id among one ingredient's ``units``.
+
+    Uses :func:`~.plan_engine.find_gram_unit`, falling back to the first unit.
+    """
+
+    units = [unit for unit in units if getattr(unit, "id", None) is not None]
+    unit = find_gram_unit(units)
+    if unit is None and units:
+        unit = units[0]
+    return unit.id if unit is not None else None
+
+
+def resolve_base_unit_ids(
+    session: Session,
+    ingredient_ids: Iterable[int],
+    *,
+    clock: Callable[[], float] = time.monotonic,
+) -> Dict[int, Optional[int]]:
+    """Return the base unit id of every ingredient in ``ingredient_ids``.
+
+    Ingredients without units map to ``None``; those results are not cached.
+    """
+
+    wanted = {i for i in ingredient_ids if i is not None}
+    if not wanted:
+        return {}
+    engine = session.get_bind().engine
+    lifetime = settings.base_unit_cache_seconds
+    now = clock()
+
+    resolved: Dict[int, Optional[int]] = {}
+    if lifetime > 0:
+        with _lock:
+            cached = _registry.get(engine, {})
+            for ingredient_id in wanted:
+                entry = cached.get(ingredient_id)
+                if entry is not None and now - entry[1] < lifetime:
+                    resolved[ingredient_id] = entry[0]
+    missing = wanted - resolved.keys()
+    if not missing:
+        return resolved
+
+    units: Dict[int, List[IngredientUnit]] = defaultdict(list)
+    for unit in session.exec(
+        select(IngredientUnit)
+        .where(IngredientUnit.ingredient_id.in_(missing))
+        .order_by(IngredientUnit.id)
+    ).all():
+        units[unit.ingredient_id].append(unit)
+    fresh = {ingredient_id: pick_base_unit_id(units[ingredient_id]) for ingredient_id in missing}
+    resolved.update(fresh)
+
+    if lifetime > 0:
+        with _lock:
+            cached = _registry.setdefault(engine, {})
+            for ingredient_id, unit_id in fresh.items():
+                if unit_id is not None:
+                    cached[ingredient_id] = (unit_id, now)
+    return resolved
+
+
+def invalidate_base_units(
+    engine: Optional[Engine] = None, ingredient_ids: Optional[Iterable[int]] = None
+) -> None:
+    """Forget cached base units: everything, one engine, or some of its ingredients."""
+
+    with _lock:
+        if engine is None:
+            _registry.clear()
+        elif ingredient_ids is None:
+            _registry.pop(engine, None)
+        else:
+            cached = _registry.get(engine, {})
+            for ingredient_id in ingredient_ids:
+                cached.pop(ingredient_id, None)
+
+
+@event.listens_for(IngredientUnit, "after_insert")
+@event.listens_for(IngredientUnit, "after_update")
+@event.listens_for(IngredientUnit, "after_delete")
+def _forget_changed_unit(mapper, connection, target: IngredientUnit) -> None:
+    if target.ingredient_id is None:
+        return
+    invalidate_base_units(connection.engine, [target.ingredient_id])
+    session = OrmSession.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(
+            (connection.engine, target.ingredient_id)
+        )
+
+
+# Another request may cache the old unit between this flush and the commit
+# (or repopulate it from uncommitted rows); forget the entries once more.
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _forget_after_transaction(session: OrmSession, *args) -> None:
+    for engine, ingredient_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_base_units(engine, [ingredient_id])
+
+
+__all__ = [
+    "invalidate_base_units",
+    "pick_base_unit_id",
+    "resolve_base_unit_ids",
+]
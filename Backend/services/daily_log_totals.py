@@ -0,0 +1,132 @@
+"""Incremental maintenance of the ``daily_log_totals`` rollup.
+
+Every route that adds or removes ``daily_log_entries`` calls into this module
+before committing, so the per-user, per-day totals change in the same
+transaction as the entries. Increments are applied with ``INSERT ... ON
+CONFLICT DO UPDATE`` so concurrent writers to the same day add up instead of
+overwriting each other. ``rebuild_daily_log_totals`` recomputes the rollup
+from the raw entries (see ``Database/backfill_daily_log_totals.py``).
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from ..models import DailyLogEntry, DailyLogTotal
+
+MACRO_FIELDS = ("calories", "protein", "carbohydrates", "fat", "fiber")
+
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def _deltas(
+    entries: Iterable[DailyLogEntry], sign: int
+) -> List[Dict[str, object]]:
+    totals: Dict[Tuple[str, date], Dict[str, object]] = defaultdict(
+        lambda: {"entry_count": 0, **{field: 0.0 for field in MACRO_FIELDS}}
+    )
+    for entry in entries:
+        row = totals[(entry.user_id, entry.log_date)]
+        row["entry_count"] += sign
+        for field in MACRO_FIELDS:
+            row[field] += sign * getattr(entry, field)
+    return [
+        {"user_id": user_id, "log_date": log_date, **values}
+        for (user_id, log_date), values in totals.items()
+    ]
+
+
+def _apply(session: Session, rows: List[Dict[str, object]]) -> None:
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    insert_factory = _UPSERT_INSERTS.get(dialect)
+    if insert_factory is None:
+        raise RuntimeError(f"daily_log_totals upserts are not supported on {dialect}")
+
+    table = DailyLogTotal.__table__
+    statement = insert_factory(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.log_date],
+        set_={
+            column: table.c[column] + statement.excluded[column]
+            for column in ("entry_count", *MACRO_FIELDS)
+        },
+    )
+    session.execute(statement, rows)
+
+    # Days whose last entry went away drop out of the rollup entirely.
+    removed = [row for row in rows if row["entry_count"] < 0]
+    for row in removed:
+        session.execute(
+            delete(DailyLogTotal).where(
+                DailyLogTotal.user_id == row["user_id"],
+                DailyLogTotal.log_date == row["log_date"],
+                DailyLogTotal.entry_count <= 0,
+            )
+        )
+
+
+def add_log_entries(session: Session, entries: Iterable[DailyLogEntry]) -> None:
+    """Add ``entries`` (new, not yet committed) to their days' totals."""
+
+    _apply(session, _deltas(entries, 1))
+
+
+def remove_log_entries(session: Session, entries: Iterable[DailyLogEntry]) -> None:
+    """Subtract ``entries`` (about to be deleted) from their days' totals."""
+
+    _apply(session, _deltas(entries, -1))
+
+
+def clear_log_totals(
+    session: Session, user_id: str, log_date: Optional[date] = None
+) -> None:
+    """Drop the totals matching a bulk delete of a user's entries."""
+
+    statement = delete(DailyLogTotal).where(DailyLogTotal.user_id == user_id)
+    if log_date is not None:
+        statement = statement.where(DailyLogTotal.log_date == log_date)
+    session.execute(statement)
+
+
+def rebuild_daily_log_totals(session: Session, user_id: Optional[str] = None) -> int:
+    """Recompute the rollup from ``daily_log_entries``; returns the day count.
+
+    Limited to one user when ``user_id`` is given. The caller commits.
+    """
+
+    clear = delete(DailyLogTotal)
+    aggregate = select(
+        DailyLogEntry.user_id,
+        DailyLogEntry.log_date,
+        func.count(DailyLogEntry.id),
+        *(func.sum(getattr(DailyLogEntry, field)) for field in MACRO_FIELDS),
+    ).group_by(DailyLogEntry.user_id, DailyLogEntry.log_date)
+    if user_id is not None:
+        clear = clear.where(DailyLogTotal.user_id == user_id)
+        aggregate = aggregate.where(DailyLogEntry.user_id == user_id)
+
+    session.execute(clear)
+    result = session.execute(
+        insert(DailyLogTotal).from_select(
+            ["user_id", "log_date", "entry_count", *MACRO_FIELDS], aggregate
+        )
+    )
+    return result.rowcount
+
+
+__all__ = [
+    "MACRO_FIELDS",
+    "add_log_entries",
+    "clear_log_totals",
+    "rebuild_daily_log_totals",
+    "remove_log_entries",
+]
@@ -0,0 +1,86 @@
+"""Reverse dependency lookup: what is affected when an ingredient changes.
+
+An ingredient feeds the foods that contain it (``food_ingredients``), the
+saved plans that list it or one of those foods (``plan_items``, see
+:mod:`.plan_index`) and the open stored food prepared from either. Each
+category is a single indexed query, so impact analysis and cache invalidation
+never parse plan payloads.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+from sqlalchemy import or_
+from sqlmodel import Session, select
+
+from ..models import Food, FoodIngredient, Plan, PlanItem, StoredFood
+from ..models.schemas import (
+    DependentFood,
+    DependentPlan,
+    DependentStoredFood,
+    IngredientDependentsRead,
+)
+from .schema_capabilities import get_schema_capabilities
+
+
+def find_ingredient_dependents(
+    session: Session, ingredient_id: int
+) -> IngredientDependentsRead:
+    """Return the foods, plans and open stored food that use ``ingredient_id``."""
+
+    foods = [
+        DependentFood(id=food_id, name=name)
+        for food_id, name in session.exec(
+            select(Food.id, Food.name)
+            .join(FoodIngredient, FoodIngredient.food_id == Food.id)
+            .where(FoodIngredient.ingredient_id == ingredient_id)
+            .order_by(Food.id)
+        ).all()
+    ]
+    food_ids = [food.id for food in foods]
+
+    plans: Dict[int, DependentPlan] = {}
+    for plan_id, label, food_id in session.exec(
+        select(Plan.id, Plan.label, PlanItem.food_id)
+        .join(PlanItem, PlanItem.plan_id == Plan.id)
+        .where(
+            or_(
+                PlanItem.ingredient_id == ingredient_id,
+                PlanItem.food_id.in_(food_ids),
+            )
+        )
+        .order_by(Plan.id, PlanItem.position)
+    ).all():
+        plan = plans.setdefault(plan_id, DependentPlan(id=plan_id, label=label))
+        if food_id is None:
+            plan.direct = True
+        elif food_id not in plan.food_ids:
+            plan.food_ids.append(food_id)
+
+    stored_food = []
+    if get_schema_capabilities(session).has_table(StoredFood.__tablename__):
+        stored_food = [
+            DependentStoredFood.model_validate(item, from_attributes=True)
+            for item in session.exec(
+                select(StoredFood)
+                .where(
+                    StoredFood.is_finished.is_(False),
+                    or_(
+                        StoredFood.ingredient_id == ingredient_id,
+                        StoredFood.food_id.in_(food_ids),
+                    ),
+                )
+                .order_by(StoredFood.id)
+            ).all()
+        ]
+
+    return IngredientDependentsRead(
+        ingredient_id=ingredient_id,
+        foods=foods,
+        plans=list(plans.values()),
+        stored_food=stored_food,
+    )
+
+
+__all__ = ["find_ingredient_dependents"]
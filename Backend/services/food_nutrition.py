@@ -0,0 +1,111 @@
+"""Maintenance of the denormalized ``food_nutrition_totals`` table.
+
+A food's macros are the sum over its ingredient lines of ``unit_quantity`` x
+the unit's grams x the ingredient's per-gram ``nutrition``. The food and
+ingredient routes call :func:`refresh_food_totals` or
+:func:`refresh_foods_using_ingredients` after flushing their changes, so the
+stored totals change in the same transaction as their inputs. Each refresh is
+one ``DELETE`` plus one ``INSERT ... SELECT`` regardless of how many foods it
+covers.
+
+Unit resolution follows ``plan_evaluation.ingredient_macros``: a line without a
+unit, or whose unit does not belong to the ingredient, counts its quantity as
+grams.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import and_, delete, func, insert
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from ..models import Food, FoodIngredient, FoodNutritionTotal, IngredientUnit, Nutrition
+
+MACRO_FIELDS = ("calories", "protein", "carbohydrates", "fat", "fiber")
+
+
+def _totals_select(food_filter=None):
+    unit = aliased(IngredientUnit)
+    grams = func.coalesce(unit.grams, 1.0) * func.coalesce(FoodIngredient.unit_quantity, 0.0)
+    statement = (
+        select(
+            Food.id,
+            func.coalesce(func.sum(grams), 0.0),
+            *(
+                func.coalesce(
+                    func.sum(grams * func.coalesce(getattr(Nutrition, field), 0.0)), 0.0
+                )
+                for field in MACRO_FIELDS
+            ),
+        )
+        .select_from(Food)
+        .outerjoin(FoodIngredient, FoodIngredient.food_id == Food.id)
+        .outerjoin(
+            unit,
+            and_(
+                unit.id == FoodIngredient.unit_id,
+                unit.ingredient_id == FoodIngredient.ingredient_id,
+            ),
+        )
+        .outerjoin(Nutrition, Nutrition.ingredient_id == FoodIngredient.ingredient_id)
+        .group_by(Food.id)
+    )
+    if food_filter is not None:
+        statement = statement.where(food_filter)
+    return statement
+
+
+def _refresh(session: Session, food_filter=None) -> int:
+    statement = delete(FoodNutritionTotal)
+    if food_filter is not None:
+        statement = statement.where(
+            FoodNutritionTotal.food_id.in_(select(Food.id).where(food_filter))
+        )
+    session.exec(statement)
+    result = session.exec(
+        insert(FoodNutritionTotal).from_select(
+            ["food_id", "grams", *MACRO_FIELDS], _totals_select(food_filter)
+        )
+    )
+    return result.rowcount
+
+
+def refresh_food_totals(session: Session, food_ids: Iterable[int]) -> None:
+    """Recompute the stored totals of ``food_ids`` (flush pending changes first)."""
+
+    food_ids = {food_id for food_id in food_ids if food_id is not None}
+    if food_ids:
+        _refresh(session, Food.id.in_(food_ids))
+
+
+def refresh_foods_using_ingredients(
+    session: Session, ingredient_ids: Iterable[int]
+) -> None:
+    """Recompute the totals of every food that contains one of ``ingredient_ids``."""
+
+    ingredient_ids = {i for i in ingredient_ids if i is not None}
+    if ingredient_ids:
+        _refresh(
+            session,
+            Food.id.in_(
+                select(FoodIngredient.food_id).where(
+                    FoodIngredient.ingredient_id.in_(ingredient_ids)
+                )
+            ),
+        )
+
+
+def rebuild_food_totals(session: Session) -> int:
+    """Recompute the totals of every food; returns the number of foods."""
+
+    return _refresh(session)
+
+
+__all__ = [
+    "MACRO_FIELDS",
+    "rebuild_food_totals",
+    "refresh_food_totals",
+    "refresh_foods_using_ingredients",
+]
@@ -0,0 +1,202 @@
+"""Column-level serialization of ingredient listings.
+
+``ingredient_to_read`` validates an ``IngredientRead`` from fully loaded ORM
+objects, which is fine for one ingredient but dominates CPU time when listing
+thousands. The listing instead selects only the columns ``IngredientRead``
+exposes and builds plain dictionaries of the same shape, which
+``pydantic_core.to_json`` turns into the response body directly:
+
+* one query for the ingredients of the page with their nutrition, preferred
+  shopping unit and primary source (picked in SQL by an indexed ``LIMIT 1``
+  lookup with the same precedence as ``_resolve_primary_source``: a ``usda``
+  mapping, else the lowest ``(source, source_id, id)``),
+* one query each for the units and the tags of those ingredients.
+
+Ingredients without a unit named ``g`` get the synthetic base unit appended,
+as in ``ingredient_to_read``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic_core import to_json
+from sqlalchemy import case
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from sqlmodel import Session, select
+
+from ..models import (
+    Ingredient,
+    IngredientShoppingUnit,
+    IngredientSource,
+    IngredientTagLink,
+    IngredientUnit,
+    Nutrition,
+    PossibleIngredientTag,
+)
+
+_NUTRITION_FIELDS = ("calories", "protein", "carbohydrates", "fat", "fiber")
+
+
+def _primary_source_id():
+    """Correlated lookup of the id of each ingredient's primary source mapping."""
+
+    is_usda = IngredientSource.source == "usda"
+    return (
+        select(IngredientSource.id)
+        .where(IngredientSource.ingredient_id == Ingredient.id)
+        .order_by(
+            case((is_usda, 0), else_=1),
+            case((is_usda, IngredientSource.id)),
+            IngredientSource.source,
+            IngredientSource.source_id,
+            IngredientSource.id,
+        )
+        .limit(1)
+        .correlate(Ingredient)
+        .scalar_subquery()
+    )
+
+
+def _unit(unit_id, ingredient_id, name, grams) -> Dict[str, Any]:
+    return {
+        "id": unit_id,
+        "name": name,
+        "grams": None if grams is None else float(grams),
+        "ingredient_id": ingredient_id,
+    }
+
+
+def ingredient_read_rows(session: Session, ids: Select) -> List[Dict[str, Any]]:
+    """Return ``IngredientRead``-shaped dicts for the ingredients selected by ``ids``.
+
+    ``ids`` selects a single column of ingredient ids (it may filter, order and
+    limit); the rows are returned ordered by ``(name, id)``.
+    """
+
+    page = ids.subquery("page")
+    shopping = aliased(IngredientUnit)
+    statement = (
+        select(
+            Ingredient.id,
+            Ingredient.name,
+            IngredientSource.source,
+            IngredientSource.source_id,
+            Nutrition.id,
+            *(getattr(Nutrition, field) for field in _NUTRITION_FIELDS),
+            IngredientShoppingUnit.unit_id,
+            shopping.id,
+            shopping.ingredient_id,
+            shopping.name,
+            shopping.grams,
+        )
+        .join(page, page.c[0] == Ingredient.id)
+        .outerjoin(Nutrition, Nutrition.ingredient_id == Ingredient.id)
+        .outerjoin(IngredientSource, IngredientSource.id == _primary_source_id())
+        .outerjoin(
+            IngredientShoppingUnit, IngredientShoppingUnit.ingredient_id == Ingredient.id
+        )
+        # Both columns of ``fk_shopping_unit_matches_ingredient``, so either
+        # index on ingredient_units is an exact probe.
+        .outerjoin(
+            shopping,
+            (shopping.ingredient_id == IngredientShoppingUnit.ingredient_id)
+            & (shopping.id == IngredientShoppingUnit.unit_id),
+        )
+        .order_by(Ingredient.name, Ingredient.id)
+    )
+
+    rows: List[Dict[str, Any]] = []
+    by_id: Dict[int, Dict[str, Any]] = {}
+    for (
+        ingredient_id,
+        name,
+        source_name,
+        source_id,
+        nutrition_id,
+        calories,
+        protein,
+        carbohydrates,
+        fat,
+        fiber,
+        shopping_unit_id,
+        unit_id,
+        unit_ingredient_id,
+        unit_name,
+        unit_grams,
+    ) in session.exec(statement):
+        nutrition: Optional[Dict[str, Any]] = None
+        if nutrition_id is not None:
+            nutrition = {
+                "id": nutrition_id,
+                "ingredient_id": ingredient_id,
+                "calories": float(calories),
+                "protein": float(protein),
+                "carbohydrates": float(carbohydrates),
+                "fat": float(fat),
+                "fiber": float(fiber),
+            }
+        shopping_unit = (
+            _unit(unit_id, unit_ingredient_id, unit_name, unit_grams)
+            if unit_id is not None
+            else None
+        )
+        row = {
+            "id": ingredient_id,
+            "name": name,
+            "source": source_name,
+            "source_id": source_id,
+            "nutrition": nutrition,
+            "units": [],
+            "tags": [],
+            "shopping_unit_id": unit_id if unit_id is not None else shopping_unit_id,
+            "shopping_unit": shopping_unit,
+        }
+        rows.append(row)
+        by_id[ingredient_id] = row
+    if not rows:
+        return rows
+
+    has_base_unit = set()
+    for unit_id, ingredient_id, unit_name, unit_grams in session.exec(
+        select(
+            IngredientUnit.id,
+            IngredientUnit.ingredient_id,
+            IngredientUnit.name,
+            IngredientUnit.grams,
+        )
+        .where(IngredientUnit.ingredient_id.in_(select(page.c[0])))
+        .order_by(IngredientUnit.id)
+    ):
+        by_id[ingredient_id]["units"].append(
+            _unit(unit_id, ingredient_id, unit_name, unit_grams)
+        )
+        if unit_name == "g":
+            has_base_unit.add(ingredient_id)
+
+    for ingredient_id, tag_id, tag_name in session.exec(
+        select(
+            IngredientTagLink.ingredient_id,
+            PossibleIngredientTag.id,
+            PossibleIngredientTag.name,
+        )
+        .join(PossibleIngredientTag, PossibleIngredientTag.id == IngredientTagLink.tag_id)
+        .where(IngredientTagLink.ingredient_id.in_(select(page.c[0])))
+        .order_by(IngredientTagLink.ingredient_id, PossibleIngredientTag.id)
+    ):
+        by_id[ingredient_id]["tags"].append({"id": tag_id, "name": tag_name})
+
+    for row in rows:
+        if row["id"] not in has_base_unit:
+            row["units"].append(_unit(None, None, "g", 1.0))
+    return rows
+
+
+def dump_ingredient_rows(rows: List[Dict[str, Any]]) -> bytes:
+    """Encode rows from :func:`ingredient_read_rows` as a JSON array."""
+
+    return to_json(rows)
+
+
+__all__ = ["dump_ingredient_rows", "ingredient_read_rows"]
@@ -0,0 +1,234 @@
+"""Server-side evaluation of persisted plan payloads.
+
+Plans are stored as the JSON document produced by the planning UI::
+
+    {
+        "days": 2,
+        "targetMacros": {"calories": 2000, ...},
+        "plan": [
+            {"type": "food", "foodId": "1", "portions": 2, "overrides": {...}},
+            {"type": "ingredient", "ingredientId": "5", "unitId": 3, "amount": 1,
+             "portions": 1},
+        ],
+    }
+
+The helpers below load only the catalog rows a plan references, using a fixed
+number of queries, and then walk the items in memory.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from ..models import Food, Ingredient, IngredientShoppingUnit, IngredientUnit
+
+_GRAM_TOLERANCE = 1e-9
+
+
+@dataclass
+class PlanCatalog:
+    """Foods and ingredients referenced by a plan, keyed by id."""
+
+    foods: Dict[int, Food] = field(default_factory=dict)
+    ingredients: Dict[int, Ingredient] = field(default_factory=dict)
+
+
+@dataclass
+class ResolvedUnit:
+    """Unit selected for a plan line; ``id`` is ``None`` for the synthetic gram."""
+
+    id: Optional[int]
+    name: str
+    grams: float
+
+
+def coerce_id(value: Any) -> Optional[int]:
+    """Return ``value`` as an integer id, or ``None`` when it is not one."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        candidate = value.strip()
+        if not candidate:
+            return None
+        try:
+            return int(candidate)
+        except ValueError:
+            return None
+    return None
+
+
+def coerce_number(value: Any) -> float:
+    """Mirror the frontend ``toNumber`` helper: invalid values become ``0``."""
+
+    if value is None or isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str) and value.strip():
+        try:
+            number = float(value)
+        except ValueError:
+            return 0.0
+    else:
+        return 0.0
+    if number != number or number in (float("inf"), float("-inf")):
+        return 0.0
+    return number
+
+
+def indexed_plan_items(payload: Optional[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Return ``(index, item)`` for the well-formed items of a plan payload.
+
+    ``index`` is the item's position in the raw ``payload["plan"]`` list, so
+    skipping a malformed entry does not renumber the items after it.
+    """
+
+    raw_items = (payload or {}).get("plan")
+    if not isinstance(raw_items, list):
+        return []
+    return [
+        (index, item)
+        for index, item in enumerate(raw_items)
+        if isinstance(item, dict) and "type" in item
+    ]
+
+
+def plan_items(payload: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the well-formed item dictionaries of a plan payload."""
+
+    return [item for _, item in indexed_plan_items(payload)]
+
+
+def load_plan_catalog(db: Session, items: Iterable[Dict[str, Any]]) -> PlanCatalog:
+    """Batch-load every food and ingredient referenced by ``items``.
+
+    Foods are fetched first (with their ingredient lines) so the ingredient
+    query can include ingredients that only appear inside foods. The number of
+    statements is constant regardless of plan size.
+    """
+
+    food_ids: set[int] = set()
+    ingredient_ids: set[int] = set()
+    for item in items:
+        if item.get("type") == "food":
+            food_id = coerce_id(item.get("foodId"))
+            if food_id is not None:
+                food_ids.add(food_id)
+        elif item.get("type") == "ingredient":
+            ingredient_id = coerce_id(item.get("ingredientId"))
+            if ingredient_id is not None:
+                ingredient_ids.add(ingredient_id)
+
+    catalog = PlanCatalog()
+    if food_ids:
+        statement = (
+            select(Food)
+            .options(selectinload(Food.ingredients))
+            .where(Food.id.in_(food_ids))
+        )
+        for food in db.exec(statement).all():
+            catalog.foods[food.id] = food
+            ingredient_ids.update(
+                line.ingredient_id for line in food.ingredients if line.ingredient_id is not None
+            )
+
+    if ingredient_ids:
+        statement = (
+            select(Ingredient)
+            .options(
+                selectinload(Ingredient.nutrition),
+                selectinload(Ingredient.units),
+                selectinload(Ingredient.shopping_unit),
+            )
+            .where(Ingredient.id.in_(ingredient_ids))
+        )
+        for ingredient in db.exec(statement).all():
+            catalog.ingredients[ingredient.id] = ingredient
+
+    return catalog
+
+
+def _unit_grams(unit: IngredientUnit) -> float:
+    return coerce_number(getattr(unit, "grams", None))
+
+
+def is_gram_unit(unit: IngredientUnit) -> bool:
+    """Return whether ``unit`` weighs one gram."""
+
+    return abs(_unit_grams(unit) - 1.0) < _GRAM_TOLERANCE
+
+
+def find_gram_unit(units: Iterable[IngredientUnit]) -> Optional[IngredientUnit]:
+    """Return the one-gram unit named ``g``, else any one-gram unit, else ``None``.
+
+    This is the single rule for an ingredient's base unit; callers choose
+    their own fallback when it finds nothing.
+    """
+
+    units = list(units)
+    for unit in units:
+        if (unit.name or "").strip().lower() == "g" and is_gram_unit(unit):
+            return unit
+    for unit in units:
+        if is_gram_unit(unit):
+            return unit
+    return None
+
+
+def base_unit(ingredient: Ingredient) -> ResolvedUnit:
+    """Return the ingredient's gram unit, synthesizing one when it is missing."""
+
+    unit = find_gram_unit(ingredient.units or [])
+    if unit is not None:
+        return ResolvedUnit(id=unit.id, name=unit.name, grams=1.0)
+    return ResolvedUnit(id=None, name="g", grams=1.0)
+
+
+def resolve_unit(ingredient: Ingredient, raw_unit_id: Any) -> Optional[ResolvedUnit]:
+    """Resolve a plan unit reference against the ingredient's units.
+
+    ``None`` and the synthetic ``0`` placeholder both refer to the base gram
+    unit. Unknown ids resolve to ``None`` so callers can report an issue.
+    """
+
+    unit_id = coerce_id(raw_unit_id)
+    if unit_id is None or unit_id == 0:
+        return base_unit(ingredient)
+    for unit in ingredient.units or []:
+        if unit.id == unit_id:
+            return ResolvedUnit(id=unit.id, name=unit.name, grams=_unit_grams(unit))
+    return None
+
+
+def preferred_shopping_unit(ingredient: Ingredient) -> Optional[ResolvedUnit]:
+    """Return the ingredient's preferred :class:`IngredientShoppingUnit`, if any."""
+
+    selection: Optional[IngredientShoppingUnit] = ingredient.shopping_unit
+    if selection is None or selection.unit_id is None:
+        return None
+    return resolve_unit(ingredient, selection.unit_id)
+
+
+__all__ = [
+    "PlanCatalog",
+    "ResolvedUnit",
+    "base_unit",
+    "coerce_id",
+    "coerce_number",
+    "find_gram_unit",
+    "indexed_plan_items",
+    "is_gram_unit",
+    "load_plan_catalog",
+    "plan_items",
+    "preferred_shopping_unit",
+    "resolve_unit",
+]
@@ -0,0 +1,166 @@
+"""Macro evaluation for plan payloads.
+
+Mirrors the planning UI (``Frontend/src/utils/nutrition.ts`` and the totals in
+``Planning.tsx``): each line's macros are scaled by its portions, the totals are
+divided by ``days`` to get the per-day average and compared with
+``targetMacros``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Session
+
+from ..models import Food, Ingredient
+from ..models.schemas import PlanEvaluationRead, PlanItemEvaluation, PlanMacros
+from .plan_engine import (
+    PlanCatalog,
+    base_unit,
+    coerce_id,
+    coerce_number,
+    indexed_plan_items,
+    load_plan_catalog,
+    resolve_unit,
+)
+
+MACRO_FIELDS = ("calories", "protein", "carbohydrates", "fat", "fiber")
+
+# ``targetMacros`` is written by the frontend, which abbreviates carbohydrates.
+_TARGET_ALIASES = {"carbohydrates": ("carbohydrates", "carbs")}
+
+
+def _zero() -> Dict[str, float]:
+    return {field: 0.0 for field in MACRO_FIELDS}
+
+
+def _add(totals: Dict[str, float], delta: Dict[str, float], factor: float = 1.0) -> None:
+    for field in MACRO_FIELDS:
+        totals[field] += delta[field] * factor
+
+
+def ingredient_macros(ingredient: Ingredient, raw_unit_id: Any, quantity: Any) -> Dict[str, float]:
+    """Return the macros of ``quantity`` units of ``ingredient``.
+
+    Unknown units fall back to the base gram unit, matching the UI.
+    """
+
+    unit = resolve_unit(ingredient, raw_unit_id) or base_unit(ingredient)
+    grams = unit.grams * coerce_number(quantity)
+    nutrition = ingredient.nutrition
+    return {
+        field: coerce_number(getattr(nutrition, field, None)) * grams
+        for field in MACRO_FIELDS
+    }
+
+
+def food_macros(
+    food: Food, catalog: PlanCatalog, overrides: Optional[Dict[str, Any]] = None
+) -> Dict[str, float]:
+    """Return the macros of a single portion of ``food`` with plan overrides."""
+
+    totals = _zero()
+    overrides = overrides if isinstance(overrides, dict) else {}
+    for line in food.ingredients or []:
+        ingredient = catalog.ingredients.get(line.ingredient_id)
+        if ingredient is None:
+            continue
+        override = overrides.get(str(line.ingredient_id))
+        if not isinstance(override, dict):
+            override = {}
+        unit_id = override.get("unitId")
+        quantity = override.get("quantity")
+        _add(
+            totals,
+            ingredient_macros(
+                ingredient,
+                line.unit_id if unit_id is None else unit_id,
+                line.unit_quantity if quantity is None else quantity,
+            ),
+        )
+    return totals
+
+
+def _evaluate_item(
+    index: int, item: Dict[str, Any], catalog: PlanCatalog
+) -> PlanItemEvaluation:
+    kind = item.get("type")
+    if kind == "food":
+        ref_id = coerce_id(item.get("foodId"))
+        portions = coerce_number(item.get("portions"))
+        food = catalog.foods.get(ref_id) if ref_id is not None else None
+        name = food.name if food is not None else None
+        per_portion = (
+            food_macros(food, catalog, item.get("overrides")) if food is not None else _zero()
+        )
+    else:
+        ref_id = coerce_id(item.get("ingredientId"))
+        portions = coerce_number(item.get("portions", 1))
+        ingredient = catalog.ingredients.get(ref_id) if ref_id is not None else None
+        name = ingredient.name if ingredient is not None else None
+        per_portion = (
+            ingredient_macros(ingredient, item.get("unitId"), item.get("amount"))
+            if ingredient is not None
+            else _zero()
+        )
+
+    macros = _zero()
+    _add(macros, per_portion, portions)
+    return PlanItemEvaluation(
+        index=index,
+        type=kind,
+        ref_id=ref_id,
+        name=name,
+        portions=portions,
+        available=name is not None,
+        macros=PlanMacros(**macros),
+    )
+
+
+def _target_macros(payload: Dict[str, Any]) -> Dict[str, float]:
+    raw = payload.get("targetMacros")
+    raw = raw if isinstance(raw, dict) else {}
+    target = _zero()
+    for field in MACRO_FIELDS:
+        for key in _TARGET_ALIASES.get(field, (field,)):
+            if key in raw:
+                target[field] = coerce_number(raw[key])
+                break
+    return target
+
+
+def evaluate_plan(db: Session, payload: Optional[Dict[str, Any]]) -> PlanEvaluationRead:
+    """Compute per-item, total and per-day macros for a plan payload."""
+
+    payload = payload or {}
+    items = [
+        (index, item)
+        for index, item in indexed_plan_items(payload)
+        if item.get("type") in ("food", "ingredient")
+    ]
+    catalog = load_plan_catalog(db, (item for _, item in items))
+
+    evaluations: List[PlanItemEvaluation] = []
+    total = _zero()
+    for index, item in items:
+        evaluation = _evaluate_item(index, item, catalog)
+        evaluations.append(evaluation)
+        _add(total, evaluation.macros.model_dump())
+
+    days = int(coerce_number(payload.get("days")))
+    days = days if days > 0 else 1
+    per_day = {field: total[field] / days for field in MACRO_FIELDS}
+    target = _target_macros(payload)
+    deviation = {field: per_day[field] - target[field] for field in MACRO_FIELDS}
+
+    return PlanEvaluationRead(
+        days=days,
+        items=evaluations,
+        total=PlanMacros(**total),
+        per_day=PlanMacros(**per_day),
+        target=PlanMacros(**target),
+        deviation=PlanMacros(**deviation),
+    )
+
+
+__all__ = ["MACRO_FIELDS", "evaluate_plan", "food_macros", "ingredient_macros"]
@@ -0,0 +1,76 @@
+"""Normalized ``plan_items`` rows extracted from saved plan payloads.
+
+``Plan.payload`` is an opaque JSON document, so finding the plans that use a
+food or ingredient would otherwise mean parsing every plan. The plan routes
+call :func:`sync_plan_items` whenever a payload is written; the rows mirror
+:func:`plan_engine.indexed_plan_items`, with ``position`` being the item's index
+in the raw ``payload["plan"]`` list. Items whose reference is not a valid id are
+skipped.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from ..models import Plan, PlanItem
+from .plan_engine import coerce_id, indexed_plan_items
+
+_REFERENCE_KEYS = {"food": ("food_id", "foodId"), "ingredient": ("ingredient_id", "ingredientId")}
+
+
+def extract_plan_items(
+    plan_id: Optional[int], payload: Optional[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Return the ``plan_items`` rows describing ``payload``."""
+
+    rows = []
+    for position, item in indexed_plan_items(payload):
+        kind = item.get("type")
+        if kind not in _REFERENCE_KEYS:
+            continue
+        column, key = _REFERENCE_KEYS[kind]
+        ref_id = coerce_id(item.get(key))
+        if ref_id is None:
+            continue
+        rows.append(
+            {
+                "plan_id": plan_id,
+                "position": position,
+                "item_type": kind,
+                "food_id": None,
+                "ingredient_id": None,
+                column: ref_id,
+            }
+        )
+    return rows
+
+
+def sync_plan_items(
+    session: Session, plan_id: int, payload: Optional[Dict[str, Any]]
+) -> None:
+    """Replace the indexed items of ``plan_id``; ``payload=None`` just clears them."""
+
+    session.exec(delete(PlanItem).where(PlanItem.plan_id == plan_id))
+    rows = extract_plan_items(plan_id, payload)
+    if rows:
+        session.execute(insert(PlanItem), rows)
+
+
+def rebuild_plan_items(session: Session) -> int:
+    """Re-extract the items of every saved plan; returns the number of rows."""
+
+    session.exec(delete(PlanItem))
+    rows = [
+        row
+        for plan_id, payload in session.exec(select(Plan.id, Plan.payload)).all()
+        for row in extract_plan_items(plan_id, payload)
+    ]
+    if rows:
+        session.execute(insert(PlanItem), rows)
+    return len(rows)
+
+
+__all__ = ["extract_plan_items", "rebuild_plan_items", "sync_plan_items"]
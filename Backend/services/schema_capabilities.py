@@ -0,0 +1,181 @@
+"""Process-level registry of which tables and columns the database provides.
+
+Optional features (stored food, for example) must degrade gracefully when the
+database has not been migrated yet. Instead of inspecting the catalog on every
+request, the schema is inspected once per engine and the result is cached.
+Cached entries are dropped when tables are created or dropped through
+SQLAlchemy in this process, and revalidated at most every
+``settings.schema_recheck_seconds``: with an Alembic-managed database a single
+``alembic_version`` lookup decides whether the schema has to be inspected
+again, so migrations applied by another process are picked up without a
+restart.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Mapping, Optional, Union
+
+from sqlalchemy import Table, event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, SQLModel
+
+from .. import models  # noqa: F401  registers the tables on SQLModel.metadata
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_VERSION_TABLE = "alembic_version"
+
+
+@dataclass(frozen=True)
+class SchemaCapabilities:
+    """Snapshot of the application tables and columns present in a database."""
+
+    tables: FrozenSet[str] = frozenset()
+    columns: Mapping[str, FrozenSet[str]] = field(default_factory=dict)
+    revision: Optional[str] = None
+    checked_at: float = 0.0
+
+    def has_table(self, name: str) -> bool:
+        return name in self.tables
+
+    def has_columns(self, table: str, *columns: str) -> bool:
+        return set(columns) <= self.columns.get(table, frozenset())
+
+
+UNAVAILABLE = SchemaCapabilities()
+
+_lock = threading.Lock()
+_registry: "weakref.WeakKeyDictionary[Engine, SchemaCapabilities]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _engine_of(bind: Union[Engine, Connection, Session]) -> Engine:
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    return bind.engine
+
+
+def _read_revision(engine: Engine) -> Optional[str]:
+    with engine.connect() as connection:
+        return connection.execute(
+            text(f"SELECT version_num FROM {ALEMBIC_VERSION_TABLE}")
+        ).scalar()
+
+
+def _inspect(engine: Engine, clock: Callable[[], float]) -> SchemaCapabilities:
+    inspector = inspect(engine)
+    present = set(inspector.get_table_names())
+    columns = {
+        name: frozenset(column["name"] for column in inspector.get_columns(name))
+        for name in SQLModel.metadata.tables
+        if name in present
+    }
+    revision = _read_revision(engine) if ALEMBIC_VERSION_TABLE in present else None
+    return SchemaCapabilities(
+        tables=frozenset(columns),
+        columns=columns,
+        revision=revision,
+        checked_at=clock(),
+    )
+
+
+def _revalidated(
+    engine: Engine, cached: SchemaCapabilities, clock: Callable[[], float]
+) -> Optional[SchemaCapabilities]:
+    """Return ``cached`` (re-stamped if it was rechecked) or ``None`` if it is stale."""
+
+    interval = settings.schema_recheck_seconds
+    if interval <= 0 or clock() - cached.checked_at < interval:
+        return cached
+    if cached.revision is None:
+        # Not Alembic-managed (or not migrated yet): inspect again.
+        return None
+    try:
+        revision = _read_revision(engine)
+    except SQLAlchemyError:
+        return None
+    if revision != cached.revision:
+        logger.info(
+            "Schema revision changed from %s to %s; refreshing capabilities.",
+            cached.revision,
+            revision,
+        )
+        return None
+    refreshed = SchemaCapabilities(
+        tables=cached.tables,
+        columns=cached.columns,
+        revision=revision,
+        checked_at=clock(),
+    )
+    _registry[engine] = refreshed
+    return refreshed
+
+
+def get_schema_capabilities(
+    bind: Union[Engine, Connection, Session],
+    *,
+    clock: Callable[[], float] = time.monotonic,
+) -> SchemaCapabilities:
+    """Return the cached capabilities of ``bind``'s database, inspecting it if needed.
+
+    When the database cannot be inspected an empty snapshot is returned (and not
+    cached), so optional features report themselves as unavailable.
+    """
+
+    try:
+        engine = _engine_of(bind)
+    except SQLAlchemyError:
+        return UNAVAILABLE
+
+    cached = _registry.get(engine)
+    if cached is not None:
+        current = _revalidated(engine, cached, clock)
+        if current is not None:
+            return current
+
+    with _lock:
+        cached = _registry.get(engine)
+        if cached is not None:
+            current = _revalidated(engine, cached, clock)
+            if current is not None:
+                return current
+        try:
+            capabilities = _inspect(engine, clock)
+        except SQLAlchemyError:
+            logger.warning("Could not inspect the database schema.", exc_info=True)
+            return UNAVAILABLE
+        _registry[engine] = capabilities
+        return capabilities
+
+
+def invalidate_schema_capabilities(
+    bind: Union[Engine, Connection, Session, None] = None,
+) -> None:
+    """Forget cached capabilities for ``bind``, or for every engine when omitted."""
+
+    with _lock:
+        if bind is None:
+            _registry.clear()
+        else:
+            _registry.pop(_engine_of(bind), None)
+
+
+@event.listens_for(Table, "after_create")
+@event.listens_for(Table, "after_drop")
+def _forget_after_ddl(target, connection, **kw) -> None:
+    invalidate_schema_capabilities(connection)
+
+
+__all__ = [
+    "SchemaCapabilities",
+    "get_schema_capabilities",
+    "invalidate_schema_capabilities",
+]
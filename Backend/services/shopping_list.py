@@ -0,0 +1,250 @@
+"""Shopping list aggregation for plan payloads.
+
+This is the server-side counterpart of ``Frontend/src/utils/shopping.ts``: it
+sums the grams each plan line requires per ingredient, keeps per-unit totals
+and converts the grand total into the ingredient's preferred shopping unit.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Session
+
+from ..models import Ingredient
+from ..models.schemas import (
+    ShoppingListIssue,
+    ShoppingListItem,
+    ShoppingListRead,
+    ShoppingListUnitTotal,
+)
+from .plan_engine import (
+    PlanCatalog,
+    ResolvedUnit,
+    coerce_id,
+    coerce_number,
+    load_plan_catalog,
+    plan_items,
+    preferred_shopping_unit,
+    resolve_unit,
+)
+
+
+@dataclass
+class _Accumulator:
+    ingredient: Ingredient
+    total_grams: float = 0.0
+    units: Dict[Optional[int], ShoppingListUnitTotal] = field(default_factory=dict)
+
+
+def _format_ref(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+class _ShoppingListBuilder:
+    def __init__(self, catalog: PlanCatalog) -> None:
+        self.catalog = catalog
+        self.totals: Dict[int, _Accumulator] = {}
+        self.issues: List[ShoppingListIssue] = []
+
+    def issue(self, kind: str, message: str) -> None:
+        self.issues.append(ShoppingListIssue(type=kind, message=message))
+
+    def add(self, ingredient: Ingredient, unit: ResolvedUnit, quantity: float) -> None:
+        if quantity <= 0 or unit.grams <= 0:
+            return
+        grams = unit.grams * quantity
+
+        accumulator = self.totals.get(ingredient.id)
+        if accumulator is None:
+            accumulator = _Accumulator(ingredient=ingredient)
+            self.totals[ingredient.id] = accumulator
+        accumulator.total_grams += grams
+
+        existing = accumulator.units.get(unit.id)
+        if existing is not None:
+            existing.quantity += quantity
+        else:
+            accumulator.units[unit.id] = ShoppingListUnitTotal(
+                unit_id=unit.id,
+                unit_name=unit.name or "",
+                quantity=quantity,
+                grams_per_unit=unit.grams,
+            )
+
+    def add_ingredient_item(self, item: Dict[str, Any], index: int) -> None:
+        raw_id = item.get("ingredientId")
+        ingredient_id = coerce_id(raw_id)
+        ingredient = (
+            self.catalog.ingredients.get(ingredient_id) if ingredient_id is not None else None
+        )
+        if ingredient is None:
+            self.issue(
+                "missing-ingredient",
+                f"Ingredient {_format_ref(raw_id)} could not be found for plan row {index + 1}.",
+            )
+            return
+
+        unit = resolve_unit(ingredient, item.get("unitId"))
+        if unit is None:
+            self.issue(
+                "missing-unit",
+                f'Ingredient "{ingredient.name}" is missing unit '
+                f"{_format_ref(item.get('unitId'))} required by the plan.",
+            )
+            return
+        if unit.grams <= 0:
+            self.issue(
+                "missing-grams",
+                f'Ingredient "{ingredient.name}" unit "{unit.name}" has no gram conversion.',
+            )
+            return
+
+        amount = coerce_number(item.get("amount"))
+        if amount <= 0:
+            self.issue(
+                "missing-quantity",
+                f'Ingredient "{ingredient.name}" has no valid quantity in the plan.',
+            )
+            return
+
+        portions = coerce_number(item.get("portions", 1))
+        if portions <= 0:
+            self.issue(
+                "missing-quantity",
+                f'Ingredient "{ingredient.name}" has no valid portion count in the plan.',
+            )
+            return
+
+        self.add(ingredient, unit, amount * portions)
+
+    def add_food_item(self, item: Dict[str, Any]) -> None:
+        raw_id = item.get("foodId")
+        food_id = coerce_id(raw_id)
+        food = self.catalog.foods.get(food_id) if food_id is not None else None
+        if food is None:
+            self.issue(
+                "missing-food",
+                f"Food {_format_ref(raw_id)} referenced by the plan is unavailable.",
+            )
+            return
+
+        portions = coerce_number(item.get("portions"))
+        if portions <= 0:
+            self.issue(
+                "missing-quantity",
+                f'Food "{food.name}" has no valid portion quantity in the plan.',
+            )
+            return
+
+        lines = list(food.ingredients or [])
+        if not lines:
+            self.issue(
+                "missing-ingredient",
+                f'Food "{food.name}" has no ingredient details and was skipped.',
+            )
+            return
+
+        overrides = item.get("overrides")
+        if not isinstance(overrides, dict):
+            overrides = {}
+
+        for line in lines:
+            ingredient = self.catalog.ingredients.get(line.ingredient_id)
+            if ingredient is None:
+                self.issue(
+                    "missing-ingredient",
+                    f"Ingredient {_format_ref(line.ingredient_id)} from food "
+                    f'"{food.name}" is unavailable.',
+                )
+                continue
+
+            override = overrides.get(str(line.ingredient_id))
+            if not isinstance(override, dict):
+                override = {}
+            raw_unit_id = override.get("unitId")
+            if raw_unit_id is None:
+                raw_unit_id = line.unit_id
+
+            unit = resolve_unit(ingredient, raw_unit_id)
+            if unit is None:
+                self.issue(
+                    "missing-unit",
+                    f'Ingredient "{ingredient.name}" in food "{food.name}" is missing unit '
+                    f"{_format_ref(raw_unit_id)}.",
+                )
+                continue
+            if unit.grams <= 0:
+                self.issue(
+                    "missing-grams",
+                    f'Ingredient "{ingredient.name}" unit "{unit.name}" in food '
+                    f'"{food.name}" has no gram conversion.',
+                )
+                continue
+
+            raw_quantity = override.get("quantity")
+            if raw_quantity is None:
+                raw_quantity = line.unit_quantity
+            per_portion = coerce_number(raw_quantity)
+            if per_portion <= 0:
+                self.issue(
+                    "missing-quantity",
+                    f'Ingredient "{ingredient.name}" in food "{food.name}" has no valid quantity.',
+                )
+                continue
+
+            self.add(ingredient, unit, per_portion * portions)
+
+    def build(self) -> ShoppingListRead:
+        items: List[ShoppingListItem] = []
+        for accumulator in self.totals.values():
+            ingredient = accumulator.ingredient
+            preferred_total = None
+            preferred = preferred_shopping_unit(ingredient)
+            if preferred is not None and preferred.grams > 0:
+                quantity = accumulator.total_grams / preferred.grams
+                if quantity > 0:
+                    preferred_total = ShoppingListUnitTotal(
+                        unit_id=preferred.id,
+                        unit_name=preferred.name or "",
+                        quantity=quantity,
+                        grams_per_unit=preferred.grams,
+                    )
+
+            unit_totals = sorted(
+                (
+                    total
+                    for total in accumulator.units.values()
+                    if total.quantity > 0 and total.grams_per_unit > 0
+                ),
+                key=lambda total: (total.grams_per_unit, total.unit_name.casefold()),
+            )
+            items.append(
+                ShoppingListItem(
+                    ingredient_id=ingredient.id,
+                    name=ingredient.name or "Unnamed ingredient",
+                    total_grams=accumulator.total_grams,
+                    unit_totals=unit_totals,
+                    preferred_unit_total=preferred_total,
+                )
+            )
+
+        items.sort(key=lambda entry: entry.name.casefold())
+        return ShoppingListRead(items=items, issues=self.issues)
+
+
+def build_shopping_list(db: Session, payload: Optional[Dict[str, Any]]) -> ShoppingListRead:
+    """Aggregate the shopping list for a plan payload."""
+
+    items = plan_items(payload)
+    builder = _ShoppingListBuilder(load_plan_catalog(db, items))
+    for index, item in enumerate(items):
+        if item.get("type") == "ingredient":
+            builder.add_ingredient_item(item, index)
+        elif item.get("type") == "food":
+            builder.add_food_item(item)
+    return builder.build()
+
+
+__all__ = ["build_shopping_list"]
@@ -0,0 +1,200 @@
+"""Response cache for the USDA FoodData Central proxy.
+
+Trimmed search results and food details are kept in a per-process LRU with a
+fixed time-to-live. When a ``session_factory`` is supplied the cache also
+reads and writes the ``usda_cache_entries`` table so every API worker shares
+the entries another worker already fetched; the in-memory LRU then acts as a
+first-level cache in front of the table.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+from ..models import UsdaCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UsdaCacheStats:
+    """Hit/miss counters of a :class:`UsdaResponseCache` since startup."""
+
+    backend: str
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+
+
+def search_cache_key(query: str, data_types: Iterable[str]) -> str:
+    """Return the cache key of a search; queries differing only in case share it."""
+
+    normalized_query = " ".join(query.lower().split())
+    return "search:" + json.dumps([normalized_query, sorted(set(data_types))])
+
+
+def food_cache_key(fdc_id: int) -> str:
+    """Return the cache key of a single food detail lookup."""
+
+    return f"food:{fdc_id}"
+
+
+class UsdaResponseCache:
+    """Size-bounded TTL cache with an optional database-backed shared tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        session_factory: Optional[Callable[[], Session]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._session_factory = session_factory
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and (
+            self.max_entries > 0 or self._session_factory is not None
+        )
+
+    def stats(self) -> UsdaCacheStats:
+        return UsdaCacheStats(
+            backend="database" if self._session_factory is not None else "memory",
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_seconds=self.ttl_seconds,
+            hits=self._hits,
+            shared_hits=self._shared_hits,
+            misses=self._misses,
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` when absent/expired."""
+
+        if not self.enabled:
+            return None
+
+        value = self._get_local(key)
+        if value is not None:
+            self._hits += 1
+            return value
+
+        if self._session_factory is not None:
+            shared = await run_in_threadpool(self._get_shared, key)
+            if shared is not None:
+                value, expires_at = shared
+                self._set_local(key, value, expires_at)
+                self._hits += 1
+                self._shared_hits += 1
+                return value
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store ``value`` (a JSON-serializable trimmed payload) under ``key``."""
+
+        if not self.enabled:
+            return
+
+        expires_at = self._clock() + self.ttl_seconds
+        self._set_local(key, value, expires_at)
+        if self._session_factory is not None:
+            await run_in_threadpool(self._set_shared, key, value, expires_at)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, key: str) -> Optional[tuple[Any, float]]:
+        now = self._as_datetime(self._clock())
+        try:
+            with self._session_factory() as session:
+                entry = session.exec(
+                    select(UsdaCacheEntry).where(
+                        UsdaCacheEntry.key == key, UsdaCacheEntry.expires_at > now
+                    )
+                ).first()
+                if entry is None:
+                    return None
+                expires_at = entry.expires_at
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                return entry.payload, expires_at.timestamp()
+        except SQLAlchemyError as exc:
+            logger.warning("USDA cache lookup failed: %s", exc)
+            return None
+
+    def _set_shared(self, key: str, value: Any, expires_at: float) -> None:
+        now = self._as_datetime(self._clock())
+        try:
+            with self._session_factory() as session:
+                # Expired rows are only ever skipped by reads, so writers prune
+                # them to keep the shared table bounded.
+                session.execute(
+                    delete(UsdaCacheEntry).where(UsdaCacheEntry.expires_at <= now)
+                )
+                session.merge(
+                    UsdaCacheEntry(
+                        key=key,
+                        payload=value,
+                        expires_at=self._as_datetime(expires_at),
+                    )
+                )
+                session.commit()
+        except SQLAlchemyError as exc:
+            # Another worker may have stored the same key concurrently; the
+            # local tier already holds the value so the write can be dropped.
+            logger.warning("USDA cache write failed: %s", exc)
+
+    @staticmethod
+    def _as_datetime(timestamp: float) -> datetime:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+__all__ = [
+    "UsdaCacheStats",
+    "UsdaResponseCache",
+    "food_cache_key",
+    "search_cache_key",
+]
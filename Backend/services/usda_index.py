@@ -0,0 +1,238 @@
+"""Local index of USDA FoodData Central foods.
+
+``Database/import_usda_fdc.py`` loads the FDC bulk downloads into
+``usda_foods``, storing each food already trimmed to the API's
+``UsdaFoodSummary`` shape, and indexes every description word in
+``usda_food_terms``. Searches then resolve each query word as a prefix of an
+indexed word (so ``"chick bre"`` finds "Chicken, breast") using only B-tree
+index scans, which makes the API independent of api.nal.usda.gov when
+``USDA_LOCAL_INDEX`` is enabled.
+
+Ranking never sorts the whole match set. A query with a rare word sorts only
+that word's postings (at most ``_CANDIDATE_LIMIT``). When every word is
+common, the best-ranked matches are read in rank order from
+``ix_usda_food_terms_prefix_rank`` and the scan stops after ``limit``
+matches (or ``_RANK_SCAN_LIMIT`` postings); descriptions that start with the
+query are taken from the first ``_CANDIDATE_LIMIT`` of a ``search_name``
+range scan. A common one-character word only matches whole words. Searches
+over 200k Branded foods stay in the low milliseconds
+(``python -m Backend.benchmarks.bench_usda_search``).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, case, delete, exists, func, insert, union_all
+from sqlmodel import Session, select
+
+from ..models import UsdaFood, UsdaFoodTerm
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+_MAX_TERM_LENGTH = 64
+_MAX_QUERY_TERMS = 8
+_PREFIX_LENGTH = 2
+_CANDIDATE_LIMIT = 2000
+_RANK_SCAN_LIMIT = 20000
+
+
+def normalize_search_name(description: str) -> str:
+    """Return the lower-cased, whitespace-collapsed form used for ranking."""
+
+    return " ".join(description.lower().split())
+
+
+def search_terms(text: str) -> List[str]:
+    """Split ``text`` into the distinct lower-case words stored in the index."""
+
+    terms = dict.fromkeys(
+        term[:_MAX_TERM_LENGTH] for term in _TERM_PATTERN.findall(text.lower())
+    )
+    return list(terms)
+
+
+def replace_usda_foods(session: Session, foods: Sequence[Dict[str, Any]]) -> int:
+    """Insert or replace trimmed ``foods`` and their index terms.
+
+    Rows for the given ids are deleted and re-inserted with executemany
+    batches, so re-running an import over a newer release is idempotent. The
+    caller owns the transaction.
+    """
+
+    rows = []
+    terms = []
+    for food in foods:
+        fdc_id = food.get("id")
+        description = (food.get("name") or "").strip()
+        if fdc_id is None or not description:
+            continue
+        normalization = food.get("normalization") or {}
+        search_name = normalize_search_name(description)[:512]
+        rows.append(
+            {
+                "fdc_id": fdc_id,
+                "description": description[:512],
+                "search_name": search_name,
+                "data_type": normalization.get("data_type"),
+                "summary": food,
+            }
+        )
+        terms.extend(
+            {
+                "term": term,
+                "prefix": term[:_PREFIX_LENGTH],
+                "name_length": len(search_name),
+                "fdc_id": fdc_id,
+            }
+            for term in search_terms(description)
+        )
+
+    if not rows:
+        return 0
+
+    fdc_ids = [row["fdc_id"] for row in rows]
+    session.execute(delete(UsdaFoodTerm).where(UsdaFoodTerm.fdc_id.in_(fdc_ids)))
+    session.execute(delete(UsdaFood).where(UsdaFood.fdc_id.in_(fdc_ids)))
+    session.execute(insert(UsdaFood), rows)
+    if terms:
+        session.execute(insert(UsdaFoodTerm), terms)
+    return len(rows)
+
+
+def _prefix_match(session: Session, column, prefix: str):
+    if session.get_bind().dialect.name == "postgresql":
+        # Served by the text_pattern_ops indexes regardless of the collation.
+        return column.like(f"{prefix}%")
+    # Bumping the last character gives an exclusive upper bound for a plain
+    # B-tree range scan under SQLite's binary collation.
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+def _capped_match_counts(session: Session, terms: Sequence[str]) -> List[int]:
+    """Count postings matching each term, stopping at ``_CANDIDATE_LIMIT + 1``."""
+
+    counts = []
+    for term in terms:
+        capped = (
+            select(UsdaFoodTerm.fdc_id)
+            .where(_prefix_match(session, UsdaFoodTerm.term, term))
+            .limit(_CANDIDATE_LIMIT + 1)
+            .subquery()
+        )
+        counts.append(select(func.count()).select_from(capped).scalar_subquery())
+    return list(session.execute(select(*counts)).one())
+
+
+def _has_term(session: Session, fdc_id, term: str):
+    return exists().where(
+        UsdaFoodTerm.fdc_id == fdc_id,
+        _prefix_match(session, UsdaFoodTerm.term, term),
+    )
+
+
+def _ranked_matches(
+    session: Session,
+    terms: Sequence[str],
+    data_types: Optional[List[str]],
+    limit: int,
+):
+    """Ids of the first ``limit`` matches in rank order, driven by the longest term."""
+
+    driver = max(terms, key=len)
+    postings = (
+        select(UsdaFoodTerm.fdc_id, UsdaFoodTerm.term)
+        .where(UsdaFoodTerm.prefix == driver[:_PREFIX_LENGTH])
+        .order_by(UsdaFoodTerm.name_length, UsdaFoodTerm.fdc_id)
+        .limit(_RANK_SCAN_LIMIT)
+        .subquery()
+    )
+    if len(driver) < _PREFIX_LENGTH:
+        # Only one-character words share a one-character prefix.
+        matches_driver = postings.c.term == driver
+    else:
+        matches_driver = _prefix_match(session, postings.c.term, driver)
+    # No ORDER BY here: the postings stream out in rank order, so the scan
+    # stops at the first ``limit`` matches; the caller sorts the candidates.
+    statement = select(postings.c.fdc_id).where(matches_driver)
+    for term in terms:
+        if term != driver:
+            statement = statement.where(_has_term(session, postings.c.fdc_id, term))
+    if data_types:
+        statement = statement.where(
+            exists().where(
+                UsdaFood.fdc_id == postings.c.fdc_id, UsdaFood.data_type.in_(data_types)
+            )
+        )
+    return statement.limit(limit)
+
+
+def search_local_foods(
+    session: Session,
+    query: str,
+    data_types: Optional[Iterable[str]] = None,
+    *,
+    limit: int = 25,
+) -> List[Dict[str, Any]]:
+    """Return trimmed foods whose description words start with every query word.
+
+    Foods whose whole description starts with the query rank first, then
+    shorter (more generic) descriptions.
+    """
+
+    terms = search_terms(query)[:_MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    data_types = list(data_types) if data_types else None
+    normalized_query = normalize_search_name(query)
+
+    counts = _capped_match_counts(session, terms)
+    rarest = min(range(len(terms)), key=counts.__getitem__)
+    if counts[rarest] <= _CANDIDATE_LIMIT:
+        candidates = select(UsdaFoodTerm.fdc_id).where(
+            _prefix_match(session, UsdaFoodTerm.term, terms[rarest])
+        )
+    else:
+        leading = (
+            select(UsdaFood.fdc_id)
+            .where(_prefix_match(session, UsdaFood.search_name, normalized_query))
+            .limit(_CANDIDATE_LIMIT)
+            .subquery()
+        )
+        ranked = _ranked_matches(session, terms, data_types, limit).subquery()
+        candidates = union_all(select(leading.c.fdc_id), select(ranked.c.fdc_id))
+
+    statement = select(UsdaFood.summary).where(UsdaFood.fdc_id.in_(candidates))
+    for term in terms:
+        statement = statement.where(_has_term(session, UsdaFood.fdc_id, term))
+    if data_types:
+        statement = statement.where(UsdaFood.data_type.in_(data_types))
+
+    statement = statement.order_by(
+        case((UsdaFood.search_name.startswith(normalized_query, autoescape=True), 0), else_=1),
+        func.length(UsdaFood.search_name),
+        UsdaFood.fdc_id,
+    ).limit(limit)
+    return list(session.exec(statement).all())
+
+
+def get_local_foods(session: Session, fdc_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Return trimmed foods for ``fdc_ids`` keyed by id; unknown ids are omitted."""
+
+    ids = list(dict.fromkeys(fdc_ids))
+    if not ids:
+        return {}
+    rows = session.exec(
+        select(UsdaFood.fdc_id, UsdaFood.summary).where(UsdaFood.fdc_id.in_(ids))
+    ).all()
+    return {fdc_id: summary for fdc_id, summary in rows}
+
+
+__all__ = [
+    "get_local_foods",
+    "normalize_search_name",
+    "replace_usda_foods",
+    "search_local_foods",
+    "search_terms",
+]
@@ -33,6 +33,26 @@ def _to_bool(value: str | None, default: bool = False) -> bool:
     return value.strip().lower() in {"1", "true", "t", "yes", "y"}
 
 
+def _to_int(value: str | None, default: int) -> int:
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        warnings.warn(f"Ignoring invalid integer setting {value!r}.", RuntimeWarning)
+        return default
+
+
+def _to_float(value: str | None, default: float) -> float:
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        warnings.warn(f"Ignoring invalid numeric setting {value!r}.", RuntimeWarning)
+        return default
+
+
 def _load_dotenv(*, environment: str) -> None:
     if _is_production_environment(environment):
         return
@@ -82,6 +102,40 @@ class Settings:
     # Runtime environment name (e.g. development/test/production).
     environment: str
 
+    # Shared USDA HTTP client: timeout (seconds), connection pool limits,
+    # keep-alive expiry (seconds) and HTTP/2 negotiation.
+    usda_http_timeout: float = 10.0
+    usda_http_max_connections: int = 20
+    usda_http_max_keepalive_connections: int = 10
+    usda_http_keepalive_expiry: float = 30.0
+    usda_http2: bool = True
+
+    # Upper bound on concurrent upstream USDA calls per worker; identical
+    # concurrent lookups are coalesced into one call before this applies.
+    usda_max_concurrent_requests: int = 8
+
+    # USDA response cache: entry lifetime (seconds, 0 disables caching),
+    # per-worker LRU size and whether workers share entries through the
+    # ``usda_cache_entries`` table.
+    usda_cache_ttl_seconds: float = 86400.0
+    usda_cache_max_entries: int = 1024
+    usda_cache_shared: bool = False
+
+    # Serve USDA search/detail endpoints from the local FDC index loaded by
+    # Database/import_usda_fdc.py instead of calling api.nal.usda.gov.
+    usda_local_index: bool = False
+
+    # How often (seconds) cached schema capabilities are revalidated against
+    # the Alembic revision, so migrations applied by another process are
+    # noticed without a restart. 0 keeps them until this process runs DDL.
+    schema_recheck_seconds: float = 60.0
+
+    # Lifetime (seconds) of the per-worker ingredient -> base unit id cache
+    # used when foods reference the synthetic "1 g" unit. Changes made in this
+    # process invalidate entries immediately; the lifetime bounds how long
+    # edits from other processes can go unseen. 0 disables the cache.
+    base_unit_cache_seconds: float = 300.0
+
     @staticmethod
     def _is_production(environment: str) -> bool:
         return _is_production_environment(environment)
@@ -157,6 +211,30 @@ class Settings:
             allow_origins=origins,
             usda_api_key=usda_api_key,
             environment=environment,
+            usda_http_timeout=_to_float(os.getenv("USDA_HTTP_TIMEOUT"), 10.0),
+            usda_http_max_connections=_to_int(os.getenv("USDA_HTTP_MAX_CONNECTIONS"), 20),
+            usda_http_max_keepalive_connections=_to_int(
+                os.getenv("USDA_HTTP_MAX_KEEPALIVE_CONNECTIONS"), 10
+            ),
+            usda_http_keepalive_expiry=_to_float(
+                os.getenv("USDA_HTTP_KEEPALIVE_EXPIRY"), 30.0
+            ),
+            usda_http2=_to_bool(os.getenv("USDA_HTTP2"), default=True),
+            usda_max_concurrent_requests=_to_int(
+                os.getenv("USDA_MAX_CONCURRENT_REQUESTS"), 8
+            ),
+            usda_cache_ttl_seconds=_to_float(
+                os.getenv("USDA_CACHE_TTL_SECONDS"), 86400.0
+            ),
+            usda_cache_max_entries=_to_int(os.getenv("USDA_CACHE_MAX_ENTRIES"), 1024),
+            usda_cache_shared=_to_bool(os.getenv("USDA_CACHE_SHARED"), default=False),
+            usda_local_index=_to_bool(os.getenv("USDA_LOCAL_INDEX"), default=False),
+            schema_recheck_seconds=_to_float(
+                os.getenv("SCHEMA_RECHECK_SECONDS"), 60.0
+            ),
+            base_unit_cache_seconds=_to_float(
+                os.getenv("BASE_UNIT_CACHE_SECONDS"), 300.0
+            ),
         )
 
 
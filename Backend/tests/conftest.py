@@ -1,10 +1,12 @@
 import os
 import sys
-from typing import Iterator
+from contextlib import contextmanager
+from typing import Iterator, List
 
 import pytest
 import python_multipart
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
@@ -47,3 +49,23 @@ def client_fixture(engine) -> Iterator[TestClient]:
     with TestClient(app) as client:
         yield client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="count_queries")
+def count_queries_fixture(engine):
+    """Return a context manager collecting the SQL statements run on ``engine``."""
+
+    @contextmanager
+    def _count() -> Iterator[List[str]]:
+        statements: List[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    return _count
@@ -0,0 +1,304 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from Backend.models import Food, FoodIngredient, Ingredient, IngredientUnit, PossibleFoodTag
+from Backend.services.base_units import pick_base_unit_id
+from Backend.services.plan_engine import base_unit
+
+# One SELECT for the foods plus one per eager-loaded collection.
+MAX_FOOD_READ_QUERIES = 3
+
+
+def _seed_foods(engine, count: int) -> list[int]:
+    with Session(engine) as session:
+        tag = PossibleFoodTag(name="Dinner")
+        ingredients = [
+            Ingredient(name=f"Ingredient {index}", units=[IngredientUnit(name="g", grams=1)])
+            for index in range(3)
+        ]
+        session.add(tag)
+        session.add_all(ingredients)
+        session.commit()
+
+        foods = []
+        for index in range(count):
+            food = Food(
+                name=f"Food {index}",
+                ingredients=[
+                    FoodIngredient(
+                        ingredient_id=ingredient.id,
+                        unit_id=ingredient.units[0].id,
+                        unit_quantity=10 + index,
+                    )
+                    for ingredient in ingredients
+                ],
+                tags=[tag],
+            )
+            session.add(food)
+            foods.append(food)
+        session.commit()
+        return [food.id for food in foods]
+
+
+def test_list_foods_query_count_is_bounded(
+    client: TestClient, engine, count_queries
+) -> None:
+    _seed_foods(engine, 25)
+
+    with count_queries() as statements:
+        response = client.get("/api/foods/")
+
+    assert response.status_code == 200
+    foods = response.json()
+    assert len(foods) == 25
+    assert all(len(food["ingredients"]) == 3 for food in foods)
+    assert all(food["tags"][0]["name"] == "Dinner" for food in foods)
+    assert len(statements) <= MAX_FOOD_READ_QUERIES
+
+
+def test_get_food_query_count_is_bounded(client: TestClient, engine, count_queries) -> None:
+    food_ids = _seed_foods(engine, 2)
+
+    with count_queries() as statements:
+        response = client.get(f"/api/foods/{food_ids[0]}")
+
+    assert response.status_code == 200
+    assert len(response.json()["ingredients"]) == 3
+    assert len(statements) <= MAX_FOOD_READ_QUERIES
+
+
+def _create_ingredient(client: TestClient, name: str, calories: float, protein: float) -> dict:
+    response = client.post(
+        "/api/ingredients/",
+        json={
+            "name": name,
+            "nutrition": {
+                "calories": calories,
+                "protein": protein,
+                "carbohydrates": 0,
+                "fat": 0,
+                "fiber": 0,
+            },
+            "units": [{"name": "cup", "grams": 100}],
+            "tags": [],
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _create_food(client: TestClient, name: str, ingredient: dict, quantity: float) -> dict:
+    unit = next(u for u in ingredient["units"] if u["name"] == "cup")
+    response = client.post(
+        "/api/foods/",
+        json={
+            "name": name,
+            "ingredients": [
+                {
+                    "ingredient_id": ingredient["id"],
+                    "unit_id": unit["id"],
+                    "unit_quantity": quantity,
+                }
+            ],
+            "tags": [],
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_food_nutrition_totals_follow_writes(client: TestClient) -> None:
+    ingredient = _create_ingredient(client, "Totals oats", calories=4, protein=0.1)
+    food = _create_food(client, "Totals porridge", ingredient, quantity=2)
+    totals = food["nutrition_total"]
+    assert totals["grams"] == 200
+    assert totals["calories"] == 800
+    assert totals["protein"] == 20
+
+    response = client.put(
+        f"/api/foods/{food['id']}",
+        json={
+            "name": "Totals porridge",
+            "ingredients": [
+                {
+                    "ingredient_id": ingredient["id"],
+                    "unit_id": food["ingredients"][0]["unit_id"],
+                    "unit_quantity": 1,
+                }
+            ],
+            "tags": [],
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["nutrition_total"]["calories"] == 400
+
+    # Changing the ingredient's nutrition or unit grams updates foods using it.
+    update = {key: ingredient[key] for key in ("name", "tags")}
+    update["nutrition"] = {**ingredient["nutrition"], "calories": 3}
+    update["units"] = [
+        {**unit, "grams": 50} if unit["name"] == "cup" else unit
+        for unit in ingredient["units"]
+    ]
+    response = client.put(f"/api/ingredients/{ingredient['id']}", json=update)
+    assert response.status_code == 200, response.text
+    totals = client.get(f"/api/foods/{food['id']}").json()["nutrition_total"]
+    assert totals["grams"] == 50
+    assert totals["calories"] == 150
+
+
+def test_list_foods_filters_and_sorts_by_macros(client: TestClient) -> None:
+    lean = _create_ingredient(client, "Macro chicken", calories=1.5, protein=0.3)
+    rich = _create_ingredient(client, "Macro butter", calories=7, protein=0.01)
+    _create_food(client, "Macro bowl", lean, quantity=1.5)  # 225 kcal, 45 g protein
+    _create_food(client, "Macro plate", lean, quantity=2.5)  # 375 kcal, 75 g protein
+    _create_food(client, "Macro big plate", lean, quantity=3)  # 450 kcal, 90 g protein
+    _create_food(client, "Macro toast", rich, quantity=0.5)  # 350 kcal, 0.5 g protein
+
+    response = client.get(
+        "/api/foods/",
+        params={"max_calories": 400, "min_protein": 30, "sort": "protein", "descending": True},
+    )
+    assert response.status_code == 200
+    assert [food["name"] for food in response.json()] == ["Macro plate", "Macro bowl"]
+
+    response = client.get("/api/foods/", params={"sort": "calories"})
+    names = [food["name"] for food in response.json() if food["name"].startswith("Macro")]
+    assert names == ["Macro bowl", "Macro toast", "Macro plate", "Macro big plate"]
+
+
+def _writes_to(table: str, statements: list[str]) -> list[str]:
+    targets = (f"INSERT INTO {table} ", f"UPDATE {table} ", f"DELETE FROM {table} ")
+    return [sql.split()[0] for sql in statements if sql.lstrip().startswith(targets)]
+
+
+def test_update_food_writes_only_changed_lines(
+    client: TestClient, engine, count_queries
+) -> None:
+    food_id = _seed_foods(engine, 1)[0]
+    food = client.get(f"/api/foods/{food_id}").json()
+    lines = [
+        {key: line[key] for key in ("ingredient_id", "unit_id", "unit_quantity")}
+        for line in food["ingredients"]
+    ]
+    body = {"name": food["name"], "ingredients": lines, "tags": food["tags"]}
+
+    with count_queries() as statements:
+        response = client.put(f"/api/foods/{food_id}", json=body)
+    assert response.status_code == 200
+    assert _writes_to("food_ingredients", statements) == []
+    assert _writes_to("food_nutrition_totals", statements) == []
+
+    lines[1] = {**lines[1], "unit_quantity": 42}
+    with count_queries() as statements:
+        response = client.put(f"/api/foods/{food_id}", json={**body, "ingredients": lines})
+    assert response.status_code == 200
+    assert _writes_to("food_ingredients", statements) == ["UPDATE"]
+    quantities = {
+        line["ingredient_id"]: line["unit_quantity"] for line in response.json()["ingredients"]
+    }
+    assert quantities[lines[1]["ingredient_id"]] == 42
+
+    response = client.put(
+        f"/api/foods/{food_id}", json={**body, "ingredients": [lines[0], lines[0]]}
+    )
+    assert response.status_code == 422
+
+
+def test_patch_food_changes_only_given_lines(client: TestClient, engine, count_queries) -> None:
+    food_id = _seed_foods(engine, 1)[0]
+    food = client.get(f"/api/foods/{food_id}").json()
+    first, second, third = (line["ingredient_id"] for line in food["ingredients"])
+    extra = client.post(
+        "/api/ingredients/", json={"name": "Patch extra", "units": [], "tags": []}
+    ).json()
+
+    with count_queries() as statements:
+        response = client.patch(
+            f"/api/foods/{food_id}",
+            json={
+                "ingredients": [{"ingredient_id": extra["id"], "unit_id": 0, "unit_quantity": 5}],
+                "remove_ingredient_ids": [second],
+            },
+        )
+    assert response.status_code == 200
+    assert sorted(_writes_to("food_ingredients", statements)) == ["DELETE", "INSERT"]
+    patched = response.json()
+    assert patched["name"] == food["name"]
+    assert patched["tags"] == food["tags"]
+    assert {line["ingredient_id"] for line in patched["ingredients"]} == {
+        first,
+        third,
+        extra["id"],
+    }
+    assert patched["nutrition_total"]["grams"] > 0
+
+    response = client.patch(
+        f"/api/foods/{food_id}",
+        json={
+            "ingredients": [{"ingredient_id": first, "unit_quantity": 1}],
+            "remove_ingredient_ids": [first],
+        },
+    )
+    assert response.status_code == 422
+    assert client.patch("/api/foods/999999", json={"name": "x"}).status_code == 404
+
+
+def test_add_food_resolves_synthetic_units_in_one_query(
+    client: TestClient, engine, count_queries
+) -> None:
+    with Session(engine) as session:
+        ingredients = [
+            Ingredient(
+                name=f"Synthetic {index}",
+                units=[IngredientUnit(name="cup", grams=240), IngredientUnit(name="g", grams=1)],
+            )
+            for index in range(30)
+        ]
+        session.add_all(ingredients)
+        session.commit()
+        expected = {ingredient.id: ingredient.units[1].id for ingredient in ingredients}
+
+    def create(name: str) -> list[str]:
+        body = {
+            "name": name,
+            "ingredients": [
+                {"ingredient_id": ingredient_id, "unit_id": 0, "unit_quantity": 10}
+                for ingredient_id in expected
+            ],
+            "tags": [],
+        }
+        with count_queries() as statements:
+            response = client.post("/api/foods/", json=body)
+        assert response.status_code == 201
+        assert {
+            line["ingredient_id"]: line["unit_id"] for line in response.json()["ingredients"]
+        } == expected
+        return [sql for sql in statements if "FROM ingredient_units" in sql]
+
+    assert len(create("Synthetic stew")) == 1
+    # Base units are cached per process until one of the ingredient's units changes.
+    assert create("Synthetic soup") == []
+
+    first_id = next(iter(expected))
+    ingredient = client.get(f"/api/ingredients/{first_id}").json()
+    ingredient["units"] = [
+        {**unit, "grams": 250} if unit["name"] == "cup" else unit
+        for unit in ingredient["units"]
+    ]
+    response = client.put(f"/api/ingredients/{first_id}", json=ingredient)
+    assert response.status_code == 200, response.text
+    assert len(create("Synthetic salad")) == 1
+
+
+def test_food_lines_and_plans_pick_the_same_base_unit() -> None:
+    units = [
+        IngredientUnit(id=1, name="cup", grams=240),
+        IngredientUnit(id=2, name="gram", grams=1),
+        IngredientUnit(id=3, name=" G ", grams=1.0),
+    ]
+    assert pick_base_unit_id(units) == base_unit(Ingredient(units=units)).id == 3
+    assert pick_base_unit_id(units[:2]) == base_unit(Ingredient(units=units[:2])).id == 2
+
+    # Only the fallbacks differ: food lines store the first unit, plans a synthetic gram.
+    assert pick_base_unit_id(units[:1]) == 1
+    assert base_unit(Ingredient(units=units[:1])).id is None
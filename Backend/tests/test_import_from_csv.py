@@ -0,0 +1,35 @@
+import importlib
+
+import pytest
+
+
+@pytest.fixture(name="importer")
+def importer_fixture(monkeypatch):
+    # The script builds its engine at import time; keep it off the dev database.
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    return importlib.import_module("Database.import_from_csv")
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def execute(self, statement) -> None:
+        self.statements.append(str(statement))
+
+    def commit(self) -> None:
+        pass
+
+
+def test_wipe_data_keeps_change_log_and_usda_index(importer) -> None:
+    session = _RecordingSession()
+
+    importer.wipe_data(
+        session,
+        ["ingredients", "usda_foods", "catalog_changes", "usda_food_terms", "usda_cache_entries"],
+    )
+
+    [truncate] = session.statements
+    assert truncate.startswith("TRUNCATE TABLE usda_cache_entries, ingredients ")
+    for table in importer.PRESERVED_TABLES:
+        assert table not in truncate
@@ -0,0 +1,231 @@
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from Backend.models import (
+    Food,
+    FoodIngredient,
+    Ingredient,
+    IngredientRead,
+    IngredientShoppingUnit,
+    IngredientSource,
+    IngredientUnit,
+    Nutrition,
+    PossibleIngredientTag,
+    StoredFood,
+)
+from Backend.routes.ingredients import INGREDIENT_LOAD_OPTIONS, ingredient_to_read
+
+
+def _seed_ingredients(engine) -> dict:
+    with Session(engine) as session:
+        spicy = PossibleIngredientTag(name="Spicy")
+        sweet = PossibleIngredientTag(name="Sweet")
+        session.add_all([spicy, sweet])
+        session.add_all(
+            [
+                Ingredient(name="Apple", tags=[sweet]),
+                Ingredient(
+                    name="Apricot",
+                    tags=[sweet],
+                    sources=[IngredientSource(source="usda", source_id="111")],
+                ),
+                Ingredient(name="Banana", tags=[sweet]),
+                Ingredient(
+                    name="Cayenne",
+                    tags=[spicy],
+                    sources=[IngredientSource(source="usda", source_id="222")],
+                ),
+                Ingredient(name="Chili", tags=[spicy]),
+            ]
+        )
+        session.commit()
+        return {"spicy": spicy.id, "sweet": sweet.id}
+
+
+def test_list_ingredients_paginates_by_name(client: TestClient, engine) -> None:
+    _seed_ingredients(engine)
+
+    names = []
+    params = {"limit": 2}
+    pages = 0
+    while True:
+        response = client.get("/api/ingredients/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        names.extend(item["name"] for item in page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "after": cursor}
+
+    assert pages == 3
+    assert names == ["Apple", "Apricot", "Banana", "Cayenne", "Chili"]
+
+
+def test_list_ingredients_without_limit_returns_everything(
+    client: TestClient, engine
+) -> None:
+    _seed_ingredients(engine)
+
+    response = client.get("/api/ingredients/")
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == [
+        "Apple",
+        "Apricot",
+        "Banana",
+        "Cayenne",
+        "Chili",
+    ]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_ingredients_filters(client: TestClient, engine) -> None:
+    tags = _seed_ingredients(engine)
+
+    response = client.get("/api/ingredients/", params={"name_prefix": "ap"})
+    assert [item["name"] for item in response.json()] == ["Apple", "Apricot"]
+
+    response = client.get("/api/ingredients/", params={"tag_ids": [tags["spicy"]]})
+    assert [item["name"] for item in response.json()] == ["Cayenne", "Chili"]
+
+    response = client.get("/api/ingredients/", params={"source": "usda"})
+    assert [item["name"] for item in response.json()] == ["Apricot", "Cayenne"]
+
+    response = client.get("/api/ingredients/", params={"source": "manual"})
+    assert [item["name"] for item in response.json()] == ["Apple", "Banana", "Chili"]
+
+    response = client.get(
+        "/api/ingredients/",
+        params={"tag_ids": [tags["sweet"]], "source": "usda", "limit": 1},
+    )
+    assert [item["name"] for item in response.json()] == ["Apricot"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_ingredients_rejects_invalid_cursor(client: TestClient) -> None:
+    response = client.get("/api/ingredients/", params={"limit": 2, "after": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_ingredient_dependents_use_indexed_plan_items(
+    client: TestClient, engine, count_queries
+) -> None:
+    with Session(engine) as session:
+        rice, beans = Ingredient(name="Dependent rice"), Ingredient(name="Dependent beans")
+        session.add_all([rice, beans])
+        session.flush()
+        bowl = Food(name="Rice bowl", ingredients=[FoodIngredient(ingredient_id=rice.id)])
+        chili = Food(name="Chili", ingredients=[FoodIngredient(ingredient_id=beans.id)])
+        session.add_all([bowl, chili])
+        session.flush()
+        macros = {
+            f"per_portion_{name}": 1.0
+            for name in ("calories", "protein", "carbohydrates", "fat", "fiber")
+        }
+        session.add_all(
+            [
+                StoredFood(user_id="u", food_id=bowl.id, prepared_portions=2,
+                           remaining_portions=2, **macros),
+                StoredFood(user_id="u", food_id=bowl.id, prepared_portions=2,
+                           remaining_portions=0, is_finished=True, **macros),
+                StoredFood(user_id="u", food_id=chili.id, prepared_portions=2,
+                           remaining_portions=2, **macros),
+            ]
+        )
+        session.commit()
+        rice_id, beans_id, bowl_id, chili_id = rice.id, beans.id, bowl.id, chili.id
+
+    def create_plan(label, items):
+        response = client.post("/api/plans/", json={"label": label, "payload": {"plan": items}})
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    both = create_plan(
+        "Both",
+        [
+            {"type": "food", "foodId": str(bowl_id), "portions": 1},
+            {"type": "ingredient", "ingredientId": rice_id, "amount": 50},
+        ],
+    )
+    via_food = create_plan("Via food", [{"type": "food", "foodId": bowl_id}])
+    create_plan("Unrelated", [{"type": "food", "foodId": chili_id}])
+
+    client.get(f"/api/ingredients/{beans_id}/dependents")
+    with count_queries() as statements:
+        response = client.get(f"/api/ingredients/{rice_id}/dependents")
+    assert response.status_code == 200
+    assert not any("FROM plans" in sql and "plan_items" not in sql for sql in statements)
+    assert len(statements) <= 4
+    body = response.json()
+    assert [food["id"] for food in body["foods"]] == [bowl_id]
+    assert [(p["id"], p["direct"], p["food_ids"]) for p in body["plans"]] == [
+        (both, True, [bowl_id]),
+        (via_food, False, [bowl_id]),
+    ]
+    assert [item["food_id"] for item in body["stored_food"]] == [bowl_id]
+
+    # Plan items follow payload updates and plan deletion.
+    client.put(f"/api/plans/{both}", json={"payload": {"plan": []}})
+    client.delete(f"/api/plans/{via_food}")
+    body = client.get(f"/api/ingredients/{rice_id}/dependents").json()
+    assert body["plans"] == []
+
+    assert client.get(f"/api/ingredients/{beans_id}/dependents").json()["foods"] == [
+        {"id": chili_id, "name": "Chili"}
+    ]
+    assert client.get("/api/ingredients/999999/dependents").status_code == 404
+
+
+def test_list_ingredients_matches_ingredient_to_read(
+    client: TestClient, engine, count_queries
+) -> None:
+    with Session(engine) as session:
+        veg, raw = PossibleIngredientTag(name="Veg"), PossibleIngredientTag(name="Raw")
+        cup = IngredientUnit(name="cup", grams=128)
+        carrot = Ingredient(
+            name="Carrot",
+            nutrition=Nutrition(calories=0.41, protein=0.01, carbohydrates=0.1, fat=0, fiber=0.03),
+            units=[cup, IngredientUnit(name="g", grams=1)],
+            sources=[
+                IngredientSource(source="manual", source_id="a"),
+                IngredientSource(source="usda", source_id="170393"),
+            ],
+            tags=[raw, veg],
+        )
+        carrot.shopping_unit = IngredientShoppingUnit(unit=cup)
+        salt = Ingredient(
+            name="Salt",
+            sources=[
+                IngredientSource(source="off", source_id="9"),
+                IngredientSource(source="nutritionix", source_id="2"),
+            ],
+        )
+        sugar = Ingredient(name="Sugar", units=[IngredientUnit(name="gram", grams=1)])
+        session.add_all([carrot, salt, sugar])
+        session.commit()
+
+        expected = TypeAdapter(list[IngredientRead]).dump_python(
+            [
+                ingredient_to_read(ingredient)
+                for ingredient in session.exec(
+                    select(Ingredient)
+                    .options(*INGREDIENT_LOAD_OPTIONS)
+                    .order_by(Ingredient.name, Ingredient.id)
+                ).all()
+            ],
+            mode="json",
+        )
+
+    with count_queries() as statements:
+        response = client.get("/api/ingredients/")
+    assert response.status_code == 200
+    assert response.json() == expected
+    assert [item["source"] for item in expected] == ["usda", "nutritionix", None]
+    assert len(statements) == 3
+
+    response = client.get("/api/ingredients/", params={"limit": 2})
+    assert response.json() == expected[:2]
+    assert response.headers["X-Next-Cursor"]
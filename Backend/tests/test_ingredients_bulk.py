@@ -0,0 +1,161 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from Backend.models import (
+    Ingredient,
+    IngredientShoppingUnit,
+    IngredientSource,
+    PossibleIngredientTag,
+)
+
+
+def _nutrition() -> dict:
+    return {"calories": 1, "fat": 0, "carbohydrates": 0, "protein": 0, "fiber": 0}
+
+
+def test_bulk_create_inserts_ingredients_with_related_rows(
+    client: TestClient, engine
+) -> None:
+    with Session(engine) as session:
+        tag = PossibleIngredientTag(name="Fruit")
+        session.add(tag)
+        session.commit()
+        tag_id = tag.id
+
+    response = client.post(
+        "/api/ingredients:bulk",
+        json={
+            "items": [
+                {
+                    "name": "Apple",
+                    "source": "usda",
+                    "source_id": "111",
+                    "nutrition": _nutrition(),
+                    "units": [{"name": "piece", "grams": 180}],
+                    "tags": [{"id": tag_id}],
+                    "shopping_unit": {"name": "piece"},
+                },
+                {"name": "Pear", "units": [{"name": "g", "grams": 5}]},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["created", "created"]
+    apple = results[0]["ingredient"]
+    assert apple["source"] == "usda" and apple["source_id"] == "111"
+    assert apple["nutrition"]["calories"] == 1
+    assert sorted(unit["name"] for unit in apple["units"]) == ["g", "piece"]
+    assert [tag["name"] for tag in apple["tags"]] == ["Fruit"]
+    assert apple["shopping_unit"]["name"] == "piece"
+    pear = results[1]["ingredient"]
+    assert [(unit["name"], unit["grams"]) for unit in pear["units"]] == [("g", 1)]
+
+    with Session(engine) as session:
+        shopping = session.exec(select(IngredientShoppingUnit)).one()
+        assert shopping.ingredient_id == apple["id"]
+
+
+def test_bulk_create_preserves_source_and_name_dedupe(client: TestClient, engine) -> None:
+    with Session(engine) as session:
+        mapped = Ingredient(
+            name="Banana", sources=[IngredientSource(source="usda", source_id="222")]
+        )
+        named = Ingredient(name="Cherry")
+        session.add_all([mapped, named])
+        session.commit()
+        mapped_id, named_id = mapped.id, named.id
+
+    response = client.post(
+        "/api/ingredients:bulk",
+        json={
+            "items": [
+                # Existing source mapping wins regardless of the name.
+                {"name": "Banana (raw)", "source": "usda", "source_id": "222"},
+                # Existing name: reused and gains the new source mapping.
+                {"name": "Cherry", "source": "usda", "source_id": "333"},
+                # Duplicates within the batch resolve to the first item.
+                {"name": "Date", "source": "usda", "source_id": "444"},
+                {"name": "Date"},
+                {"name": "Dates", "source": "usda", "source_id": "444"},
+                {"name": "Date", "source": "usda", "source_id": "555"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [
+        "existing",
+        "existing",
+        "created",
+        "existing",
+        "existing",
+        "existing",
+    ]
+    assert results[0]["ingredient"]["id"] == mapped_id
+    assert results[1]["ingredient"]["id"] == named_id
+    date_id = results[2]["ingredient"]["id"]
+    assert {result["ingredient"]["id"] for result in results[3:]} == {date_id}
+
+    with Session(engine) as session:
+        pairs = {
+            (source.source_id, source.ingredient_id)
+            for source in session.exec(select(IngredientSource)).all()
+        }
+        names = session.exec(select(Ingredient.name).order_by(Ingredient.name)).all()
+    assert pairs == {
+        ("222", mapped_id),
+        ("333", named_id),
+        ("444", date_id),
+        ("555", date_id),
+    }
+    assert names == ["Banana", "Cherry", "Date"]
+
+
+def test_bulk_create_reports_item_errors_without_failing_batch(
+    client: TestClient,
+) -> None:
+    response = client.post(
+        "/api/ingredients:bulk",
+        json={
+            "items": [
+                {"name": "Egg", "tags": [{"id": 999}]},
+                {"name": "Fig", "shopping_unit_id": 12345},
+                {"name": "Grape"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["error", "error", "created"]
+    assert results[0]["detail"] == "Unknown ingredient tag id(s): 999."
+    assert results[1]["detail"] == "Preferred shopping unit must belong to the ingredient."
+    assert results[0]["ingredient"] is None
+
+
+def test_bulk_create_uses_constant_number_of_queries(
+    client: TestClient, count_queries
+) -> None:
+    def payload(offset: int, count: int) -> dict:
+        return {
+            "items": [
+                {
+                    "name": f"Item {offset + index}",
+                    "source": "usda",
+                    "source_id": str(offset + index),
+                    "nutrition": _nutrition(),
+                    "units": [{"name": "cup", "grams": 100}],
+                }
+                for index in range(count)
+            ]
+        }
+
+    with count_queries() as small:
+        client.post("/api/ingredients:bulk", json=payload(0, 5))
+    with count_queries() as large:
+        client.post("/api/ingredients:bulk", json=payload(100, 50))
+
+    assert len(large) == len(small)
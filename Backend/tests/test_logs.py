@@ -1,9 +1,10 @@
 from datetime import date
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
-from Backend.models import DailyLogEntry, Ingredient, StoredFood
+from Backend.models import DailyLogEntry, DailyLogTotal, Ingredient, StoredFood
+from Backend.services.daily_log_totals import add_log_entries, rebuild_daily_log_totals
 
 
 def _create_ingredient(session: Session, name: str = "Ingredient") -> Ingredient:
@@ -242,3 +243,286 @@ def test_clear_daily_logs(client: TestClient, engine) -> None:
     )
     assert list_second_after.status_code == 200
     assert list_second_after.json() == []
+
+
+def _add_log_entries(engine, user_id: str, entries, *, rollup: bool = True) -> int:
+    with Session(engine) as session:
+        ingredient = _create_ingredient(session, f"Range ingredient {user_id}")
+        created = []
+        for log_date, calories in entries:
+            created.append(
+                DailyLogEntry(
+                    user_id=user_id,
+                    log_date=log_date,
+                    ingredient_id=ingredient.id,
+                    portions_consumed=1,
+                    calories=calories,
+                    protein=calories / 10,
+                    carbohydrates=calories / 5,
+                    fat=calories / 20,
+                    fiber=1,
+                )
+            )
+        session.add_all(created)
+        if rollup:
+            add_log_entries(session, created)
+        session.commit()
+        return ingredient.id
+
+
+def test_list_daily_logs_for_date_range(client: TestClient, engine) -> None:
+    _add_log_entries(
+        engine,
+        "user-range",
+        [
+            (date(2024, 3, 1), 100),
+            (date(2024, 3, 3), 200),
+            (date(2024, 3, 3), 300),
+            (date(2024, 3, 8), 400),
+        ],
+    )
+    _add_log_entries(engine, "someone-else", [(date(2024, 3, 2), 999)])
+
+    response = client.get(
+        "/api/logs/",
+        params={"user_id": "user-range", "start": "2024-03-01", "end": "2024-03-07"},
+    )
+    assert response.status_code == 200
+    entries = response.json()
+    assert [entry["calories"] for entry in entries] == [100, 200, 300]
+    assert {entry["user_id"] for entry in entries} == {"user-range"}
+
+    invalid = client.get(
+        "/api/logs/",
+        params={"user_id": "user-range", "start": "2024-03-07", "end": "2024-03-01"},
+    )
+    assert invalid.status_code == 400
+
+
+def test_summarize_daily_logs_by_bucket(client: TestClient, engine) -> None:
+    _add_log_entries(
+        engine,
+        "user-summary",
+        [
+            (date(2024, 2, 28), 50),  # Wednesday
+            (date(2024, 3, 3), 100),  # Sunday, same ISO week as Feb 28
+            (date(2024, 3, 3), 200),
+            (date(2024, 3, 4), 400),  # Monday
+        ],
+    )
+    params = {"user_id": "user-summary", "start": "2024-02-01", "end": "2024-03-31"}
+
+    daily = client.get("/api/logs/summary", params=params)
+    assert daily.status_code == 200
+    assert [(row["period_start"], row["entry_count"], row["calories"]) for row in daily.json()] == [
+        ("2024-02-28", 1, 50),
+        ("2024-03-03", 2, 300),
+        ("2024-03-04", 1, 400),
+    ]
+    assert daily.json()[1]["protein"] == 30
+    assert daily.json()[1]["fiber"] == 2
+
+    weekly = client.get("/api/logs/summary", params={**params, "bucket": "week"})
+    assert [(row["period_start"], row["calories"]) for row in weekly.json()] == [
+        ("2024-02-26", 350),
+        ("2024-03-04", 400),
+    ]
+
+    monthly = client.get("/api/logs/summary", params={**params, "bucket": "month"})
+    assert [(row["period_start"], row["entry_count"], row["calories"]) for row in monthly.json()] == [
+        ("2024-02-01", 1, 50),
+        ("2024-03-01", 3, 700),
+    ]
+
+    assert client.get("/api/logs/summary", params={**params, "bucket": "year"}).status_code == 422
+
+
+def test_log_range_queries_use_indexes(client: TestClient, engine, count_queries) -> None:
+    params = {"user_id": "user-plan", "start": "2024-01-01", "end": "2024-01-31"}
+    plans = []
+    for path in ("/api/logs/", "/api/logs/summary"):
+        with count_queries() as statements:
+            assert client.get(path, params=params).status_code == 200
+        with engine.connect() as connection:
+            plans.append(
+                str(
+                    connection.exec_driver_sql(
+                        f"EXPLAIN QUERY PLAN {statements[-1]}",
+                        ("user-plan", "2024-01-01", "2024-01-31"),
+                    ).all()
+                )
+            )
+
+    assert "ix_daily_log_entries_user_date" in plans[0]
+    # The summary only reads the rollup, through its (user_id, log_date) key.
+    assert "daily_log_entries" not in plans[1]
+    assert "sqlite_autoindex_daily_log_totals_1" in plans[1]
+
+
+def _rollup(engine, user_id: str):
+    with Session(engine) as session:
+        rows = session.exec(
+            select(DailyLogTotal)
+            .where(DailyLogTotal.user_id == user_id)
+            .order_by(DailyLogTotal.log_date)
+        ).all()
+        return [(row.log_date, row.entry_count, row.calories, row.fiber) for row in rows]
+
+
+def test_daily_log_totals_follow_writes(client: TestClient, engine) -> None:
+    with Session(engine) as session:
+        ingredient = _create_ingredient(session, "Rollup Oats")
+
+    def log(day: str, calories: float) -> int:
+        response = client.post(
+            "/api/logs/",
+            json={
+                "user_id": "user-rollup",
+                "log_date": day,
+                "ingredient_id": ingredient.id,
+                "portions_consumed": 1,
+                "calories": calories,
+                "protein": 1,
+                "carbohydrates": 1,
+                "fat": 1,
+                "fiber": 2,
+            },
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    first = log("2024-05-01", 100)
+    log("2024-05-01", 150)
+    lone = log("2024-05-02", 80)
+    log("2024-05-03", 60)
+    assert _rollup(engine, "user-rollup") == [
+        (date(2024, 5, 1), 2, 250, 4),
+        (date(2024, 5, 2), 1, 80, 2),
+        (date(2024, 5, 3), 1, 60, 2),
+    ]
+
+    assert client.delete(f"/api/logs/{first}").status_code == 204
+    assert client.delete(f"/api/logs/{lone}").status_code == 204
+    assert _rollup(engine, "user-rollup") == [
+        (date(2024, 5, 1), 1, 150, 2),
+        (date(2024, 5, 3), 1, 60, 2),
+    ]
+
+    summary = client.get(
+        "/api/logs/summary",
+        params={"user_id": "user-rollup", "start": "2024-05-01", "end": "2024-05-31", "bucket": "month"},
+    )
+    assert [(row["entry_count"], row["calories"]) for row in summary.json()] == [(2, 210)]
+
+    assert (
+        client.delete("/api/logs/", params={"user_id": "user-rollup", "log_date": "2024-05-03"}).status_code
+        == 204
+    )
+    assert _rollup(engine, "user-rollup") == [(date(2024, 5, 1), 1, 150, 2)]
+    assert client.delete("/api/logs/", params={"user_id": "user-rollup"}).status_code == 204
+    assert _rollup(engine, "user-rollup") == []
+
+
+def test_rebuild_daily_log_totals_matches_entries(engine) -> None:
+    _add_log_entries(
+        engine,
+        "user-backfill",
+        [(date(2024, 6, 1), 100), (date(2024, 6, 1), 20), (date(2024, 6, 9), 5)],
+        rollup=False,
+    )
+    _add_log_entries(engine, "other-backfill", [(date(2024, 6, 1), 7)], rollup=False)
+    assert _rollup(engine, "user-backfill") == []
+
+    with Session(engine) as session:
+        assert rebuild_daily_log_totals(session, "user-backfill") == 2
+        session.commit()
+    assert _rollup(engine, "user-backfill") == [
+        (date(2024, 6, 1), 2, 120, 2),
+        (date(2024, 6, 9), 1, 5, 1),
+    ]
+    assert _rollup(engine, "other-backfill") == []
+
+    with Session(engine) as session:
+        rebuild_daily_log_totals(session)
+        session.commit()
+    assert _rollup(engine, "other-backfill") == [(date(2024, 6, 1), 1, 7, 1)]
+
+
+def _batch_item(user_id: str, day: date, **source) -> dict:
+    return {
+        "user_id": user_id,
+        "log_date": day.isoformat(),
+        "portions_consumed": 1,
+        "calories": 100,
+        "protein": 10,
+        "carbohydrates": 5,
+        "fat": 2,
+        "fiber": 1,
+        **source,
+    }
+
+
+def test_create_daily_logs_batch(client: TestClient, engine, count_queries) -> None:
+    with Session(engine) as session:
+        first = _create_ingredient(session, "Rice")
+        second = _create_ingredient(session, "Beans")
+        first_id, second_id = first.id, second.id
+
+    day = date(2024, 5, 1)
+    items = [
+        _batch_item("user-batch", day, ingredient_id=second_id),
+        _batch_item("user-batch", day, ingredient_id=first_id),
+        _batch_item("user-batch", date(2024, 5, 2), ingredient_id=second_id),
+    ]
+    with count_queries() as statements:
+        response = client.post("/api/logs:batch", json={"items": items})
+    assert response.status_code == 201
+    created = response.json()
+    assert [entry["ingredient_id"] for entry in created] == [second_id, first_id, second_id]
+    assert all(entry["id"] is not None and entry["created_at"] for entry in created)
+
+    lookups = [statement for statement in statements if "FROM ingredients" in statement]
+    assert len(lookups) == 1
+    assert not any("FROM stored_food" in statement for statement in statements)
+
+    with Session(engine) as session:
+        totals = session.exec(
+            select(DailyLogTotal)
+            .where(DailyLogTotal.user_id == "user-batch")
+            .order_by(DailyLogTotal.log_date)
+        ).all()
+        assert [(total.log_date, total.entry_count, total.calories) for total in totals] == [
+            (day, 2, 200),
+            (date(2024, 5, 2), 1, 100),
+        ]
+
+
+def test_create_daily_logs_batch_is_all_or_nothing(client: TestClient, engine) -> None:
+    with Session(engine) as session:
+        ingredient_id = _create_ingredient(session, "Oats").id
+
+    day = date(2024, 5, 3)
+    response = client.post(
+        "/api/logs:batch",
+        json={
+            "items": [
+                _batch_item("user-batch-fail", day, ingredient_id=ingredient_id),
+                _batch_item("user-batch-fail", day, food_id=999),
+                _batch_item("user-batch-fail", day, stored_food_id=998),
+            ]
+        },
+    )
+    assert response.status_code == 422
+    assert [(error["loc"], error["msg"]) for error in response.json()["detail"]] == [
+        (["body", "items", 1, "food_id"], "Food not found"),
+        (["body", "items", 2, "stored_food_id"], "Stored food not found"),
+    ]
+
+    with Session(engine) as session:
+        assert (
+            session.exec(
+                select(DailyLogEntry).where(DailyLogEntry.user_id == "user-batch-fail")
+            ).all()
+            == []
+        )
+        assert session.get(DailyLogTotal, ("user-batch-fail", day)) is None
@@ -0,0 +1,138 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from Backend.models import (
+    Food,
+    FoodIngredient,
+    Ingredient,
+    IngredientUnit,
+    Nutrition,
+    Plan,
+    PlanItem,
+)
+
+
+def _seed(engine) -> dict:
+    with Session(engine) as session:
+        oats = Ingredient(
+            name="Oats",
+            nutrition=Nutrition(calories=4, protein=0.1, carbohydrates=0.6, fat=0.07, fiber=0.1),
+            units=[IngredientUnit(name="g", grams=1), IngredientUnit(name="cup", grams=80)],
+        )
+        milk = Ingredient(
+            name="Milk",
+            nutrition=Nutrition(calories=0.5, protein=0.03, carbohydrates=0.05, fat=0.02, fiber=0),
+            units=[IngredientUnit(name="g", grams=1)],
+        )
+        session.add_all([oats, milk])
+        session.commit()
+        food = Food(
+            name="Porridge",
+            ingredients=[
+                FoodIngredient(ingredient_id=oats.id, unit_id=oats.units[1].id, unit_quantity=1),
+                FoodIngredient(ingredient_id=milk.id, unit_id=milk.units[0].id, unit_quantity=200),
+            ],
+        )
+        session.add(food)
+        session.commit()
+        return {"oats": oats.id, "oats_g": oats.units[0].id, "milk": milk.id, "food": food.id}
+
+
+def _payload(ids: dict) -> dict:
+    return {
+        "days": 2,
+        "targetMacros": {"calories": 500, "protein": 20, "carbs": 60, "fat": 10, "fiber": 5},
+        "plan": [
+            {
+                "type": "food",
+                "foodId": str(ids["food"]),
+                "portions": 2,
+                "overrides": {str(ids["milk"]): {"unitId": 0, "quantity": 100}},
+            },
+            {
+                "type": "ingredient",
+                "ingredientId": str(ids["oats"]),
+                "unitId": ids["oats_g"],
+                "amount": 50,
+                "portions": 1,
+            },
+            {"type": "food", "foodId": "4242", "portions": 1, "overrides": {}},
+        ],
+    }
+
+
+def test_evaluate_stored_plan(client: TestClient, engine) -> None:
+    ids = _seed(engine)
+    with Session(engine) as session:
+        plan = Plan(label="Breakfasts", payload=_payload(ids))
+        session.add(plan)
+        session.commit()
+        plan_id = plan.id
+
+    response = client.get(f"/api/plans/{plan_id}/evaluation")
+    assert response.status_code == 200
+    data = response.json()
+
+    porridge, oats, missing = data["items"]
+    # One portion: 80 g oats + 100 g milk (override), doubled.
+    assert porridge["name"] == "Porridge"
+    assert porridge["macros"]["calories"] == pytest.approx((80 * 4 + 100 * 0.5) * 2)
+    assert porridge["macros"]["protein"] == pytest.approx((80 * 0.1 + 100 * 0.03) * 2)
+    assert oats["macros"]["carbohydrates"] == pytest.approx(50 * 0.6)
+    assert missing == {
+        "index": 2,
+        "type": "food",
+        "ref_id": 4242,
+        "name": None,
+        "portions": 1,
+        "available": False,
+        "macros": {"calories": 0, "protein": 0, "carbohydrates": 0, "fat": 0, "fiber": 0},
+    }
+
+    total_calories = (80 * 4 + 100 * 0.5) * 2 + 50 * 4
+    assert data["days"] == 2
+    assert data["total"]["calories"] == pytest.approx(total_calories)
+    assert data["per_day"]["calories"] == pytest.approx(total_calories / 2)
+    assert data["target"]["carbohydrates"] == 60
+    assert data["deviation"]["calories"] == pytest.approx(total_calories / 2 - 500)
+
+
+def test_evaluate_plan_query_count_is_constant(
+    client: TestClient, engine, count_queries
+) -> None:
+    ids = _seed(engine)
+    small = _payload(ids)
+    large = dict(small, plan=small["plan"] * 25)
+
+    with count_queries() as small_statements:
+        assert client.post("/api/plans/evaluation", json={"payload": small}).status_code == 200
+    with count_queries() as large_statements:
+        response = client.post("/api/plans/evaluation", json={"payload": large})
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 75
+    assert len(large_statements) == len(small_statements)
+
+
+def test_evaluate_missing_plan_returns_404(client: TestClient) -> None:
+    assert client.get("/api/plans/999/evaluation").status_code == 404
+
+
+def test_item_indexes_count_malformed_entries(client: TestClient, engine) -> None:
+    ids = _seed(engine)
+    payload = _payload(ids)
+    payload["plan"][1:1] = ["stray", {"portions": 1}]
+
+    response = client.post("/api/plans/", json={"label": "Gaps", "payload": payload})
+    assert response.status_code == 201
+    plan_id = response.json()["id"]
+
+    evaluation = client.get(f"/api/plans/{plan_id}/evaluation").json()
+    assert [item["index"] for item in evaluation["items"]] == [0, 3, 4]
+    with Session(engine) as session:
+        positions = session.exec(
+            select(PlanItem.position).where(PlanItem.plan_id == plan_id).order_by(PlanItem.position)
+        ).all()
+    # The unknown food 4242 is indexed too; only malformed entries are skipped.
+    assert positions == [0, 3, 4]
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from Backend.models import DailyLogEntry, StoredFood
+from Backend.services import schema_capabilities
+from Backend.services.schema_capabilities import (
+    get_schema_capabilities,
+    invalidate_schema_capabilities,
+)
+
+
+def test_capabilities_are_cached_until_ddl(engine, count_queries) -> None:
+    invalidate_schema_capabilities(engine)
+    capabilities = get_schema_capabilities(engine)
+    assert capabilities.has_table("stored_food")
+    assert capabilities.has_columns("stored_food", "remaining_portions", "completed_at")
+    assert not capabilities.has_columns("stored_food", "no_such_column")
+    assert capabilities.revision is None
+
+    with count_queries() as statements:
+        assert get_schema_capabilities(engine) is capabilities
+    assert statements == []
+
+    DailyLogEntry.__table__.drop(engine)
+    StoredFood.__table__.drop(engine)
+    try:
+        assert not get_schema_capabilities(engine).has_table("stored_food")
+    finally:
+        StoredFood.__table__.create(engine)
+        DailyLogEntry.__table__.create(engine)
+    assert get_schema_capabilities(engine).has_table("stored_food")
+
+
+def test_capabilities_follow_alembic_revision(engine, monkeypatch) -> None:
+    monkeypatch.setattr(
+        schema_capabilities, "settings", SimpleNamespace(schema_recheck_seconds=60)
+    )
+    now = [0.0]
+
+    def clock() -> float:
+        return now[0]
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        connection.execute(text("INSERT INTO alembic_version VALUES ('aaa')"))
+    invalidate_schema_capabilities(engine)
+    capabilities = get_schema_capabilities(engine, clock=clock)
+    assert capabilities.revision == "aaa"
+
+    # Another process migrates; the change is noticed once the recheck is due.
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE alembic_version SET version_num = 'bbb'"))
+    now[0] = 30.0
+    assert get_schema_capabilities(engine, clock=clock).revision == "aaa"
+    now[0] = 61.0
+    refreshed = get_schema_capabilities(engine, clock=clock)
+    assert refreshed.revision == "bbb"
+    assert refreshed.checked_at == 61.0
+
+
+def test_stored_food_requests_skip_schema_inspection(
+    client: TestClient, count_queries
+) -> None:
+    client.get("/api/stored_food/")
+
+    with count_queries() as statements:
+        response = client.get("/api/stored_food/", params={"user_id": "nobody"})
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert "FROM stored_food" in statements[0]
@@ -0,0 +1,162 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from Backend.models import (
+    Food,
+    FoodIngredient,
+    Ingredient,
+    IngredientShoppingUnit,
+    IngredientUnit,
+    Plan,
+)
+
+
+def _seed_catalog(engine) -> dict:
+    with Session(engine) as session:
+        rice = Ingredient(
+            name="Rice",
+            units=[IngredientUnit(name="g", grams=1), IngredientUnit(name="cup", grams=200)],
+        )
+        egg = Ingredient(
+            name="Egg",
+            units=[IngredientUnit(name="g", grams=1), IngredientUnit(name="egg", grams=50)],
+        )
+        unused = Ingredient(name="Unused", units=[IngredientUnit(name="g", grams=1)])
+        session.add_all([rice, egg, unused])
+        session.commit()
+
+        rice_g, rice_cup = rice.units
+        egg_g, egg_each = egg.units
+        session.add(IngredientShoppingUnit(ingredient_id=egg.id, unit_id=egg_each.id))
+        food = Food(
+            name="Egg Fried Rice",
+            ingredients=[
+                FoodIngredient(ingredient_id=rice.id, unit_id=rice_cup.id, unit_quantity=1),
+                FoodIngredient(ingredient_id=egg.id, unit_id=egg_each.id, unit_quantity=2),
+            ],
+        )
+        session.add(food)
+        session.commit()
+        return {
+            "rice": rice.id,
+            "rice_g": rice_g.id,
+            "rice_cup": rice_cup.id,
+            "egg": egg.id,
+            "egg_g": egg_g.id,
+            "egg_each": egg_each.id,
+            "food": food.id,
+        }
+
+
+def _payload(ids: dict) -> dict:
+    return {
+        "days": 1,
+        "targetMacros": {"calories": 2000, "protein": 150, "carbs": 250, "fat": 70, "fiber": 30},
+        "plan": [
+            {
+                "type": "food",
+                "foodId": str(ids["food"]),
+                "portions": 2,
+                "overrides": {str(ids["egg"]): {"unitId": ids["egg_g"], "quantity": 60}},
+            },
+            {
+                "type": "ingredient",
+                "ingredientId": str(ids["rice"]),
+                "unitId": ids["rice_g"],
+                "amount": 50,
+                "portions": 1,
+            },
+            {"type": "food", "foodId": "9999", "portions": 1, "overrides": {}},
+        ],
+    }
+
+
+def test_shopping_list_for_stored_plan(client: TestClient, engine) -> None:
+    ids = _seed_catalog(engine)
+    with Session(engine) as session:
+        plan = Plan(label="Weekday", payload=_payload(ids))
+        session.add(plan)
+        session.commit()
+        plan_id = plan.id
+
+    response = client.post(f"/api/plans/{plan_id}/shopping-list")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [item["name"] for item in data["items"]] == ["Egg", "Rice"]
+    egg, rice = data["items"]
+
+    assert egg["total_grams"] == pytest.approx(120)
+    assert egg["unit_totals"] == [
+        {"unit_id": ids["egg_g"], "unit_name": "g", "quantity": 120, "grams_per_unit": 1}
+    ]
+    assert egg["preferred_unit_total"] == {
+        "unit_id": ids["egg_each"],
+        "unit_name": "egg",
+        "quantity": pytest.approx(2.4),
+        "grams_per_unit": 50,
+    }
+
+    assert rice["total_grams"] == pytest.approx(450)
+    assert [(total["unit_name"], total["quantity"]) for total in rice["unit_totals"]] == [
+        ("g", 50),
+        ("cup", 2),
+    ]
+    assert rice["preferred_unit_total"] is None
+
+    assert data["issues"] == [
+        {
+            "type": "missing-food",
+            "message": "Food 9999 referenced by the plan is unavailable.",
+        }
+    ]
+
+
+def test_shopping_list_for_inline_payload(client: TestClient, engine) -> None:
+    ids = _seed_catalog(engine)
+    payload = {
+        "plan": [
+            {
+                "type": "ingredient",
+                "ingredientId": str(ids["egg"]),
+                "unitId": 0,
+                "amount": 0,
+                "portions": 1,
+            },
+            {
+                "type": "ingredient",
+                "ingredientId": str(ids["egg"]),
+                "unitId": ids["egg_each"],
+                "amount": 3,
+                "portions": 2,
+            },
+        ]
+    }
+
+    response = client.post("/api/plans/shopping-list", json={"payload": payload})
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item["name"], item["total_grams"]) for item in data["items"]] == [("Egg", 300)]
+    assert data["items"][0]["preferred_unit_total"]["quantity"] == pytest.approx(6)
+    assert [issue["type"] for issue in data["issues"]] == ["missing-quantity"]
+
+
+def test_shopping_list_loads_catalog_in_constant_queries(
+    client: TestClient, engine, count_queries
+) -> None:
+    ids = _seed_catalog(engine)
+    small = {"plan": _payload(ids)["plan"][:1]}
+    large = {"plan": _payload(ids)["plan"] * 20}
+
+    with count_queries() as small_statements:
+        assert client.post("/api/plans/shopping-list", json={"payload": small}).status_code == 200
+    with count_queries() as large_statements:
+        assert client.post("/api/plans/shopping-list", json={"payload": large}).status_code == 200
+
+    assert len(large_statements) == len(small_statements)
+
+
+def test_shopping_list_errors(client: TestClient) -> None:
+    assert client.post("/api/plans/999/shopping-list").status_code == 404
+    assert client.post("/api/plans/shopping-list", json={}).status_code == 400
@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session, select
+from sqlmodel import Session, SQLModel, create_engine, select
 
-from Backend.models import DailyLogEntry, Food, Ingredient, StoredFood
+from Backend.backend import app
+from Backend.db import get_db
+from Backend.models import DailyLogEntry, DailyLogTotal, Food, Ingredient, StoredFood
 
 
 def _create_ingredient(session: Session, name: str = "Ingredient") -> Ingredient:
@@ -159,6 +162,114 @@ def test_consume_stored_food_rejects_overconsumption(
     assert response.json()["detail"] == "Cannot consume more portions than remain"
 
 
+def test_consume_stored_food_can_log_entry(client: TestClient, engine) -> None:
+    with Session(engine) as session:
+        ingredient = _create_ingredient(session, "Lentil Soup")
+
+    payload = {
+        "user_id": "user-consume-log",
+        "ingredient_id": ingredient.id,
+        "prepared_portions": 4,
+        "per_portion_calories": 200,
+        "per_portion_protein": 12,
+        "per_portion_carbohydrates": 30,
+        "per_portion_fat": 4,
+        "per_portion_fiber": 8,
+    }
+    stored = client.post("/api/stored_food/", json=payload).json()
+
+    response = client.post(
+        f"/api/stored_food/{stored['id']}/consume",
+        json={"portions": 1.5, "log_date": "2024-03-02"},
+    )
+    assert response.status_code == 200
+    consumed = response.json()
+    assert consumed["remaining_portions"] == 2.5
+    log_entry = consumed["log_entry"]
+    assert log_entry["stored_food_id"] == stored["id"]
+    assert log_entry["portions_consumed"] == 1.5
+    assert log_entry["calories"] == 300
+    assert log_entry["fiber"] == 12
+
+    with Session(engine) as session:
+        total = session.get(DailyLogTotal, ("user-consume-log", date(2024, 3, 2)))
+        assert total is not None
+        assert total.entry_count == 1
+        assert total.calories == 300
+
+    without_log = client.post(
+        f"/api/stored_food/{stored['id']}/consume", json={"portions": 1}
+    )
+    assert without_log.status_code == 200
+    assert without_log.json()["log_entry"] is None
+
+
+def test_consume_stored_food_concurrently(tmp_path) -> None:
+    # A file database gives every request its own connection, so the
+    # consumers genuinely race instead of sharing the in-memory test engine.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'consume.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    SQLModel.metadata.create_all(engine)
+
+    def override_get_db():
+        with Session(engine) as session:
+            yield session
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with Session(engine) as session:
+            ingredient = _create_ingredient(session, "Chili")
+            stored = StoredFood(
+                user_id="user-race",
+                ingredient_id=ingredient.id,
+                prepared_portions=25,
+                remaining_portions=25,
+                per_portion_calories=100,
+                per_portion_protein=10,
+                per_portion_carbohydrates=10,
+                per_portion_fat=5,
+                per_portion_fiber=3,
+            )
+            session.add(stored)
+            session.commit()
+            stored_id = stored.id
+
+        with TestClient(app) as client:
+
+            def consume(_):
+                return client.post(
+                    f"/api/stored_food/{stored_id}/consume",
+                    json={"portions": 1, "log_date": "2024-04-01"},
+                ).status_code
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                statuses = list(executor.map(consume, range(40)))
+
+        assert statuses.count(200) == 25
+        assert statuses.count(400) == 15
+
+        with Session(engine) as session:
+            remaining = session.get(StoredFood, stored_id)
+            assert remaining.remaining_portions == 0
+            assert remaining.is_finished is True
+            entries = session.exec(
+                select(DailyLogEntry).where(DailyLogEntry.stored_food_id == stored_id)
+            ).all()
+            assert len(entries) == 25
+            total = session.get(DailyLogTotal, ("user-race", date(2024, 4, 1)))
+            assert total.entry_count == 25
+            assert total.calories == 2500
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
+        engine.dispose()
+
+
 def test_create_stored_food_rejects_negative_macros(
     client: TestClient, engine
 ) -> None:
@@ -501,3 +612,76 @@ def test_clear_stored_food_preserves_daily_logs(client: TestClient, engine) -> N
         assert entry.stored_food_id is None
         assert entry.ingredient_id == ingredient.id
         assert entry.food_id is None
+
+
+def test_clear_stored_food_detaches_logs_in_one_statement(
+    client: TestClient, engine, count_queries
+) -> None:
+    with Session(engine) as session:
+        ingredient = _create_ingredient(session, "Granola")
+        food = _create_food(session, "Curry")
+        ingredient_id, food_id = ingredient.id, food.id
+        stored_items = [
+            StoredFood(
+                user_id="user-clear-many",
+                food_id=food_id if index % 2 else None,
+                ingredient_id=None if index % 2 else ingredient_id,
+                prepared_portions=4,
+                remaining_portions=4,
+                per_portion_calories=100,
+                per_portion_protein=5,
+                per_portion_carbohydrates=10,
+                per_portion_fat=3,
+                per_portion_fiber=1,
+            )
+            for index in range(6)
+        ]
+        other = StoredFood(
+            user_id="someone-else",
+            ingredient_id=ingredient_id,
+            prepared_portions=1,
+            remaining_portions=1,
+            per_portion_calories=100,
+            per_portion_protein=5,
+            per_portion_carbohydrates=10,
+            per_portion_fat=3,
+            per_portion_fiber=1,
+        )
+        session.add_all([*stored_items, other])
+        session.flush()
+        session.add_all(
+            DailyLogEntry(
+                user_id=item.user_id,
+                log_date=date(2024, 2, 4),
+                stored_food_id=item.id,
+                portions_consumed=1,
+                calories=100,
+                protein=5,
+                carbohydrates=10,
+                fat=3,
+                fiber=1,
+            )
+            for item in [*stored_items, *stored_items, other]
+        )
+        session.commit()
+        other_id = other.id
+
+    with count_queries() as statements:
+        response = client.delete("/api/stored_food/", params={"user_id": "user-clear-many"})
+    assert response.status_code == 204
+    assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+    assert not any("FROM daily_log_entries" in statement for statement in statements)
+
+    with Session(engine) as session:
+        entries = session.exec(
+            select(DailyLogEntry).where(DailyLogEntry.user_id == "user-clear-many")
+        ).all()
+        assert len(entries) == 12
+        assert all(entry.stored_food_id is None for entry in entries)
+        assert sum(entry.food_id == food_id for entry in entries) == 6
+        assert sum(entry.ingredient_id == ingredient_id for entry in entries) == 6
+        kept = session.exec(
+            select(DailyLogEntry).where(DailyLogEntry.user_id == "someone-else")
+        ).one()
+        assert kept.stored_food_id == other_id
+        assert session.get(StoredFood, other_id) is not None
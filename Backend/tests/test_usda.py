@@ -1,9 +1,15 @@
+import asyncio
 from types import SimpleNamespace
 
+import httpx
 import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
 
+from Backend.backend import app
 from Backend.routes import usda as usda_routes
 from Backend.routes.usda import _trim_food_payload
+from Backend.services.usda_cache import UsdaResponseCache, food_cache_key
 
 
 @pytest.mark.parametrize(
@@ -248,6 +254,12 @@ def test_trim_food_payload_ignores_non_kilocalorie_energy_variants() -> None:
     }
 
 
+def _usda_settings(**overrides) -> SimpleNamespace:
+    return SimpleNamespace(
+        **{"usda_api_key": "test-key", "usda_local_index": False, **overrides}
+    )
+
+
 class _MockUsdaResponse:
     def __init__(self, payload):
         self._payload = payload
@@ -263,12 +275,6 @@ class _MockAsyncClient:
     def __init__(self, *args, **kwargs) -> None:
         self.calls = []
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb) -> None:
-        return None
-
     async def get(self, url: str, params):
         self.calls.append((url, params))
         return _MockUsdaResponse({"foods": []})
@@ -277,8 +283,10 @@ class _MockAsyncClient:
 def test_search_foods_defaults_to_foundation_data_type(client, monkeypatch) -> None:
     mock_client = _MockAsyncClient()
 
-    monkeypatch.setattr(usda_routes, "settings", SimpleNamespace(usda_api_key="test-key"))
-    monkeypatch.setattr(usda_routes.httpx, "AsyncClient", lambda *args, **kwargs: mock_client)
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
 
     response = client.get("/api/usda/search", params={"query": "banana"})
 
@@ -299,8 +307,10 @@ def test_search_foods_defaults_to_foundation_data_type(client, monkeypatch) -> N
 def test_search_foods_forwards_single_selected_data_type(client, monkeypatch) -> None:
     mock_client = _MockAsyncClient()
 
-    monkeypatch.setattr(usda_routes, "settings", SimpleNamespace(usda_api_key="test-key"))
-    monkeypatch.setattr(usda_routes.httpx, "AsyncClient", lambda *args, **kwargs: mock_client)
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
 
     response = client.get(
         "/api/usda/search",
@@ -324,8 +334,10 @@ def test_search_foods_forwards_single_selected_data_type(client, monkeypatch) ->
 def test_search_foods_forwards_multiple_selected_data_types(client, monkeypatch) -> None:
     mock_client = _MockAsyncClient()
 
-    monkeypatch.setattr(usda_routes, "settings", SimpleNamespace(usda_api_key="test-key"))
-    monkeypatch.setattr(usda_routes.httpx, "AsyncClient", lambda *args, **kwargs: mock_client)
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
 
     response = client.get(
         "/api/usda/search",
@@ -358,3 +370,271 @@ def test_search_foods_rejects_unknown_data_types(client) -> None:
     )
 
     assert response.status_code == 422
+
+
+def test_usda_client_is_shared_across_requests(client) -> None:
+    shared = app.state.usda_client
+
+    assert usda_routes.get_usda_client(SimpleNamespace(app=app)) is shared
+    assert not shared.is_closed
+
+
+def test_create_usda_client_uses_configured_timeout(monkeypatch) -> None:
+    monkeypatch.setattr(
+        usda_routes,
+        "settings",
+        SimpleNamespace(
+            usda_http2=False,
+            usda_http_timeout=3.5,
+            usda_http_max_connections=5,
+            usda_http_max_keepalive_connections=2,
+            usda_http_keepalive_expiry=15.0,
+        ),
+    )
+
+    client = usda_routes.create_usda_client()
+
+    assert client.timeout.read == 3.5
+    assert client.timeout.connect == 3.5
+
+
+def test_search_foods_serves_repeated_queries_from_cache(client, monkeypatch) -> None:
+    mock_client = _MockAsyncClient()
+
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
+
+    first = client.get("/api/usda/search", params={"query": "Chicken breast"})
+    second = client.get("/api/usda/search", params={"query": "chicken  BREAST"})
+    other_type = client.get(
+        "/api/usda/search",
+        params=[("query", "chicken breast"), ("data_types", "Branded")],
+    )
+
+    assert first.status_code == second.status_code == other_type.status_code == 200
+    assert second.json() == first.json()
+    assert len(mock_client.calls) == 2
+
+    stats = client.get("/api/usda/cache/stats").json()
+    assert stats["backend"] == "memory"
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_get_food_details_is_cached_by_fdc_id(client, monkeypatch) -> None:
+    calls = []
+
+    class _DetailClient:
+        async def get(self, url: str, params):
+            calls.append(url)
+            return _MockUsdaResponse(
+                {"fdcId": 123, "description": "Banana", "dataType": "Foundation"}
+            )
+
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: _DetailClient()
+    )
+
+    responses = [client.get("/api/usda/foods/123") for _ in range(3)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[2].json()["name"] == "Banana"
+    assert calls == ["https://api.nal.usda.gov/fdc/v1/food/123"]
+
+
+def test_usda_response_cache_expires_and_evicts_entries() -> None:
+    now = [1000.0]
+    cache = UsdaResponseCache(max_entries=2, ttl_seconds=60, clock=lambda: now[0])
+
+    async def scenario():
+        await cache.set("a", [1])
+        await cache.set("b", [2])
+        assert await cache.get("a") == [1]
+        await cache.set("c", [3])  # evicts "b", the least recently used entry
+        assert await cache.get("b") is None
+        assert await cache.get("c") == [3]
+        now[0] += 61
+        assert await cache.get("a") is None
+
+    asyncio.run(scenario())
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (2, 2, 1)
+
+
+def test_usda_response_cache_shares_entries_through_database(engine) -> None:
+    def session_factory() -> Session:
+        return Session(engine)
+
+    writer = UsdaResponseCache(
+        max_entries=10, ttl_seconds=60, session_factory=session_factory
+    )
+    reader = UsdaResponseCache(
+        max_entries=10, ttl_seconds=60, session_factory=session_factory
+    )
+
+    async def scenario():
+        await writer.set(food_cache_key(7), {"id": 7, "name": "Rice"})
+        return await reader.get(food_cache_key(7)), await reader.get(food_cache_key(8))
+
+    shared, missing = asyncio.run(scenario())
+
+    assert shared == {"id": 7, "name": "Rice"}
+    assert missing is None
+    assert reader.stats().shared_hits == 1
+    assert reader.stats().misses == 1
+
+
+def test_concurrent_food_detail_requests_share_one_upstream_call(monkeypatch) -> None:
+    calls = []
+
+    class _SlowClient:
+        async def get(self, url: str, params):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return _MockUsdaResponse(
+                {"fdcId": 123, "description": "Banana", "dataType": "Foundation"}
+            )
+
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+
+    async def scenario():
+        client = _SlowClient()
+        cache = UsdaResponseCache(max_entries=0, ttl_seconds=0)
+        flight = usda_routes.UsdaSingleFlight(max_concurrency=4)
+        return await asyncio.gather(
+            *(
+                usda_routes.get_food_details(123, client=client, cache=cache, flight=flight)
+                for _ in range(5)
+            )
+        )
+
+    results = asyncio.run(scenario())
+
+    assert calls == ["https://api.nal.usda.gov/fdc/v1/food/123"]
+    assert all(result["name"] == "Banana" for result in results)
+
+
+def test_single_flight_limits_in_flight_upstream_calls() -> None:
+    active = 0
+    peak = 0
+
+    async def fetch():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return active
+
+    async def scenario():
+        flight = usda_routes.UsdaSingleFlight(max_concurrency=2)
+        await asyncio.gather(*(flight.run(f"food:{index}", fetch) for index in range(6)))
+        return flight
+
+    flight = asyncio.run(scenario())
+
+    assert peak == 2
+    assert flight.in_flight == 0
+
+
+def test_single_flight_shares_upstream_errors() -> None:
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=502, detail="USDA API request failed: boom")
+
+    async def scenario():
+        flight = usda_routes.UsdaSingleFlight(max_concurrency=2)
+        return await asyncio.gather(
+            *(flight.run("search:x", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert all(isinstance(result, HTTPException) for result in results)
+
+
+class _MockBatchClient:
+    def __init__(self, missing=(), failing=()) -> None:
+        self.missing = set(missing)
+        self.failing = set(failing)
+        self.posts = []
+
+    async def post(self, url: str, params, json):
+        self.posts.append((url, json["fdcIds"]))
+        if self.failing & set(json["fdcIds"]):
+            request = httpx.Request("POST", url)
+            response = httpx.Response(500, request=request)
+            raise httpx.HTTPStatusError("upstream down", request=request, response=response)
+        return _MockUsdaResponse(
+            [
+                {"fdcId": fdc_id, "description": f"Food {fdc_id}", "dataType": "Foundation"}
+                for fdc_id in json["fdcIds"]
+                if fdc_id not in self.missing
+            ]
+        )
+
+
+def test_food_details_batch_chunks_requests_and_reports_missing_ids(
+    client, monkeypatch
+) -> None:
+    mock_client = _MockBatchClient(missing={7})
+
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
+
+    fdc_ids = list(range(1, 26))
+    response = client.post("/api/usda/foods:batch", json={"fdc_ids": fdc_ids + [3]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [chunk for _, chunk in mock_client.posts] == [fdc_ids[:20], fdc_ids[20:]]
+    assert all(url == "https://api.nal.usda.gov/fdc/v1/foods" for url, _ in mock_client.posts)
+    assert list(body["foods"]) == [str(fdc_id) for fdc_id in fdc_ids if fdc_id != 7]
+    assert body["foods"]["3"]["name"] == "Food 3"
+    assert body["errors"] == {"7": "USDA food not found."}
+
+
+def test_food_details_batch_serves_cached_ids_locally(client, monkeypatch) -> None:
+    mock_client = _MockBatchClient()
+
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
+
+    client.post("/api/usda/foods:batch", json={"fdc_ids": [1, 2]})
+    response = client.post("/api/usda/foods:batch", json={"fdc_ids": [2, 3, 1]})
+
+    assert response.status_code == 200
+    assert list(response.json()["foods"]) == ["2", "3", "1"]
+    assert [chunk for _, chunk in mock_client.posts] == [[1, 2], [3]]
+
+
+def test_food_details_batch_reports_failed_chunks_per_id(client, monkeypatch) -> None:
+    mock_client = _MockBatchClient(failing={30})
+
+    monkeypatch.setattr(usda_routes, "settings", _usda_settings())
+    monkeypatch.setitem(
+        app.dependency_overrides, usda_routes.get_usda_client, lambda: mock_client
+    )
+
+    # The first chunk holds ids 30..11 and fails upstream; id 5 lands in the second.
+    fdc_ids = list(range(30, 10, -1)) + [5]
+    response = client.post("/api/usda/foods:batch", json={"fdc_ids": fdc_ids})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["foods"]) == ["5"]
+    assert set(body["errors"]) == {str(fdc_id) for fdc_id in range(11, 31)}
+    assert body["errors"]["30"].startswith("USDA API request failed")
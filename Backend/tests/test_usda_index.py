@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from Backend.routes import usda as usda_routes
+from Backend.routes.usda import _trim_food_payload
+from Backend.services import usda_index
+from Backend.services.usda_index import (
+    get_local_foods,
+    replace_usda_foods,
+    search_local_foods,
+    search_terms,
+)
+
+
+def _food(fdc_id: int, description: str, data_type: str = "Foundation") -> dict:
+    return _trim_food_payload(
+        {
+            "fdcId": fdc_id,
+            "description": description,
+            "dataType": data_type,
+            "foodNutrients": [{"nutrientName": "Protein", "value": 31}],
+            "foodPortions": [{"portionDescription": "1 breast", "gramWeight": 120}],
+        }
+    )
+
+
+def _seed_index(engine) -> None:
+    with Session(engine) as session:
+        replace_usda_foods(
+            session,
+            [
+                _food(1, "Chicken, broilers or fryers, breast, meat only, cooked"),
+                _food(2, "Chicken breast"),
+                _food(3, "Rice, white, long-grain"),
+                _food(4, "CHICKEN BREAST NUGGETS", data_type="Branded"),
+            ],
+        )
+        session.commit()
+
+
+def test_search_terms_splits_descriptions_into_distinct_words() -> None:
+    assert search_terms("Chicken, breast, CHICKEN 2%") == ["chicken", "breast", "2"]
+
+
+def test_search_local_foods_matches_word_prefixes_and_ranks_name_prefix_first(
+    engine,
+) -> None:
+    _seed_index(engine)
+
+    with Session(engine) as session:
+        results = search_local_foods(session, "chick brea", ["Foundation"])
+        branded = search_local_foods(session, "chicken", ["Branded"])
+        none = search_local_foods(session, "chicken rice", None)
+
+    assert [food["id"] for food in results] == [2, 1]
+    assert results[0]["units"][1] == {"name": "1 breast", "grams": 120.0, "is_default": False}
+    assert [food["id"] for food in branded] == [4]
+    assert none == []
+
+
+def test_search_local_foods_reads_common_words_in_rank_order(engine, monkeypatch) -> None:
+    _seed_index(engine)
+    queries = ("chick brea", "chicken", "rice white", "c", "nugget")
+
+    with Session(engine) as session:
+        exhaustive = [search_local_foods(session, query, None) for query in queries]
+        # Treat every word as common so the ranked prefix scan supplies the candidates.
+        monkeypatch.setattr(usda_index, "_CANDIDATE_LIMIT", 0)
+        ranked = [search_local_foods(session, query, None) for query in queries]
+        branded = search_local_foods(session, "chicken", ["Branded"], limit=1)
+
+    assert ranked[:2] == exhaustive[:2]
+    assert [food["id"] for food in ranked[0]] == [2, 4, 1]
+    assert [food["id"] for food in ranked[2]] == [3]
+    # A common one-character word only matches whole words.
+    assert [food["id"] for food in exhaustive[3]] == [2, 4, 1]
+    assert ranked[3] == []
+    assert [food["id"] for food in ranked[4]] == [4]
+    assert [food["id"] for food in branded] == [4]
+
+
+def test_replace_usda_foods_is_idempotent(engine) -> None:
+    _seed_index(engine)
+
+    with Session(engine) as session:
+        replace_usda_foods(session, [_food(3, "Rice, brown, medium-grain")])
+        session.commit()
+        assert search_local_foods(session, "white", None) == []
+        assert get_local_foods(session, [3, 99])[3]["name"] == "Rice, brown, medium-grain"
+        assert set(get_local_foods(session, [3, 99])) == {3}
+
+
+def test_usda_routes_serve_from_local_index(client: TestClient, engine, monkeypatch) -> None:
+    _seed_index(engine)
+    monkeypatch.setattr(
+        usda_routes,
+        "settings",
+        SimpleNamespace(usda_api_key=None, usda_local_index=True),
+    )
+
+    search = client.get("/api/usda/search", params={"query": "chicken breast"})
+    detail = client.get("/api/usda/foods/3")
+    missing = client.get("/api/usda/foods/99")
+    batch = client.post("/api/usda/foods:batch", json={"fdc_ids": [3, 99]})
+
+    assert search.status_code == 200
+    assert [food["id"] for food in search.json()["foods"]] == [2, 1]
+    assert detail.json()["name"] == "Rice, white, long-grain"
+    assert missing.status_code == 404
+    assert list(batch.json()["foods"]) == ["3"]
+    assert batch.json()["errors"] == {"99": "USDA food not found."}
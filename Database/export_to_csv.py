@@ -1,14 +1,39 @@
-"""Export database tables to CSV files."""
+"""Export database tables to CSV files.
+
+``--fast`` streams every table with ``COPY ... TO STDOUT`` from one exported
+REPEATABLE READ snapshot, running ``--jobs`` tables concurrently, so the
+files are mutually consistent even while the application keeps writing and
+memory use does not grow with table size. Files can be gzip/zstd-compressed
+and a ``manifest.json`` records row counts and SHA-256 checksums.
+
+``--format parquet`` writes typed Parquet files instead (needs ``pyarrow``):
+``Numeric`` columns become decimals, timestamps stay timestamps, and rows are
+written one record batch at a time.
+
+``--since <manifest|timestamp>`` writes a delta instead of a full dump: the
+current version of every row that the ``catalog_changes`` trigger log shows
+as written since then, plus ``<table>.deleted.csv`` tombstones for rows that
+no longer exist (tables truncated since then are sent whole). Given an earlier manifest the delta is exact (it contains
+precisely the transactions that export's snapshot could not see); given a
+timestamp it relies on ``changed_at``. ``import_from_csv.py --delta`` applies
+it idempotently.
+"""
 
 import argparse
+import codecs
 import csv
+import gzip
+import hashlib
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List
 
-from sqlalchemy import inspect, text
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, Numeric, inspect, text
 
 # Ensure repository root is on sys.path for module imports
 sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -19,14 +44,123 @@ SessionLocal = importer.SessionLocal
 MODEL_MAP = importer.MODEL_MAP
 JSON_FIELDS = importer.JSON_FIELDS
 get_table_order = importer.get_table_order
+CSV_SUFFIXES = importer.CSV_SUFFIXES
+PARQUET_BATCH_ROWS = importer.PARQUET_BATCH_ROWS
+load_pyarrow = importer.load_pyarrow
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+COMPRESSION_SUFFIXES = {"none": ".csv", "gzip": ".csv.gz", "zstd": ".csv.zst"}
+PARQUET_CODECS = {"none": "none", "gzip": "gzip", "zstd": "zstd"}
+MANIFEST_NAME = "manifest.json"
+CHANGE_LOG_TABLE = "catalog_changes"
+COPY_BUFFER_SIZE = 1 << 16
+
 
 def ensure_directory(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+class _HashingFile:
+    """Binary writer that counts and hashes the bytes that reach disk."""
+
+    def __init__(self, path: str):
+        self._handle = open(path, "wb")
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self._handle.write(data)
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class ExportSink:
+    """Binary file-like target that optionally compresses what is written.
+
+    ``copy_expert`` and the ``csv`` writer both write through this object in
+    small chunks; nothing is buffered beyond the compressor's own window.
+    """
+
+    def __init__(self, path: str, compression: str = "none"):
+        self.path = path
+        self._file = _HashingFile(path)
+        if compression == "gzip":
+            # mtime=0 keeps the output (and its checksum) reproducible.
+            self._stream = gzip.GzipFile(fileobj=self._file, mode="wb", mtime=0)
+        elif compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as exc:
+                self._file.close()
+                raise RuntimeError("--compress zstd requires the 'zstandard' package.") from exc
+            self._stream = zstandard.ZstdCompressor().stream_writer(
+                self._file, closefd=False
+            )
+        else:
+            self._stream = self._file
+
+    def write(self, data) -> int:
+        return self._stream.write(data)
+
+    def close(self) -> None:
+        if self._stream is not self._file:
+            self._stream.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def bytes(self) -> int:
+        return self._file.bytes
+
+    @property
+    def sha256(self) -> str:
+        return self._file.sha256.hexdigest()
+
+
+def table_path(folder: str, table: str, compression: str) -> str:
+    """Return the output path for ``table`` and drop stale variants of it.
+
+    The importer picks the first of ``table.csv``/``.csv.gz``/``.csv.zst``
+    it finds, so leaving an older export in another format would shadow it.
+    """
+
+    file_path = os.path.join(folder, f"{table}{COMPRESSION_SUFFIXES[compression]}")
+    for suffix in CSV_SUFFIXES:
+        other = os.path.join(folder, f"{table}{suffix}")
+        if other != file_path and os.path.exists(other):
+            os.remove(other)
+    return file_path
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_entry(sink: ExportSink, rows: int) -> Dict[str, object]:
+    return {
+        "file": os.path.basename(sink.path),
+        "rows": rows,
+        "bytes": sink.bytes,
+        "sha256": sink.sha256,
+    }
+
+
 def serialise_value(table: str, column: str, value):
     if value is None:
         return ""
@@ -35,17 +169,368 @@ def serialise_value(table: str, column: str, value):
     return str(value)
 
 
-def export_table(session, folder: str, table: str, columns: List[str]) -> None:
+def export_table(
+    session, folder: str, table: str, columns: List[str], compression: str = "none"
+) -> Dict[str, object]:
     order_clause = " ORDER BY id" if "id" in columns else ""
     stmt = text(f"SELECT * FROM {table}{order_clause}")
-    rows = session.execute(stmt).mappings()
-    file_path = os.path.join(folder, f"{table}.csv")
-    with open(file_path, "w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=columns)
+    # Server-side cursor: rows are fetched in batches instead of all at once.
+    rows = session.execute(stmt, execution_options={"yield_per": 1000}).mappings()
+    file_path = table_path(folder, table, compression)
+    count = 0
+    with ExportSink(file_path, compression) as sink:
+        writer = csv.DictWriter(codecs.getwriter("utf-8")(sink), fieldnames=columns)
         writer.writeheader()
         for row in rows:
             writer.writerow({col: serialise_value(table, col, row.get(col)) for col in columns})
+            count += 1
     print(f"Exported {table} -> {file_path}")
+    return manifest_entry(sink, count)
+
+
+def copy_table(
+    engine, snapshot: str, folder: str, table: str, columns: List[str], compression: str
+) -> Dict[str, object]:
+    """COPY one table to disk on its own connection, inside ``snapshot``."""
+
+    order_clause = ' ORDER BY "id"' if "id" in columns else ""
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    query = f'SELECT {column_list} FROM "{table}"{order_clause}'
+    file_path = table_path(folder, table, compression)
+
+    started = time.perf_counter()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # Transaction-scoped settings only: the pooled connection must not
+        # stay read-only once it is handed back.
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+        with ExportSink(file_path, compression) as sink:
+            cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)",
+                sink,
+                size=COPY_BUFFER_SIZE,
+            )
+        rows = cursor.rowcount
+        connection.rollback()
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else float(rows)
+    print(f"Exported {table} -> {file_path}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return manifest_entry(sink, rows)
+
+
+def export_tables_fast(
+    session,
+    folder: str,
+    tables: Dict[str, List[str]],
+    compression: str,
+    jobs: int,
+    export_format: str = "csv",
+) -> Dict[str, Dict[str, object]]:
+    """Export ``tables`` concurrently from one consistent snapshot.
+
+    ``session`` holds the REPEATABLE READ transaction whose snapshot is
+    exported; it must stay open until every worker has imported the
+    snapshot, so it is only released by the caller afterwards.
+    """
+
+    session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    session.execute(text("SET TRANSACTION READ ONLY"))
+    snapshot = session.execute(text("SELECT pg_export_snapshot()")).scalar_one()
+    print(f"Exporting {len(tables)} tables from snapshot {snapshot} with {jobs} job(s)...")
+
+    engine = session.get_bind()
+    worker = parquet_table if export_format == "parquet" else copy_table
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            table: pool.submit(worker, engine, snapshot, folder, table, columns, compression)
+            for table, columns in tables.items()
+        }
+        return {table: future.result() for table, future in futures.items()}
+
+
+def current_snapshot(session) -> str:
+    """Return ``pg_current_snapshot()``; later deltas start from it."""
+
+    return session.execute(text("SELECT pg_current_snapshot()::text")).scalar_one()
+
+
+def load_since(value: str) -> Dict[str, str]:
+    """Resolve ``--since`` to ``{"snapshot": ...}`` or ``{"timestamp": ...}``."""
+
+    path = Path(value)
+    if path.is_dir():
+        path = path / MANIFEST_NAME
+    if path.is_file():
+        with open(path, "r", encoding="utf-8") as handle:
+            snapshot = json.load(handle).get("snapshot")
+        if not snapshot:
+            raise RuntimeError(f"{path} does not record a snapshot; use a timestamp instead.")
+        return {"snapshot": snapshot}
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise RuntimeError(f"--since expects a manifest path or ISO timestamp, got {value!r}") from exc
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return {"timestamp": since.isoformat()}
+
+
+def check_change_log(session, since: Dict[str, str]) -> None:
+    """Refuse deltas the change log can no longer answer exactly."""
+
+    exists = session.execute(
+        text("SELECT to_regclass(:reg) IS NOT NULL"), {"reg": f"public.{CHANGE_LOG_TABLE}"}
+    ).scalar()
+    if not exists:
+        raise RuntimeError(f"{CHANGE_LOG_TABLE} is missing; apply migrations first.")
+    pruned = session.execute(
+        text(
+            f"SELECT max(txid), max(changed_at) FROM {CHANGE_LOG_TABLE} "
+            "WHERE operation = 'PRUNE'"
+        )
+    ).one()
+    if pruned[0] is None:
+        return
+    if "snapshot" in since:
+        stale = session.execute(
+            text("SELECT pg_snapshot_xmin(CAST(:snapshot AS pg_snapshot))::text::bigint < :txid"),
+            {"snapshot": since["snapshot"], "txid": pruned[0]},
+        ).scalar()
+    else:
+        stale = datetime.fromisoformat(since["timestamp"]) < pruned[1]
+    if stale:
+        raise RuntimeError(
+            "The change log was pruned after that point; take a full export instead."
+        )
+
+
+def _since_clause(cursor, since: Dict[str, str]) -> str:
+    if "snapshot" in since:
+        # Transactions the earlier snapshot could not see; anything below its
+        # xmin was already visible, which keeps the txid index usable.
+        return cursor.mogrify(
+            "txid >= pg_snapshot_xmin(CAST(%(s)s AS pg_snapshot))::text::bigint "
+            "AND NOT pg_visible_in_snapshot(txid::text::xid8, CAST(%(s)s AS pg_snapshot))",
+            {"s": since["snapshot"]},
+        ).decode()
+    return cursor.mogrify("changed_at >= %(t)s", {"t": since["timestamp"]}).decode()
+
+
+def export_delta(
+    session,
+    folder: str,
+    tables: Dict[str, List[str]],
+    since: Dict[str, str],
+    compression: str,
+) -> Dict[str, Dict[str, object]]:
+    """Write changed rows and tombstones for each table since ``since``.
+
+    Everything is read in one REPEATABLE READ transaction, so rows and
+    tombstones agree with each other and with the snapshot recorded in the
+    delta's manifest.
+    """
+
+    cursor = session.connection().connection.cursor()
+    since_clause = _since_clause(cursor, since)
+    entries: Dict[str, Dict[str, object]] = {}
+    for table, columns in tables.items():
+        keys = [column.name for column in MODEL_MAP[table].__table__.primary_key]
+        table_filter = cursor.mogrify("table_name = %s", (table,)).decode()
+        changed = (
+            f"SELECT DISTINCT row_key::jsonb AS k FROM {CHANGE_LOG_TABLE} "
+            f"WHERE {table_filter} AND row_key IS NOT NULL AND {since_clause}"
+        )
+        key_values = {key: f"CAST(c.k ->> '{key}' AS bigint)" for key in keys}
+        matches = " AND ".join(f't."{key}" = {value}' for key, value in key_values.items())
+        column_list = ", ".join(f't."{column}"' for column in columns)
+        order_clause = ", ".join(f't."{key}"' for key in keys)
+
+        truncated = session.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {CHANGE_LOG_TABLE} "
+                f"WHERE {table_filter} AND operation = 'TRUNCATE' AND {since_clause})"
+            )
+        ).scalar()
+
+        # After a TRUNCATE (a re-seed) the importer empties the table, so
+        # every current row is sent; re-seeds need not log row by row.
+        source = f'"{table}" t' if truncated else f'"{table}" t JOIN ({changed}) c ON {matches}'
+        upsert_path = table_path(folder, table, compression)
+        with ExportSink(upsert_path, compression) as sink:
+            cursor.copy_expert(
+                f"COPY (SELECT {column_list} FROM {source} ORDER BY {order_clause}) "
+                "TO STDOUT WITH (FORMAT csv, HEADER)",
+                sink,
+                size=COPY_BUFFER_SIZE,
+            )
+        entry = manifest_entry(sink, cursor.rowcount)
+
+        deleted_path = table_path(folder, f"{table}.deleted", compression)
+        key_list = ", ".join(f'{value} AS "{key}"' for key, value in key_values.items())
+        with ExportSink(deleted_path, compression) as sink:
+            cursor.copy_expert(
+                f"COPY (SELECT {key_list} FROM ({changed}) c "
+                f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" t WHERE {matches}) '
+                f"ORDER BY {', '.join(key_values.values())}) "
+                "TO STDOUT WITH (FORMAT csv, HEADER)",
+                sink,
+                size=COPY_BUFFER_SIZE,
+            )
+        entry["deleted"] = manifest_entry(sink, cursor.rowcount)
+        entry["truncated"] = bool(truncated)
+        entries[table] = entry
+        print(
+            f"Exported {table} delta -> {upsert_path}: {entry['rows']} changed, "
+            f"{entry['deleted']['rows']} deleted{', truncated' if truncated else ''}"
+        )
+    return entries
+
+
+def prune_change_log(session, snapshot: str) -> int:
+    """Delete change-log rows every export from now on has already seen.
+
+    Leaves a ``PRUNE`` marker so ``--since`` an older point fails loudly
+    instead of silently missing changes.
+    """
+
+    horizon = session.execute(
+        text("SELECT pg_snapshot_xmin(CAST(:snapshot AS pg_snapshot))::text::bigint"),
+        {"snapshot": snapshot},
+    ).scalar_one()
+    deleted = session.execute(
+        text(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE txid < :horizon"), {"horizon": horizon}
+    ).rowcount
+    session.execute(
+        text(
+            f"INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_key, operation, txid) "
+            "VALUES ('*', NULL, 'PRUNE', :horizon)"
+        ),
+        {"horizon": horizon},
+    )
+    session.commit()
+    return deleted
+
+
+def write_manifest(
+    folder: str,
+    entries: Dict[str, Dict[str, object]],
+    compression: str,
+    snapshot_consistent: bool,
+    export_format: str = "csv",
+    **extra: object,
+) -> str:
+    manifest = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "format": export_format,
+        "compression": compression,
+        "snapshot_consistent": snapshot_consistent,
+        "tables": entries,
+        **extra,
+    }
+    file_path = os.path.join(folder, MANIFEST_NAME)
+    with open(file_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+    return file_path
+
+
+def arrow_type(pa, column):
+    """Map a SQLAlchemy column to the Arrow type stored in Parquet."""
+
+    if column is None:
+        return pa.string()
+    column_type = column.type
+    if isinstance(column_type, JSON):
+        # Parquet has no JSON logical type in Arrow; keep canonical JSON text.
+        return pa.string()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Numeric):
+        if column_type.precision is None:
+            return pa.float64()
+        return pa.decimal128(column_type.precision, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(pa, table: str, columns: List[str]):
+    model_columns = MODEL_MAP[table].__table__.columns
+    return pa.schema(
+        [pa.field(name, arrow_type(pa, model_columns.get(name))) for name in columns]
+    )
+
+
+def export_table_parquet(
+    connection, folder: str, table: str, columns: List[str], compression: str
+) -> Dict[str, object]:
+    """Write ``table`` to ``<table>.parquet`` one record batch at a time.
+
+    ``connection`` may be a Session or a Connection. The query goes through
+    a server-side cursor, so only one batch of rows is held in memory.
+    """
+
+    pa = load_pyarrow()
+    schema = arrow_schema(pa, table, columns)
+    json_fields = set(JSON_FIELDS.get(table, []))
+    order_clause = ' ORDER BY "id"' if "id" in columns else ""
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    result = connection.execute(
+        text(f'SELECT {column_list} FROM "{table}"{order_clause}'),
+        execution_options={"yield_per": PARQUET_BATCH_ROWS},
+    )
+
+    file_path = os.path.join(folder, f"{table}.parquet")
+    started = time.perf_counter()
+    rows = 0
+    with pa.parquet.ParquetWriter(
+        file_path, schema, compression=PARQUET_CODECS[compression]
+    ) as writer:
+        for partition in result.partitions():
+            arrays = []
+            for name, field, values in zip(columns, schema, zip(*partition)):
+                if name in json_fields:
+                    values = [
+                        None
+                        if value is None
+                        else json.dumps(value, ensure_ascii=False, sort_keys=True)
+                        for value in values
+                    ]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            rows += len(partition)
+
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else float(rows)
+    print(f"Exported {table} -> {file_path}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return {
+        "file": os.path.basename(file_path),
+        "rows": rows,
+        "bytes": os.path.getsize(file_path),
+        "sha256": file_sha256(file_path),
+    }
+
+
+def parquet_table(
+    engine, snapshot: str, folder: str, table: str, columns: List[str], compression: str
+) -> Dict[str, object]:
+    """``export_table_parquet`` on its own connection, inside ``snapshot``."""
+
+    with engine.connect().execution_options(isolation_level="REPEATABLE READ") as connection:
+        connection.execute(text("SET TRANSACTION READ ONLY"))
+        connection.execute(text("SET TRANSACTION SNAPSHOT :snapshot"), {"snapshot": snapshot})
+        return export_table_parquet(connection, folder, table, columns, compression)
 
 
 def filter_tables(ordered: Iterable[str]) -> List[str]:
@@ -71,8 +556,50 @@ def main() -> int:
     group.add_argument("--production", action="store_true", help="Write to production_data")
     group.add_argument("--test", action="store_true", help="Write to test_data")
     parser.add_argument("--output-dir", help="Custom output directory (overrides --production/--test)")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="COPY tables concurrently from one consistent snapshot (implies --manifest)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=4, help="Tables exported concurrently with --fast"
+    )
+    parser.add_argument(
+        "--compress",
+        choices=sorted(COMPRESSION_SUFFIXES),
+        default="none",
+        help="Compress each CSV (zstd needs the 'zstandard' package); Parquet codec with --format parquet",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv", "parquet"),
+        default="csv",
+        dest="export_format",
+        help="Output file format (parquet needs the 'pyarrow' package)",
+    )
+    parser.add_argument(
+        "--manifest",
+        action="store_true",
+        help=f"Write {MANIFEST_NAME} with row counts and SHA-256 checksums",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="MANIFEST|TIMESTAMP",
+        help="Only export rows changed or deleted since an earlier export's manifest "
+        "(exact) or an ISO timestamp; requires --output-dir",
+    )
+    parser.add_argument(
+        "--prune-changes",
+        action="store_true",
+        help=f"After exporting, delete {CHANGE_LOG_TABLE} rows this export already covers",
+    )
     args = parser.parse_args()
 
+    if args.since and not args.output_dir:
+        parser.error("--since requires --output-dir so deltas never overwrite full exports")
+    if args.since and args.export_format != "csv":
+        parser.error("--since only supports --format csv")
+
     if args.output_dir:
         target_dir = os.path.abspath(args.output_dir)
     elif args.test:
@@ -81,8 +608,13 @@ def main() -> int:
         # Default to production exports when no flags are supplied.
         target_dir = os.path.join(BASE_DIR, "production_data")
 
+    since = load_since(args.since) if args.since else None
+    if since and os.path.abspath(args.since) in (target_dir, os.path.join(target_dir, MANIFEST_NAME)):
+        parser.error("--output-dir must differ from the export named by --since")
+
     ensure_directory(target_dir)
 
+    started = time.perf_counter()
     session = SessionLocal()
     try:
         ordered_tables = get_table_order(session)
@@ -94,16 +626,75 @@ def main() -> int:
             raise RuntimeError("No exportable tables discovered.")
 
         inspector = inspect(session.bind)
+        table_columns: Dict[str, List[str]] = {}
         for table in tables:
             columns = [col["name"] for col in inspector.get_columns(table)]
             if not columns:
                 print(f"No columns reported for {table}; skipping")
                 continue
-            export_table(session, target_dir, table, columns)
+            table_columns[table] = columns
+        # Release the catalog queries' transaction so --fast starts a fresh
+        # REPEATABLE READ one for its snapshot.
+        session.commit()
+
+        if since:
+            check_change_log(session, since)
+            session.commit()
+            session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            session.execute(text("SET TRANSACTION READ ONLY"))
+            snapshot = current_snapshot(session)
+            entries = export_delta(session, target_dir, table_columns, since, args.compress)
+        elif args.fast:
+            entries = export_tables_fast(
+                session,
+                target_dir,
+                table_columns,
+                args.compress,
+                max(1, args.jobs),
+                args.export_format,
+            )
+            snapshot = current_snapshot(session)
+        elif args.export_format == "parquet":
+            # Taken before reading: later changes may also be exported, which
+            # the next delta simply re-applies.
+            snapshot = current_snapshot(session)
+            entries = {
+                table: export_table_parquet(session, target_dir, table, columns, args.compress)
+                for table, columns in table_columns.items()
+            }
+        else:
+            snapshot = current_snapshot(session)
+            entries = {
+                table: export_table(session, target_dir, table, columns, args.compress)
+                for table, columns in table_columns.items()
+            }
+        session.commit()
+
+        if args.prune_changes:
+            pruned = prune_change_log(session, snapshot)
+            print(f"Pruned {pruned} {CHANGE_LOG_TABLE} row(s) covered by this export.")
     finally:
         session.close()
 
-    print(f"CSV export complete. Files written to {target_dir}.")
+    if args.fast or args.manifest or args.since:
+        manifest_path = write_manifest(
+            target_dir,
+            entries,
+            args.compress,
+            bool(args.fast or args.since),
+            args.export_format,
+            kind="delta" if args.since else "full",
+            snapshot=snapshot,
+            **({"since": since} if since else {}),
+        )
+        print(f"Manifest written to {manifest_path}")
+
+    total_rows = sum(entry["rows"] for entry in entries.values())
+    elapsed = time.perf_counter() - started
+    print(
+        f"{args.export_format.upper()} export complete: {total_rows} rows in {elapsed:.2f}s. "
+        f"Files written to {target_dir}."
+    )
     return 0
 
 
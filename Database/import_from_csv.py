@@ -2,9 +2,13 @@
 
 import argparse
 import csv
+import gzip
+import hashlib
+import io
 import json
 import os
 import sys
+import time
 from collections import defaultdict, deque
 from pathlib import Path
 
@@ -27,6 +31,8 @@ from Backend.models import (
     PossibleFoodTag,
     Plan,
 )
+from Backend.services.food_nutrition import rebuild_food_totals
+from Backend.services.plan_index import rebuild_plan_items
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -88,7 +94,17 @@ def get_table_order(session):
     return ordered
 
 
+# Trigger-maintained log of catalog writes; it must survive a re-seed so that
+# deltas taken against an earlier export still see the TRUNCATE markers.
+CHANGE_LOG_TABLE = "catalog_changes"
+
+# Tables a re-seed must leave alone: the change log above, and the offline FDC
+# index loaded by ``import_usda_fdc.py``, which catalog exports never contain.
+PRESERVED_TABLES = frozenset({CHANGE_LOG_TABLE, "usda_foods", "usda_food_terms"})
+
+
 def wipe_data(session, ordered_tables):
+    ordered_tables = [t for t in ordered_tables if t not in PRESERVED_TABLES]
     if not ordered_tables:
         # Nothing to wipe; avoid emitting invalid TRUNCATE SQL
         print("🧹 No tables detected; skipping wipe.")
@@ -120,12 +136,44 @@ MODEL_MAP = {
 }
 
 
+# Suffixes written by ``export_to_csv.py --compress``, in lookup order.
+CSV_SUFFIXES = (".csv", ".csv.gz", ".csv.zst")
+
+
+def find_table_csv(folder, table):
+    """Return the path of ``table``'s (possibly compressed) CSV, or None."""
+
+    for suffix in CSV_SUFFIXES:
+        file_path = os.path.join(folder, f"{table}{suffix}")
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+
+def open_csv_text(file_path):
+    """Open a plain, gzip or zstd CSV for text reading."""
+
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt", encoding="utf-8", newline="")
+    if file_path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                f"Reading {file_path} requires the 'zstandard' package."
+            ) from exc
+        raw = open(file_path, "rb")
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    return open(file_path, "r", encoding="utf-8", newline="")
+
+
 def import_csv(session, folder, ordered_tables):
     for table in ordered_tables:
-        file_path = os.path.join(folder, f"{table}.csv")
-        if os.path.exists(file_path):
+        file_path = find_table_csv(folder, table)
+        if file_path:
             print(f"Importing {file_path}...")
-            with open(file_path, "r", encoding="utf-8") as f:
+            with open_csv_text(file_path) as f:
                 reader = csv.DictReader(f)
                 model = MODEL_MAP.get(table)
                 if model is None:
@@ -163,6 +211,434 @@ def import_csv(session, folder, ordered_tables):
             print(f"No CSV found for {table}")
 
 
+class CsvCopyStream:
+    """File-like reader feeding ``COPY ... FROM STDIN`` from a CSV file.
+
+    Rows are coerced as they are read (ids validated as integers, JSON fields
+    parsed and re-serialised) and re-emitted as CSV in chunks, so a table is
+    never held in memory. Empty fields become NULL, matching how
+    ``export_to_csv.py`` writes ``None``.
+    """
+
+    def __init__(self, reader, table, columns):
+        self._reader = reader
+        self._table = table
+        self._columns = columns
+        self._json_fields = set(JSON_FIELDS.get(table, []))
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.rows = 0
+
+    def _coerce(self, row):
+        values = []
+        for column in self._columns:
+            value = row.get(column)
+            if value in (None, ""):
+                values.append("")
+                continue
+            if column == "id":
+                try:
+                    value = int(value)
+                except (TypeError, ValueError) as exc:
+                    raise RuntimeError(
+                        f"Invalid id {value!r} in {self._table}.csv line {self._reader.line_num}"
+                    ) from exc
+            elif column in self._json_fields:
+                try:
+                    value = json.dumps(json.loads(value), ensure_ascii=False)
+                except json.JSONDecodeError as exc:
+                    raise RuntimeError(
+                        f"Failed decoding JSON for {self._table}.{column}: {exc}"
+                    ) from exc
+            values.append(value)
+        return values
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            row = next(self._reader, None)
+            if row is None:
+                break
+            self._writer.writerow(self._coerce(row))
+            self.rows += 1
+            if self._buffer.tell() >= max(size, 1 << 16):
+                break
+        self._pending += self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if size < 0:
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def get_table_columns(session, table):
+    result = session.execute(
+        text(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = :tbl
+            """
+        ),
+        {"tbl": table},
+    )
+    return {r[0] for r in result}
+
+
+def get_secondary_indexes(session, table):
+    """Return ``(name, definition)`` of indexes not backing a constraint."""
+
+    result = session.execute(
+        text(
+            """
+            SELECT i.relname, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'public'
+              AND t.relname = :tbl
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid
+              )
+            """
+        ),
+        {"tbl": table},
+    )
+    return [(r[0], r[1]) for r in result]
+
+
+def suspend_change_log(session, table):
+    """Stop per-row change logging on ``table`` for the current transaction.
+
+    A TRUNCATE marker is logged in the same transaction instead, which makes
+    delta exports send the whole table once the load commits. Returns the
+    trigger to hand to ``resume_change_log`` (None when there is no log).
+    """
+    trigger = session.execute(
+        text(
+            """
+            SELECT tgname
+            FROM pg_trigger
+            WHERE tgrelid = to_regclass(:reg) AND tgname = :name AND NOT tgisinternal
+            """
+        ),
+        {"reg": f"public.{table}", "name": f"{table}_record_change"},
+    ).scalar()
+    if trigger:
+        session.execute(text(f'ALTER TABLE "{table}" DISABLE TRIGGER "{trigger}"'))
+        session.execute(
+            text(
+                f"INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_key, operation, txid) "
+                "VALUES (:tbl, NULL, 'TRUNCATE', pg_current_xact_id()::text::bigint)"
+            ),
+            {"tbl": table},
+        )
+    return trigger
+
+
+def resume_change_log(session, table, trigger):
+    if trigger:
+        session.execute(text(f'ALTER TABLE "{table}" ENABLE TRIGGER "{trigger}"'))
+
+
+def import_csv_fast(session, folder, ordered_tables):
+    """Stream each CSV into PostgreSQL with COPY inside a single transaction.
+
+    Deferrable constraints are deferred to commit, and secondary indexes are
+    dropped before a table is loaded and rebuilt once its rows are in, which
+    is much cheaper than maintaining them row by row. Primary-key, unique and
+    foreign-key constraints stay in place; tables are loaded in dependency
+    order so foreign keys are always satisfied.
+    """
+    session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+    cursor = session.connection().connection.cursor()
+    total_rows = 0
+    started = time.perf_counter()
+    for table in ordered_tables:
+        file_path = find_table_csv(folder, table)
+        if not file_path:
+            print(f"No CSV found for {table}")
+            continue
+        if table not in MODEL_MAP:
+            print(f"No model found for {table}")
+            continue
+        with open_csv_text(file_path) as f:
+            reader = csv.DictReader(f)
+            columns = list(reader.fieldnames or [])
+            unknown = sorted(set(columns) - get_table_columns(session, table))
+            if unknown:
+                raise RuntimeError(
+                    f"{file_path} has columns missing from {table}: {', '.join(unknown)}"
+                )
+            if not columns:
+                print(f"Skipping empty {file_path}")
+                continue
+
+            indexes = get_secondary_indexes(session, table)
+            for name, _ in indexes:
+                session.execute(text(f'DROP INDEX "{name}"'))
+            trigger = suspend_change_log(session, table)
+
+            table_started = time.perf_counter()
+            stream = CsvCopyStream(reader, table, columns)
+            column_list = ", ".join(f'"{column}"' for column in columns)
+            try:
+                cursor.copy_expert(
+                    f'COPY "{table}" ({column_list}) FROM STDIN WITH (FORMAT csv)',
+                    stream,
+                    size=1 << 16,
+                )
+            except Exception as e:
+                session.rollback()
+                raise RuntimeError(f"Failed importing {table}: {e}") from e
+
+            for _, definition in indexes:
+                session.execute(text(definition))
+            resume_change_log(session, table, trigger)
+            elapsed = time.perf_counter() - table_started
+            rate = stream.rows / elapsed if elapsed > 0 else float(stream.rows)
+            print(
+                f"Imported {table}: {stream.rows} rows in {elapsed:.2f}s "
+                f"({rate:,.0f} rows/s, {len(indexes)} index(es) rebuilt)"
+            )
+            total_rows += stream.rows
+    session.commit()
+    elapsed = time.perf_counter() - started
+    rate = total_rows / elapsed if elapsed > 0 else float(total_rows)
+    print(f"COPY import: {total_rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+PARQUET_BATCH_ROWS = 50_000
+
+
+def load_pyarrow():
+    """Import pyarrow lazily; it is only needed for ``--format parquet``."""
+
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError("Parquet support requires the 'pyarrow' package.") from exc
+    return pyarrow
+
+
+class ParquetCopyStream:
+    """File-like reader feeding ``COPY ... FROM STDIN`` from Parquet batches.
+
+    Each record batch is encoded to CSV by Arrow itself, so typed values go
+    straight from the file to PostgreSQL without per-row Python work.
+    """
+
+    def __init__(self, batches):
+        self._pa = load_pyarrow()
+        self._batches = batches
+        self._pending = b""
+        self.rows = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            batch = next(self._batches, None)
+            if batch is None:
+                break
+            buffer = io.BytesIO()
+            self._pa.csv.write_csv(
+                batch,
+                buffer,
+                write_options=self._pa.csv.WriteOptions(
+                    include_header=False, quoting_style="needed"
+                ),
+            )
+            self._pending += buffer.getvalue()
+            self.rows += batch.num_rows
+        if size < 0:
+            chunk, self._pending = self._pending, b""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def import_parquet(session, folder, ordered_tables, *, fast=False):
+    """Load ``<table>.parquet`` files written by ``export_to_csv.py --format parquet``.
+
+    Files are read one record batch at a time. Values keep their Parquet
+    types (decimals, timestamps, integers), so nothing is re-parsed from
+    strings; JSON columns are stored as JSON text and decoded here. With
+    ``fast`` the batches are streamed through COPY like ``import_csv_fast``.
+    """
+    pa = load_pyarrow()
+    if fast:
+        session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+        cursor = session.connection().connection.cursor()
+    total_rows = 0
+    started = time.perf_counter()
+    for table in ordered_tables:
+        file_path = os.path.join(folder, f"{table}.parquet")
+        if not os.path.exists(file_path):
+            print(f"No Parquet file found for {table}")
+            continue
+        model = MODEL_MAP.get(table)
+        if model is None:
+            print(f"No model found for {table}")
+            continue
+        parquet_file = pa.parquet.ParquetFile(file_path)
+        columns = parquet_file.schema_arrow.names
+        unknown = sorted(set(columns) - get_table_columns(session, table))
+        if unknown:
+            raise RuntimeError(
+                f"{file_path} has columns missing from {table}: {', '.join(unknown)}"
+            )
+
+        table_started = time.perf_counter()
+        batches = parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS)
+        try:
+            if fast:
+                indexes = get_secondary_indexes(session, table)
+                for name, _ in indexes:
+                    session.execute(text(f'DROP INDEX "{name}"'))
+                trigger = suspend_change_log(session, table)
+                stream = ParquetCopyStream(batches)
+                column_list = ", ".join(f'"{column}"' for column in columns)
+                cursor.copy_expert(
+                    f'COPY "{table}" ({column_list}) FROM STDIN WITH (FORMAT csv)',
+                    stream,
+                    size=1 << 16,
+                )
+                for _, definition in indexes:
+                    session.execute(text(definition))
+                resume_change_log(session, table, trigger)
+                rows = stream.rows
+            else:
+                json_fields = [f for f in JSON_FIELDS.get(table, []) if f in columns]
+                rows = 0
+                for batch in batches:
+                    records = batch.to_pylist()
+                    for record in records:
+                        for field in json_fields:
+                            if record[field] is not None:
+                                record[field] = json.loads(record[field])
+                    session.execute(model.__table__.insert(), records)
+                    rows += len(records)
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            raise RuntimeError(f"Failed importing {table}: {e}") from e
+
+        elapsed = time.perf_counter() - table_started
+        rate = rows / elapsed if elapsed > 0 else float(rows)
+        print(f"Imported {table}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+        total_rows += rows
+    session.commit()
+    elapsed = time.perf_counter() - started
+    rate = total_rows / elapsed if elapsed > 0 else float(total_rows)
+    print(f"Parquet import: {total_rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+def verify_manifest_files(folder, manifest):
+    """Check every file listed in a manifest against its SHA-256."""
+
+    for table, entry in manifest.get("tables", {}).items():
+        for item in (entry, entry.get("deleted")):
+            if not item:
+                continue
+            digest = hashlib.sha256()
+            with open(os.path.join(folder, item["file"]), "rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b""):
+                    digest.update(chunk)
+            if digest.hexdigest() != item["sha256"]:
+                raise RuntimeError(f"Checksum mismatch for {item['file']} ({table}).")
+
+
+def _column_list(columns):
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def _copy_into_temp(session, cursor, folder, file_name, table, temp, columns=None):
+    """COPY a delta file into an empty temp table shaped like ``table``.
+
+    Only ``columns`` are kept when given (tombstones carry just the key).
+    Returns the CSV header.
+    """
+    selected = _column_list(columns) if columns else "*"
+    session.execute(
+        text(f'CREATE TEMP TABLE "{temp}" AS SELECT {selected} FROM "{table}" WITH NO DATA')
+    )
+    with open_csv_text(os.path.join(folder, file_name)) as handle:
+        header = next(csv.reader([handle.readline()]), [])
+        cursor.copy_expert(
+            f'COPY "{temp}" ({_column_list(header)}) FROM STDIN WITH (FORMAT csv)',
+            handle,
+            size=1 << 16,
+        )
+    return header
+
+
+def import_delta(session, folder, ordered_tables):
+    """Apply a delta written by ``export_to_csv.py --since`` idempotently.
+
+    Deletions (tombstones and truncations) run child tables first, then
+    changed rows are upserted parents first with ``INSERT ... ON CONFLICT``
+    on the primary key, all in one transaction. Re-applying the same delta
+    leaves the database unchanged.
+    """
+    with open(os.path.join(folder, "manifest.json"), "r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if manifest.get("kind") != "delta":
+        raise RuntimeError(f"{folder} does not contain a delta export manifest.")
+    verify_manifest_files(folder, manifest)
+    entries = manifest["tables"]
+    tables = [t for t in ordered_tables if t in entries and t in MODEL_MAP]
+
+    session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+    cursor = session.connection().connection.cursor()
+    try:
+        for table in reversed(tables):
+            entry = entries[table]
+            keys = [column.name for column in MODEL_MAP[table].__table__.primary_key]
+            if entry.get("truncated"):
+                session.execute(text(f'DELETE FROM "{table}"'))
+            deleted = entry.get("deleted")
+            if not deleted or not deleted["rows"]:
+                continue
+            _copy_into_temp(session, cursor, folder, deleted["file"], table, "delta_keys", keys)
+            matches = " AND ".join(f't."{key}" = d."{key}"' for key in keys)
+            removed = session.execute(
+                text(f'DELETE FROM "{table}" t USING delta_keys d WHERE {matches}')
+            ).rowcount
+            session.execute(text("DROP TABLE delta_keys"))
+            print(f"Deleted {removed} {table} row(s)")
+
+        for table in tables:
+            entry = entries[table]
+            if not entry["rows"]:
+                continue
+            keys = [column.name for column in MODEL_MAP[table].__table__.primary_key]
+            columns = _copy_into_temp(session, cursor, folder, entry["file"], table, "delta_rows")
+            column_list = _column_list(columns)
+            updates = [c for c in columns if c not in keys]
+            conflict = (
+                "DO UPDATE SET " + ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in updates)
+                if updates
+                else "DO NOTHING"
+            )
+            upserted = session.execute(
+                text(
+                    f'INSERT INTO "{table}" ({column_list}) '
+                    f"SELECT {column_list} FROM delta_rows "
+                    f"ON CONFLICT ({_column_list(keys)}) {conflict}"
+                )
+            ).rowcount
+            session.execute(text("DROP TABLE delta_rows"))
+            print(f"Upserted {upserted} {table} row(s)")
+    except Exception as e:
+        session.rollback()
+        raise RuntimeError(f"Failed applying delta from {folder}: {e}") from e
+    session.commit()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Import CSVs into PostgreSQL.")
     group = parser.add_mutually_exclusive_group(required=True)
@@ -172,13 +648,32 @@ def main():
     group.add_argument(
         "--test", action="store_true", help="Use test CSV files (e.g., table_test.csv)"
     )
-    args = parser.parse_args()
-
-    data_dir = os.path.join(
-        BASE_DIR, "production_data" if args.production else "test_data"
+    group.add_argument(
+        "--delta",
+        metavar="DIR",
+        help="Apply a delta written by export_to_csv.py --since (no wipe)",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Stream CSVs with PostgreSQL COPY instead of ORM inserts",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv", "parquet"),
+        default="csv",
+        help="Input file format (parquet needs the 'pyarrow' package)",
     )
+    args = parser.parse_args()
 
-    mode = "PRODUCTION" if args.production else "TEST"
+    if args.delta:
+        data_dir = os.path.abspath(args.delta)
+        mode = "DELTA"
+    else:
+        data_dir = os.path.join(
+            BASE_DIR, "production_data" if args.production else "test_data"
+        )
+        mode = "PRODUCTION" if args.production else "TEST"
     print(f"Running in {mode} mode — reading from: {data_dir}")
 
     if not os.path.exists(data_dir):
@@ -264,8 +759,23 @@ def main():
 
         print(f"Load order: {ordered_tables}")
 
-        wipe_data(session, ordered_tables)
-        import_csv(session, data_dir, ordered_tables)
+        if args.delta:
+            import_delta(session, data_dir, ordered_tables)
+        elif args.format == "parquet":
+            wipe_data(session, ordered_tables)
+            import_parquet(session, data_dir, ordered_tables, fast=args.fast)
+        elif args.fast:
+            wipe_data(session, ordered_tables)
+            import_csv_fast(session, data_dir, ordered_tables)
+        else:
+            wipe_data(session, ordered_tables)
+            import_csv(session, data_dir, ordered_tables)
+
+        # Totals and plan items are derived rather than exported; recompute them.
+        if "food_nutrition_totals" in ordered_tables:
+            print(f"Rebuilt nutrition totals for {rebuild_food_totals(session)} foods")
+        if "plan_items" in ordered_tables:
+            print(f"Indexed {rebuild_plan_items(session)} plan items")
 
         # Reset sequences only for tables that actually have an `id` column
         for table in ordered_tables:
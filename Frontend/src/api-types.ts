@@ -13,7 +13,12 @@ export interface paths {
         };
         /**
          * Get All Ingredients
-         * @description Return all ingredients.
+         * @description Return ingredients ordered by name, optionally filtered and paginated.
+         *
+         *     When ``limit`` is provided only one page is loaded. Pages are keyed on
+         *     ``(name, id)``; pass the ``X-Next-Cursor`` response header back as
+         *     ``after`` to fetch the following page. The header is omitted on the last
+         *     page.
          */
         get: operations["get_all_ingredients_api_ingredients__get"];
         put?: never;
@@ -85,6 +90,52 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/ingredients/{ingredient_id}/dependents": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Ingredient Dependents
+         * @description Return the foods, saved plans and open stored food using an ingredient.
+         */
+        get: operations["get_ingredient_dependents_api_ingredients__ingredient_id__dependents_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/ingredients:bulk": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Add Ingredients Bulk
+         * @description Create many ingredients in one transaction with per-item results.
+         *
+         *     Items are deduplicated exactly like ``POST /ingredients``: an existing
+         *     source mapping or an ingredient with the same name is returned as
+         *     ``existing`` (gaining the item's source mapping in the latter case).
+         *     Items that fail validation are reported as ``error`` without affecting
+         *     the rest of the batch.
+         */
+        post: operations["add_ingredients_bulk_api_ingredients_bulk_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/foods/": {
         parameters: {
             query?: never;
@@ -94,7 +145,10 @@ export interface paths {
         };
         /**
          * Get All Foods
-         * @description Return all foods.
+         * @description Return all foods, optionally filtered and sorted by per-portion macros.
+         *
+         *     Macro bounds are inclusive and evaluated in SQL against the stored
+         *     ``food_nutrition_totals``, e.g. ``max_calories=400&min_protein=30``.
          */
         get: operations["get_all_foods_api_foods__get"];
         put?: never;
@@ -147,7 +201,9 @@ export interface paths {
         get: operations["get_food_api_foods__food_id__get"];
         /**
          * Update Food
-         * @description Update an existing food.
+         * @description Replace a food's name, ingredient lines and tags.
+         *
+         *     Only the ingredient lines that differ from the stored ones are written.
          */
         put: operations["update_food_api_foods__food_id__put"];
         post?: never;
@@ -158,7 +214,14 @@ export interface paths {
         delete: operations["delete_food_api_foods__food_id__delete"];
         options?: never;
         head?: never;
-        patch?: never;
+        /**
+         * Patch Food
+         * @description Apply a partial update: only the given fields and ingredient lines change.
+         *
+         *     ``ingredients`` adds or updates lines by ``ingredient_id`` and
+         *     ``remove_ingredient_ids`` deletes lines; other lines are left untouched.
+         */
+        patch: operations["patch_food_api_foods__food_id__patch"];
         trace?: never;
     };
     "/api/plans/": {
@@ -185,6 +248,46 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/plans/shopping-list": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Build Inline Shopping List
+         * @description Aggregate the shopping list for an unsaved plan payload.
+         */
+        post: operations["build_inline_shopping_list_api_plans_shopping_list_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/plans/evaluation": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Evaluate Inline Plan
+         * @description Evaluate the macros of an unsaved plan payload.
+         */
+        post: operations["evaluate_inline_plan_api_plans_evaluation_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/plans/{plan_id}": {
         parameters: {
             query?: never;
@@ -213,6 +316,49 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/plans/{plan_id}/evaluation": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Evaluate Stored Plan
+         * @description Return per-item, total and per-day macros of a stored plan.
+         */
+        get: operations["evaluate_stored_plan_api_plans__plan_id__evaluation_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/plans/{plan_id}/shopping-list": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Build Plan Shopping List
+         * @description Aggregate the shopping list for a stored plan.
+         *
+         *     An inline ``payload`` in the request body takes precedence over the stored
+         *     one, which lets clients preview unsaved edits of an existing plan.
+         */
+        post: operations["build_plan_shopping_list_api_plans__plan_id__shopping_list_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/stored_food/": {
         parameters: {
             query?: never;
@@ -253,6 +399,12 @@ export interface paths {
         /**
          * Consume Stored Food
          * @description Consume portions from a stored food entry.
+         *
+         *     The portions are taken with a single conditional ``UPDATE ... RETURNING``
+         *     that only matches while enough portions remain, so concurrent consumers of
+         *     the same entry can neither over-consume nor lose each other's updates.
+         *     When ``log_date`` is given, a matching daily log entry is created in the
+         *     same transaction.
          */
         post: operations["consume_stored_food_api_stored_food__stored_food_id__consume_post"];
         delete?: never;
@@ -281,6 +433,58 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/logs/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * List Daily Logs Range
+         * @description Return a user's log entries between ``start`` and ``end`` inclusive.
+         */
+        get: operations["list_daily_logs_range_api_logs__get"];
+        put?: never;
+        /**
+         * Create Daily Log
+         * @description Persist a new daily log entry.
+         */
+        post: operations["create_daily_log_api_logs__post"];
+        /**
+         * Clear Daily Logs
+         * @description Remove daily log entries for a user, optionally filtered by day.
+         */
+        delete: operations["clear_daily_logs_api_logs__delete"];
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/logs/summary": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Summarize Daily Logs
+         * @description Return macro totals per day, week or month with entries in the range.
+         *
+         *     Reads the ``daily_log_totals`` rollup, so the cost grows with the number
+         *     of days in the range rather than the number of entries. Buckets without
+         *     entries are omitted.
+         */
+        get: operations["summarize_daily_logs_api_logs_summary_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/logs/{log_date}": {
         parameters: {
             query?: never;
@@ -301,7 +505,7 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
-    "/api/logs/": {
+    "/api/logs:batch": {
         parameters: {
             query?: never;
             header?: never;
@@ -311,15 +515,17 @@ export interface paths {
         get?: never;
         put?: never;
         /**
-         * Create Daily Log
-         * @description Persist a new daily log entry.
-         */
-        post: operations["create_daily_log_api_logs__post"];
-        /**
-         * Clear Daily Logs
-         * @description Remove daily log entries for a user, optionally filtered by day.
+         * Create Daily Logs Batch
+         * @description Persist several daily log entries at once, e.g. every item of a meal.
+         *
+         *     Referenced stored foods, ingredients and foods are checked with one query
+         *     per type and all entries are inserted in a single statement. The batch is
+         *     all-or-nothing: if any item references a missing row, nothing is written
+         *     and a 422 lists every failing item under ``["body", "items", index, field]``.
+         *     Entries are returned in request order.
          */
-        delete: operations["clear_daily_logs_api_logs__delete"];
+        post: operations["create_daily_logs_batch_api_logs_batch_post"];
+        delete?: never;
         options?: never;
         head?: never;
         patch?: never;
@@ -379,6 +585,50 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/usda/foods:batch": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Get Food Details Batch
+         * @description Fetch several foods at once through the upstream multi-food endpoint.
+         *
+         *     Cached ids are answered locally; the rest are requested in chunks of
+         *     ``_USDA_BATCH_CHUNK_SIZE`` concurrently. Ids that fail or that USDA does
+         *     not return are reported in ``errors`` instead of failing the whole batch.
+         */
+        post: operations["get_food_details_batch_api_usda_foods_batch_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/usda/cache/stats": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Cache Stats
+         * @description Report this worker's USDA cache hit/miss counters.
+         */
+        get: operations["get_cache_stats_api_usda_cache_stats_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/health/live": {
         parameters: {
             query?: never;
@@ -423,6 +673,14 @@ export interface paths {
 export type webhooks = Record<string, never>;
 export interface components {
     schemas: {
+        /**
+         * DailyLogEntryBatchCreate
+         * @description Batch of daily log entries to create in one request.
+         */
+        DailyLogEntryBatchCreate: {
+            /** Items */
+            items: components["schemas"]["DailyLogEntryCreate"][];
+        };
         /**
          * DailyLogEntryCreate
          * @description Schema for creating a new daily log entry.
@@ -492,6 +750,72 @@ export interface components {
              */
             created_at: string;
         };
+        /**
+         * DailyLogSummaryRead
+         * @description Macro totals of one user's log entries for a day, week or month.
+         */
+        DailyLogSummaryRead: {
+            /**
+             * Period Start
+             * Format: date
+             */
+            period_start: string;
+            /** Entry Count */
+            entry_count: number;
+            /** Calories */
+            calories: number;
+            /** Protein */
+            protein: number;
+            /** Carbohydrates */
+            carbohydrates: number;
+            /** Fat */
+            fat: number;
+            /** Fiber */
+            fiber: number;
+        };
+        /**
+         * DependentFood
+         * @description Food containing the ingredient.
+         */
+        DependentFood: {
+            /** Id */
+            id: number;
+            /** Name */
+            name: string;
+        };
+        /**
+         * DependentPlan
+         * @description Saved plan using the ingredient directly or through one of its foods.
+         */
+        DependentPlan: {
+            /** Id */
+            id: number;
+            /** Label */
+            label: string;
+            /**
+             * Direct
+             * @default false
+             */
+            direct: boolean;
+            /** Food Ids */
+            food_ids?: number[];
+        };
+        /**
+         * DependentStoredFood
+         * @description Open stored food item prepared from the ingredient or one of its foods.
+         */
+        DependentStoredFood: {
+            /** Id */
+            id: number;
+            /** User Id */
+            user_id: string;
+            /** Label */
+            label?: string | null;
+            /** Food Id */
+            food_id?: number | null;
+            /** Remaining Portions */
+            remaining_portions: number;
+        };
         /**
          * FoodCreate
          * @description Schema for creating a food.
@@ -531,21 +855,59 @@ export interface components {
             unit_quantity?: number | null;
         };
         /**
-         * FoodRead
-         * @description Schema for reading food data.
+         * FoodNutritionTotal
+         * @description Macros of one portion of a food, maintained whenever its inputs change.
+         *
+         *     Foods store their ingredient amounts per portion, so these are the sums of
+         *     ``unit_quantity * unit grams * nutrition`` over the food's ingredients.
          */
-        FoodRead: {
-            /** Id */
-            id: number;
-            /** Name */
-            name: string;
-            /** Ingredients */
-            ingredients?: components["schemas"]["FoodIngredient"][];
-            /** Tags */
-            tags?: components["schemas"]["PossibleFoodTag"][];
-        };
-        /**
-         * FoodUpdate
+        FoodNutritionTotal: {
+            /** Food Id */
+            food_id?: number | null;
+            /** Grams */
+            grams: number;
+            /** Calories */
+            calories: number;
+            /** Protein */
+            protein: number;
+            /** Carbohydrates */
+            carbohydrates: number;
+            /** Fat */
+            fat: number;
+            /** Fiber */
+            fiber: number;
+        };
+        /**
+         * FoodPatch
+         * @description Partial food update; omitted fields and ingredient lines are kept.
+         */
+        FoodPatch: {
+            /** Name */
+            name?: string | null;
+            /** Ingredients */
+            ingredients?: components["schemas"]["FoodIngredientCreate"][];
+            /** Remove Ingredient Ids */
+            remove_ingredient_ids?: number[];
+            /** Tags */
+            tags?: components["schemas"]["TagRef"][] | null;
+        };
+        /**
+         * FoodRead
+         * @description Schema for reading food data.
+         */
+        FoodRead: {
+            /** Id */
+            id: number;
+            /** Name */
+            name: string;
+            /** Ingredients */
+            ingredients?: components["schemas"]["FoodIngredient"][];
+            /** Tags */
+            tags?: components["schemas"]["PossibleFoodTag"][];
+            nutrition_total?: components["schemas"]["FoodNutritionTotal"] | null;
+        };
+        /**
+         * FoodUpdate
          * @description Schema for updating a food.
          */
         FoodUpdate: {
@@ -561,6 +923,38 @@ export interface components {
             /** Detail */
             detail?: components["schemas"]["ValidationError"][];
         };
+        /**
+         * IngredientBulkCreate
+         * @description Batch of ingredients to create in one request.
+         */
+        IngredientBulkCreate: {
+            /** Items */
+            items: components["schemas"]["IngredientCreate"][];
+        };
+        /**
+         * IngredientBulkRead
+         * @description Per-item results of a bulk ingredient create, in request order.
+         */
+        IngredientBulkRead: {
+            /** Results */
+            results?: components["schemas"]["IngredientBulkResult"][];
+        };
+        /**
+         * IngredientBulkResult
+         * @description Outcome of one item of a bulk ingredient create.
+         */
+        IngredientBulkResult: {
+            /** Index */
+            index: number;
+            /**
+             * Status
+             * @enum {string}
+             */
+            status: "created" | "existing" | "error";
+            ingredient?: components["schemas"]["IngredientRead"] | null;
+            /** Detail */
+            detail?: string | null;
+        };
         /**
          * IngredientCreate
          * @description Schema for creating an ingredient.
@@ -581,6 +975,20 @@ export interface components {
             shopping_unit_id?: number | null;
             shopping_unit?: components["schemas"]["IngredientShoppingUnitSelection"] | null;
         };
+        /**
+         * IngredientDependentsRead
+         * @description Everything whose nutrition depends on an ingredient.
+         */
+        IngredientDependentsRead: {
+            /** Ingredient Id */
+            ingredient_id: number;
+            /** Foods */
+            foods?: components["schemas"]["DependentFood"][];
+            /** Plans */
+            plans?: components["schemas"]["DependentPlan"][];
+            /** Stored Food */
+            stored_food?: components["schemas"]["DependentStoredFood"][];
+        };
         /**
          * IngredientRead
          * @description Schema for reading ingredient data.
@@ -719,6 +1127,83 @@ export interface components {
                 [key: string]: unknown;
             };
         };
+        /**
+         * PlanEvaluationRead
+         * @description Evaluated plan macros compared with the plan's per-day targets.
+         */
+        PlanEvaluationRead: {
+            /** Days */
+            days: number;
+            /** Items */
+            items?: components["schemas"]["PlanItemEvaluation"][];
+            total: components["schemas"]["PlanMacros"];
+            per_day: components["schemas"]["PlanMacros"];
+            target: components["schemas"]["PlanMacros"];
+            deviation: components["schemas"]["PlanMacros"];
+        };
+        /**
+         * PlanItemEvaluation
+         * @description Macros contributed by a single plan line, scaled by its portions.
+         */
+        PlanItemEvaluation: {
+            /** Index */
+            index: number;
+            /**
+             * Type
+             * @enum {string}
+             */
+            type: "food" | "ingredient";
+            /** Ref Id */
+            ref_id?: number | null;
+            /** Name */
+            name?: string | null;
+            /** Portions */
+            portions: number;
+            /** Available */
+            available: boolean;
+            macros: components["schemas"]["PlanMacros"];
+        };
+        /**
+         * PlanMacros
+         * @description Macro totals reported by the plan evaluator.
+         */
+        PlanMacros: {
+            /**
+             * Calories
+             * @default 0.0
+             */
+            calories: number;
+            /**
+             * Protein
+             * @default 0.0
+             */
+            protein: number;
+            /**
+             * Carbohydrates
+             * @default 0.0
+             */
+            carbohydrates: number;
+            /**
+             * Fat
+             * @default 0.0
+             */
+            fat: number;
+            /**
+             * Fiber
+             * @default 0.0
+             */
+            fiber: number;
+        };
+        /**
+         * PlanPayloadRequest
+         * @description Optional inline plan payload evaluated instead of a stored one.
+         */
+        PlanPayloadRequest: {
+            /** Payload */
+            payload?: {
+                [key: string]: unknown;
+            } | null;
+        };
         /**
          * PlanRead
          * @description Representation of a saved plan returned from the API.
@@ -775,6 +1260,58 @@ export interface components {
             /** Name */
             name: string;
         };
+        /**
+         * ShoppingListIssue
+         * @description Problem found while aggregating a plan into a shopping list.
+         */
+        ShoppingListIssue: {
+            /**
+             * Type
+             * @enum {string}
+             */
+            type: "missing-food" | "missing-ingredient" | "missing-unit" | "missing-quantity" | "missing-grams";
+            /** Message */
+            message: string;
+        };
+        /**
+         * ShoppingListItem
+         * @description Aggregated shopping list entry for one ingredient.
+         */
+        ShoppingListItem: {
+            /** Ingredient Id */
+            ingredient_id: number;
+            /** Name */
+            name: string;
+            /** Total Grams */
+            total_grams: number;
+            /** Unit Totals */
+            unit_totals?: components["schemas"]["ShoppingListUnitTotal"][];
+            preferred_unit_total?: components["schemas"]["ShoppingListUnitTotal"] | null;
+        };
+        /**
+         * ShoppingListRead
+         * @description Shopping list computed from a plan payload.
+         */
+        ShoppingListRead: {
+            /** Items */
+            items?: components["schemas"]["ShoppingListItem"][];
+            /** Issues */
+            issues?: components["schemas"]["ShoppingListIssue"][];
+        };
+        /**
+         * ShoppingListUnitTotal
+         * @description Quantity of an ingredient required in a single unit.
+         */
+        ShoppingListUnitTotal: {
+            /** Unit Id */
+            unit_id?: number | null;
+            /** Unit Name */
+            unit_name: string;
+            /** Quantity */
+            quantity: number;
+            /** Grams Per Unit */
+            grams_per_unit: number;
+        };
         /**
          * StoredFoodConsume
          * @description Payload for consuming stored food portions.
@@ -782,6 +1319,53 @@ export interface components {
         StoredFoodConsume: {
             /** Portions */
             portions: number;
+            /** Log Date */
+            log_date?: string | null;
+        };
+        /**
+         * StoredFoodConsumeRead
+         * @description Stored food after consumption, with the log entry created alongside it.
+         */
+        StoredFoodConsumeRead: {
+            /** Label */
+            label?: string | null;
+            /** User Id */
+            user_id: string;
+            /** Food Id */
+            food_id?: number | null;
+            /** Ingredient Id */
+            ingredient_id?: number | null;
+            /** Prepared Portions */
+            prepared_portions: number;
+            /** Per Portion Calories */
+            per_portion_calories: number;
+            /** Per Portion Protein */
+            per_portion_protein: number;
+            /** Per Portion Carbohydrates */
+            per_portion_carbohydrates: number;
+            /** Per Portion Fat */
+            per_portion_fat: number;
+            /** Per Portion Fiber */
+            per_portion_fiber: number;
+            /** Id */
+            id: number;
+            /** Remaining Portions */
+            remaining_portions: number;
+            /** Is Finished */
+            is_finished: boolean;
+            /**
+             * Prepared At
+             * Format: date-time
+             */
+            prepared_at: string;
+            /**
+             * Updated At
+             * Format: date-time
+             */
+            updated_at: string;
+            /** Completed At */
+            completed_at?: string | null;
+            log_entry?: components["schemas"]["DailyLogEntryRead"] | null;
         };
         /**
          * StoredFoodCreate
@@ -873,6 +1457,42 @@ export interface components {
             /** Id */
             id: number;
         };
+        /** UsdaCacheStatsResponse */
+        UsdaCacheStatsResponse: {
+            /**
+             * Backend
+             * @enum {string}
+             */
+            backend: "memory" | "database";
+            /** Entries */
+            entries: number;
+            /** Max Entries */
+            max_entries: number;
+            /** Ttl Seconds */
+            ttl_seconds: number;
+            /** Hits */
+            hits: number;
+            /** Shared Hits */
+            shared_hits: number;
+            /** Misses */
+            misses: number;
+        };
+        /** UsdaFoodBatchRequest */
+        UsdaFoodBatchRequest: {
+            /** Fdc Ids */
+            fdc_ids: number[];
+        };
+        /** UsdaFoodBatchResponse */
+        UsdaFoodBatchResponse: {
+            /** Foods */
+            foods?: {
+                [key: string]: components["schemas"]["UsdaFoodSummary"];
+            };
+            /** Errors */
+            errors?: {
+                [key: string]: string;
+            };
+        };
         /** UsdaFoodSummary */
         UsdaFoodSummary: {
             /** Id */
@@ -960,7 +1580,13 @@ export type $defs = Record<string, never>;
 export interface operations {
     get_all_ingredients_api_ingredients__get: {
         parameters: {
-            query?: never;
+            query?: {
+                limit?: number | null;
+                after?: string | null;
+                name_prefix?: string | null;
+                tag_ids?: number[] | null;
+                source?: string | null;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -976,6 +1602,15 @@ export interface operations {
                     "application/json": components["schemas"]["IngredientRead"][];
                 };
             };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
         };
     };
     add_ingredient_api_ingredients__post: {
@@ -1163,7 +1798,146 @@ export interface operations {
             };
         };
     };
+    get_ingredient_dependents_api_ingredients__ingredient_id__dependents_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                ingredient_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["IngredientDependentsRead"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    add_ingredients_bulk_api_ingredients_bulk_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["IngredientBulkCreate"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["IngredientBulkRead"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_all_foods_api_foods__get: {
+        parameters: {
+            query?: {
+                min_calories?: number | null;
+                max_calories?: number | null;
+                min_protein?: number | null;
+                max_protein?: number | null;
+                min_carbohydrates?: number | null;
+                max_carbohydrates?: number | null;
+                min_fat?: number | null;
+                max_fat?: number | null;
+                min_fiber?: number | null;
+                max_fiber?: number | null;
+                sort?: "name" | "calories" | "protein" | "carbohydrates" | "fat" | "fiber" | null;
+                descending?: boolean;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["FoodRead"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    add_food_api_foods__post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["FoodCreate"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            201: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["FoodRead"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    get_possible_food_tags_api_foods_possible_tags_get: {
         parameters: {
             query?: never;
             header?: never;
@@ -1178,26 +1952,160 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["FoodRead"][];
+                    "application/json": components["schemas"]["PossibleFoodTag"][];
+                };
+            };
+        };
+    };
+    add_possible_food_tag_api_foods_possible_tags_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["TagCreate"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            201: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["PossibleFoodTag"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    get_food_api_foods__food_id__get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                food_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["FoodRead"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    update_food_api_foods__food_id__put: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                food_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["FoodUpdate"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["FoodRead"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    delete_food_api_foods__food_id__delete: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                food_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": {
+                        [key: string]: unknown;
+                    };
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
                 };
             };
         };
     };
-    add_food_api_foods__post: {
+    patch_food_api_foods__food_id__patch: {
         parameters: {
             query?: never;
             header?: never;
-            path?: never;
+            path: {
+                food_id: number;
+            };
             cookie?: never;
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["FoodCreate"];
+                "application/json": components["schemas"]["FoodPatch"];
             };
         };
         responses: {
             /** @description Successful Response */
-            201: {
+            200: {
                 headers: {
                     [name: string]: unknown;
                 };
@@ -1216,7 +2124,7 @@ export interface operations {
             };
         };
     };
-    get_possible_food_tags_api_foods_possible_tags_get: {
+    list_plans_api_plans__get: {
         parameters: {
             query?: never;
             header?: never;
@@ -1231,12 +2139,12 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["PossibleFoodTag"][];
+                    "application/json": components["schemas"]["PlanRead"][];
                 };
             };
         };
     };
-    add_possible_food_tag_api_foods_possible_tags_post: {
+    create_plan_api_plans__post: {
         parameters: {
             query?: never;
             header?: never;
@@ -1245,7 +2153,7 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["TagCreate"];
+                "application/json": components["schemas"]["PlanCreate"];
             };
         };
         responses: {
@@ -1255,7 +2163,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["PossibleFoodTag"];
+                    "application/json": components["schemas"]["PlanRead"];
                 };
             };
             /** @description Validation Error */
@@ -1269,16 +2177,18 @@ export interface operations {
             };
         };
     };
-    get_food_api_foods__food_id__get: {
+    build_inline_shopping_list_api_plans_shopping_list_post: {
         parameters: {
             query?: never;
             header?: never;
-            path: {
-                food_id: number;
-            };
+            path?: never;
             cookie?: never;
         };
-        requestBody?: never;
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["PlanPayloadRequest"];
+            };
+        };
         responses: {
             /** @description Successful Response */
             200: {
@@ -1286,7 +2196,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["FoodRead"];
+                    "application/json": components["schemas"]["ShoppingListRead"];
                 };
             };
             /** @description Validation Error */
@@ -1300,18 +2210,16 @@ export interface operations {
             };
         };
     };
-    update_food_api_foods__food_id__put: {
+    evaluate_inline_plan_api_plans_evaluation_post: {
         parameters: {
             query?: never;
             header?: never;
-            path: {
-                food_id: number;
-            };
+            path?: never;
             cookie?: never;
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["FoodUpdate"];
+                "application/json": components["schemas"]["PlanPayloadRequest"];
             };
         };
         responses: {
@@ -1321,7 +2229,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["FoodRead"];
+                    "application/json": components["schemas"]["PlanEvaluationRead"];
                 };
             };
             /** @description Validation Error */
@@ -1335,12 +2243,12 @@ export interface operations {
             };
         };
     };
-    delete_food_api_foods__food_id__delete: {
+    get_plan_api_plans__plan_id__get: {
         parameters: {
             query?: never;
             header?: never;
             path: {
-                food_id: number;
+                plan_id: number;
             };
             cookie?: never;
         };
@@ -1352,9 +2260,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": {
-                        [key: string]: unknown;
-                    };
+                    "application/json": components["schemas"]["PlanRead"];
                 };
             };
             /** @description Validation Error */
@@ -1368,41 +2274,23 @@ export interface operations {
             };
         };
     };
-    list_plans_api_plans__get: {
+    update_plan_api_plans__plan_id__put: {
         parameters: {
             query?: never;
             header?: never;
-            path?: never;
-            cookie?: never;
-        };
-        requestBody?: never;
-        responses: {
-            /** @description Successful Response */
-            200: {
-                headers: {
-                    [name: string]: unknown;
-                };
-                content: {
-                    "application/json": components["schemas"]["PlanRead"][];
-                };
+            path: {
+                plan_id: number;
             };
-        };
-    };
-    create_plan_api_plans__post: {
-        parameters: {
-            query?: never;
-            header?: never;
-            path?: never;
             cookie?: never;
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["PlanCreate"];
+                "application/json": components["schemas"]["PlanUpdate"];
             };
         };
         responses: {
             /** @description Successful Response */
-            201: {
+            200: {
                 headers: {
                     [name: string]: unknown;
                 };
@@ -1421,7 +2309,7 @@ export interface operations {
             };
         };
     };
-    get_plan_api_plans__plan_id__get: {
+    delete_plan_api_plans__plan_id__delete: {
         parameters: {
             query?: never;
             header?: never;
@@ -1433,13 +2321,11 @@ export interface operations {
         requestBody?: never;
         responses: {
             /** @description Successful Response */
-            200: {
+            204: {
                 headers: {
                     [name: string]: unknown;
                 };
-                content: {
-                    "application/json": components["schemas"]["PlanRead"];
-                };
+                content?: never;
             };
             /** @description Validation Error */
             422: {
@@ -1452,7 +2338,7 @@ export interface operations {
             };
         };
     };
-    update_plan_api_plans__plan_id__put: {
+    evaluate_stored_plan_api_plans__plan_id__evaluation_get: {
         parameters: {
             query?: never;
             header?: never;
@@ -1461,11 +2347,7 @@ export interface operations {
             };
             cookie?: never;
         };
-        requestBody: {
-            content: {
-                "application/json": components["schemas"]["PlanUpdate"];
-            };
-        };
+        requestBody?: never;
         responses: {
             /** @description Successful Response */
             200: {
@@ -1473,7 +2355,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["PlanRead"];
+                    "application/json": components["schemas"]["PlanEvaluationRead"];
                 };
             };
             /** @description Validation Error */
@@ -1487,7 +2369,7 @@ export interface operations {
             };
         };
     };
-    delete_plan_api_plans__plan_id__delete: {
+    build_plan_shopping_list_api_plans__plan_id__shopping_list_post: {
         parameters: {
             query?: never;
             header?: never;
@@ -1496,14 +2378,20 @@ export interface operations {
             };
             cookie?: never;
         };
-        requestBody?: never;
+        requestBody?: {
+            content: {
+                "application/json": components["schemas"]["PlanPayloadRequest"] | null;
+            };
+        };
         responses: {
             /** @description Successful Response */
-            204: {
+            200: {
                 headers: {
                     [name: string]: unknown;
                 };
-                content?: never;
+                content: {
+                    "application/json": components["schemas"]["ShoppingListRead"];
+                };
             };
             /** @description Validation Error */
             422: {
@@ -1632,7 +2520,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["StoredFoodRead"];
+                    "application/json": components["schemas"]["StoredFoodConsumeRead"];
                 };
             };
             /** @description Validation Error */
@@ -1675,15 +2563,15 @@ export interface operations {
             };
         };
     };
-    list_daily_logs_api_logs__log_date__get: {
+    list_daily_logs_range_api_logs__get: {
         parameters: {
-            query?: {
-                user_id?: string | null;
+            query: {
+                user_id: string;
+                start: string;
+                end: string;
             };
             header?: never;
-            path: {
-                log_date: string;
-            };
+            path?: never;
             cookie?: never;
         };
         requestBody?: never;
@@ -1771,6 +2659,106 @@ export interface operations {
             };
         };
     };
+    summarize_daily_logs_api_logs_summary_get: {
+        parameters: {
+            query: {
+                user_id: string;
+                start: string;
+                end: string;
+                bucket?: "day" | "week" | "month";
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["DailyLogSummaryRead"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    list_daily_logs_api_logs__log_date__get: {
+        parameters: {
+            query?: {
+                user_id?: string | null;
+            };
+            header?: never;
+            path: {
+                log_date: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["DailyLogEntryRead"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    create_daily_logs_batch_api_logs_batch_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["DailyLogEntryBatchCreate"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            201: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["DailyLogEntryRead"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     delete_daily_log_api_logs__entry_id__delete: {
         parameters: {
             query?: never;
@@ -1863,6 +2851,59 @@ export interface operations {
             };
         };
     };
+    get_food_details_batch_api_usda_foods_batch_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["UsdaFoodBatchRequest"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["UsdaFoodBatchResponse"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    get_cache_stats_api_usda_cache_stats_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["UsdaCacheStatsResponse"];
+                };
+            };
+        };
+    };
     liveness_api_health_live_get: {
         parameters: {
             query?: never;
@@ -3,11 +3,20 @@
 param(
   [switch]$Production,
   [switch]$Test,
-  [string]$OutputDir
+  [string]$OutputDir,
+  [switch]$Fast,
+  [int]$Jobs,
+  [ValidateSet('none', 'gzip', 'zstd')]
+  [string]$Compress,
+  [switch]$Manifest,
+  [ValidateSet('csv', 'parquet')]
+  [string]$Format,
+  [string]$Since,
+  [switch]$PruneChanges
 )
 
 function Show-Usage {
-  Write-Host "Usage: pwsh ./scripts/db/export-to-csv.ps1 [-Production|-Test] [--OutputDir <path>]" -ForegroundColor Yellow
+  Write-Host "Usage: pwsh ./scripts/db/export-to-csv.ps1 [-Production|-Test] [--OutputDir <path>] [-Fast [-Jobs <n>]] [-Compress none|gzip|zstd] [-Manifest] [-Format csv|parquet] [-Since <manifest|timestamp>] [-PruneChanges]" -ForegroundColor Yellow
   Write-Host "  Defaults to production exports when no flag is provided."
 }
 
@@ -36,4 +45,12 @@ if ($OutputDir) {
   else { $argsList += @('--output-dir', $OutputDir) }
 }
 
+if ($Fast) { $argsList += '--fast' }
+if ($Jobs) { $argsList += @('--jobs', $Jobs) }
+if ($Compress) { $argsList += @('--compress', $Compress) }
+if ($Manifest) { $argsList += '--manifest' }
+if ($Format) { $argsList += @('--format', $Format) }
+if ($Since) { $argsList += @('--since', $Since) }
+if ($PruneChanges) { $argsList += '--prune-changes' }
+
 python Database/export_to_csv.py @argsList
@@ -4,12 +4,19 @@ set -euo pipefail
 
 usage() {
   cat >&2 <<'USAGE'
-Usage: export-to-csv.sh [--production|--test] [--output-dir PATH]
+Usage: export-to-csv.sh [--production|--test] [--output-dir PATH] [--fast [--jobs N]] [--compress none|gzip|zstd] [--format csv|parquet] [--since MANIFEST|TIMESTAMP] [--prune-changes]
 
 Options:
   --production        Write CSVs into Database/production_data (default)
   --test              Write CSVs into Database/test_data
   --output-dir PATH   Override the destination directory
+  --fast              COPY tables concurrently from one consistent snapshot
+  --jobs N            Tables exported concurrently with --fast (default 4)
+  --compress MODE     Compress each CSV with gzip or zstd
+  --manifest          Write manifest.json with row counts and checksums
+  --format FORMAT     csv (default) or parquet (needs pyarrow)
+  --since VALUE       Only export rows changed since an earlier manifest or ISO timestamp
+  --prune-changes     Delete change-log rows this export already covers
   -h, --help          Show this help message
 USAGE
   exit 1
@@ -17,6 +24,7 @@ USAGE
 
 mode=""
 output_dir=""
+extra_args=()
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
@@ -43,6 +51,17 @@ while [[ $# -gt 0 ]]; do
       output_dir="$2"
       shift 2
       ;;
+    --fast|--manifest|--prune-changes)
+      extra_args+=("$1")
+      shift
+      ;;
+    --jobs|--compress|--format|--since)
+      if [[ $# -lt 2 ]]; then
+        usage
+      fi
+      extra_args+=("$1" "$2")
+      shift 2
+      ;;
     -h|--help)
       usage
       ;;
@@ -92,4 +111,6 @@ PY
   python_args+=("--output-dir" "$resolved")
 fi
 
+python_args+=("${extra_args[@]}")
+
 python Database/export_to_csv.py "${python_args[@]}"
@@ -4,11 +4,14 @@ param(
   [switch]$production,
   [switch]$test,
   [switch]$AllowProductionSeed,
-  [switch]$AllowNonLocalDb
+  [switch]$AllowNonLocalDb,
+  [switch]$Fast,
+  [ValidateSet('csv', 'parquet')]
+  [string]$Format
 )
 
 function Show-Usage {
-  Write-Host "Usage: pwsh ./scripts/db/import-from-csv.ps1 -production|-test [-AllowProductionSeed] [-AllowNonLocalDb]" -ForegroundColor Yellow
+  Write-Host "Usage: pwsh ./scripts/db/import-from-csv.ps1 -production|-test [-AllowProductionSeed] [-AllowNonLocalDb] [-Fast] [-Format csv|parquet]" -ForegroundColor Yellow
 }
 
 if (([int]$production + [int]$test) -ne 1) {
@@ -40,4 +43,8 @@ if ($env:DATABASE_URL -notmatch 'localhost' -and -not $AllowNonLocalDb) {
   exit 1
 }
 
-python Database/import_from_csv.py $flag
+$importArgs = @($flag)
+if ($Fast) { $importArgs += "--fast" }
+if ($Format) { $importArgs += @("--format", $Format) }
+
+python Database/import_from_csv.py @importArgs
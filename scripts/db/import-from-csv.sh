@@ -4,11 +4,13 @@ set -euo pipefail
 
 usage() {
   cat >&2 <<'USAGE'
-Usage: import-from-csv.sh -production|-test [--allow-production-seed] [--allow-non-local-db]
+Usage: import-from-csv.sh -production|-test [--allow-production-seed] [--allow-non-local-db] [--fast] [--format csv|parquet]
 
 Options:
   --allow-production-seed  Required when using -production to avoid accidental reseeding.
   --allow-non-local-db     Required when DATABASE_URL does not target localhost.
+  --fast                   Stream CSVs with PostgreSQL COPY instead of ORM inserts.
+  --format FORMAT          csv (default) or parquet (needs pyarrow).
 USAGE
   exit 1
 }
@@ -16,12 +18,19 @@ USAGE
 mode=""
 allow_prod_seed=false
 allow_non_local=false
+extra_args=()
 while [[ $# -gt 0 ]]; do
   case "$1" in
     -production|--production) mode="production" ;;
     -test|--test) mode="test" ;;
     --allow-production-seed) allow_prod_seed=true ;;
     --allow-non-local-db) allow_non_local=true ;;
+    -fast|--fast) extra_args+=(--fast) ;;
+    --format)
+      [[ $# -ge 2 ]] || usage
+      extra_args+=(--format "$2")
+      shift
+      ;;
     -h|--help) usage ;;
     *) usage ;;
   esac
@@ -57,7 +66,7 @@ fi
 
 export DEV_DB_PORT
 if [[ "$mode" == "production" ]]; then
-  python Database/import_from_csv.py --production
+  python Database/import_from_csv.py --production "${extra_args[@]}"
 else
-  python Database/import_from_csv.py --test
+  python Database/import_from_csv.py --test "${extra_args[@]}"
 fi